@@ -9,6 +9,38 @@ HEADERS = {
 }
 REQUEST_TIMEOUT = 20
 RATE_LIMIT_DELAY = 2  # seconds between requests
+HEDGE_DELAY = 1.5  # seconds before the scraper also tries the www/http variant of a URL
+VARIANT_MEMORY_FILE = 'output/cache/url_variants.json'  # winning URL variant per host
+SCRAPE_MAX_BYTES = 2 * 1024 * 1024  # stop downloading a page after this many bytes
+# Opt-in: stop once this much visible text is in hand (prompts use 4000). Off by default since
+# contacts are read from the whole page, footers included
+SCRAPE_TEXT_TARGET = int(os.getenv('SCRAPE_TEXT_TARGET', 0))
+PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', os.cpu_count() or 1))  # HTML parse processes, split between job workers; 0 parses in the calling thread
+DNS_CACHE_SIZE = 100000  # hosts held in the in-process DNS cache
+DNS_DEFAULT_TTL = 300  # seconds, when the resolver does not report a TTL
+DNS_MAX_TTL = 3600
+DNS_NEGATIVE_TTL = 600  # how long an NXDOMAIN answer is trusted
+DNS_CONCURRENCY = 200  # lookups in flight during pre-resolution
+DNS_TIMEOUT = 5
+DNS_CANARY_HOST = 'example.com'  # resolved alongside each batch to detect a resolver that answers NXDOMAIN for everything
+# How long a failed scrape is remembered, per failure class (see src/utils/cache.py), in seconds
+NEGATIVE_CACHE_TTLS = {
+    'timeout': 60 * 60,
+    'rate_limited': 10 * 60,  # 408 / 429: the host is up, just busy
+    'connection': 6 * 60 * 60,
+    'http_5xx': 6 * 60 * 60,
+    'http_4xx': 3 * 24 * 60 * 60,
+    'tls': 3 * 24 * 60 * 60,
+    'no_content': 3 * 24 * 60 * 60,
+    'nxdomain': 7 * 24 * 60 * 60,
+    'other': 24 * 60 * 60
+}
+CACHE_COMPRESSION = os.getenv('CACHE_COMPRESSION', 'zstd')  # 'zstd' or 'gzip' for scraped page blobs
+GOOGLE_REQUESTS_PER_MINUTE = 15  # shared by every thread scraping Google result pages
+SERPER_REQUESTS_PER_MINUTE = 300  # shared by every thread calling Serper.dev
+SERP_MAX_RETRIES = 3
+SERP_BACKOFF_BASE = 2  # seconds; retries wait a random time up to base * 2**attempt
+SERP_BACKOFF_MAX = 60
 
 # App configuration
 APP_CONFIG = {
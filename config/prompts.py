@@ -26,3 +26,79 @@ Website URL: {url}
 Content to analyze:
 {content}
 """
+
+# Multi-site prompt used by ContentAnalyzer.analyze_batch_with_ollama. The instruction block
+# is sent once for all sites, which matters most for small models like llama3.2:3b.
+BATCH_ANALYSIS_PROMPT = """
+You are a marketing expert. Analyze each of the {count} websites provided below and extract key marketing insights in valid JSON format. Respond ONLY with the JSON and no additional text.
+
+Instructions (apply to every website separately):
+1. "keywords": Identify five detailed, long-tail keywords related to the product or service. Each keyword must be between 2 to 5 words, reflect user's search intent, Separate the keywords with commas.
+2. "business_name": Extract the exact name of the business as mentioned on the website.
+3. "products_services": Identify and list the products or services offered. Provide a clear, concise, comma-separated list.
+4. "target_audience": Summarize the target audience in a focused statement using 4 to 6 words per group. If there are multiple groups, separate them with commas.
+5. "location": Extract the business location if mentioned; otherwise, Ensure there are no commas within the location string.
+
+Guidelines:
+- Analyze every website independently; never mix content between websites.
+- Do NOT use the domain name to determine keywords.
+- Return exactly one element per website, with "url" copied exactly as given.
+
+Required JSON structure:
+{{
+    "results": [
+        {{
+            "url": "string",
+            "keywords": "string",
+            "business_name": "string",
+            "products_services": "string",
+            "target_audience": "string",
+            "location": "string"
+        }}
+    ]
+}}
+
+{sites}
+"""
+
+BATCH_SITE_TEMPLATE = """Website URL: {url}
+Content to analyze:
+{content}"""
+
+# Per-field instructions for a shrunk prompt, used when structured data on the page already
+# answered some of the fields (see ContentAnalyzer.analyze_with_ollama(fields=...)).
+FIELD_INSTRUCTIONS = {
+    "keywords": "Identify five detailed, long-tail keywords related to the product or service. Each keyword must be between 2 to 5 words, reflect user's search intent, Separate the keywords with commas.",
+    "business_name": "Extract the exact name of the business as mentioned on the website.",
+    "products_services": "Identify and list the products or services offered. Provide a clear, concise, comma-separated list.",
+    "target_audience": "Summarize the target audience in a focused statement using 4 to 6 words per group. If there are multiple groups, separate them with commas.",
+    "location": "Extract the business location if mentioned; otherwise, Ensure there are no commas within the location string."
+}
+
+PARTIAL_ANALYSIS_PROMPT = """
+You are a marketing expert. Analyze the website content provided below and extract key marketing insights in valid JSON format. Respond ONLY with the JSON and no additional text.
+
+Instructions:
+{instructions}
+
+Guidelines:
+- Do NOT use the domain name to determine keywords.
+- Ensure the JSON is valid, with no newlines, leading spaces, or extraneous characters.
+
+Required JSON structure:
+{{
+{structure}
+}}
+
+Website URL: {url}
+Content to analyze:
+{content}
+"""
+
+# Full-analysis prompts by version, for re-running stored pages with another prompt
+# (python -m src.core.reanalyze --prompt-version). New versions go here; live extraction
+# uses DEFAULT_PROMPT_VERSION.
+PROMPT_VERSIONS = {
+    "v1": ANALYSIS_PROMPT
+}
+DEFAULT_PROMPT_VERSION = "v1"
@@ -11,6 +11,7 @@ APP_CONFIG = {
 
 
 ## models  tested 
+# (compare candidates with: python -m src.core.benchmark <corpus> --models a,b --reference <file>)
 # llama 2 7b 
 # llama3.1:8b
 # hermes3 8b
@@ -23,11 +24,80 @@ import os
 
 OLLAMA_CONFIG = {
     'BASE_URL': os.getenv('OLLAMA_URL', 'http://localhost:11434'),
+    # Comma-separated pool of Ollama hosts; requests are load balanced when more than one is given
+    'BASE_URLS': [u.strip() for u in os.getenv('OLLAMA_URLS', '').split(',') if u.strip()],
+    'HEALTH_CHECK_INTERVAL': int(os.getenv('OLLAMA_HEALTH_CHECK_INTERVAL', 30)),
+    'MAX_HOST_FAILURES': int(os.getenv('OLLAMA_MAX_HOST_FAILURES', 3)),
     'MODEL': os.getenv('OLLAMA_MODEL', 'llama3.2:3b'),
-    'TEMPERATURE': 0.15
+    'TEMPERATURE': 0.15,
+    # Model residency: keep_alive sent with every request while a job runs, and after the last job ends
+    'KEEP_ALIVE': os.getenv('OLLAMA_KEEP_ALIVE', '1h'),
+    'IDLE_KEEP_ALIVE': os.getenv('OLLAMA_IDLE_KEEP_ALIVE', '5m'),
+    'PRELOAD_TIMEOUT': int(os.getenv('OLLAMA_PRELOAD_TIMEOUT', 900)),
+    # Multi-site prompting: how many characters of each site's content go into a batched prompt
+    'BATCH_CONTENT_CHARS': int(os.getenv('OLLAMA_BATCH_CONTENT_CHARS', 1500))
 }
 
 
+EXTRACTION_CONFIG = {
+    # Fields the extractor must fill. When structured data on the page (JSON-LD, microdata,
+    # Open Graph) already answers all of them the Ollama call is skipped; when it answers
+    # some of them the prompt only asks for the rest.
+    'FIELDS': [f.strip() for f in os.getenv(
+        'EXTRACTION_FIELDS', 'keywords,business_name,products_services,target_audience,location'
+    ).split(',') if f.strip()],
+    'STRUCTURED_DATA_FAST_PATH': os.getenv('STRUCTURED_DATA_FAST_PATH', '1') == '1',
+    # Skip Ollama for parked, placeholder, challenge and login-wall pages (src/core/page_classifier.py)
+    'PAGE_CLASSIFIER': os.getenv('PAGE_CLASSIFIER', '1') == '1',
+    # Optional labelled pages (<dir>/<label>/*.txt|html, real sites under ok/) for the fixture model
+    'CLASSIFIER_FIXTURES': os.getenv('PAGE_CLASSIFIER_FIXTURES', 'input/page_fixtures'),
+    'CLASSIFIER_MIN_CONFIDENCE': 0.9
+}
+
+JOB_CONFIG = {
+    # Worker processes running background extraction / competitor jobs
+    'WORKERS': int(os.getenv('JOB_WORKERS', os.cpu_count() or 2)),
+    'DIR': os.getenv('JOB_DIR', 'output/jobs'),
+    'POLL_SECONDS': int(os.getenv('JOB_POLL_SECONDS', 3))
+}
+
+SERPER_CONFIG = {
+    'URL': os.getenv('SERPER_URL', 'https://google.serper.dev/search'),
+    # Search defaults; all of them are part of the competitor cache key
+    'GL': os.getenv('SERPER_GL', 'us'),
+    'HL': os.getenv('SERPER_HL', 'en'),
+    'LOCATION': os.getenv('SERPER_LOCATION', ''),
+    'NUM': 10,
+    'BATCH_SIZE': 100,  # queries per API request
+    'BATCH_WAIT': 0.05,  # seconds a query waits for others to share its request
+    'CONCURRENCY': 4,  # batch requests in flight
+    'POOL_SIZE': 16  # pooled HTTP connections
+}
+
+# Columnar copy of every fresh scrape (src/core/corpus_store.py), for analytics and re-analysis
+CORPUS_CONFIG = {
+    'ENABLED': os.getenv('CORPUS_STORE', '1') == '1',
+    'DIR': os.getenv('CORPUS_DIR', 'output/corpus'),
+    'BATCH_ROWS': 500  # pages per Arrow part file
+}
+
+PROFILE_CONFIG = {
+    'DIR': 'output/profiles',
+    'INTERVAL': float(os.getenv('PROFILE_INTERVAL', 0.01)),  # seconds between stack samples
+    'ROW_SAMPLE': float(os.getenv('PROFILE_ROW_SAMPLE', 0.1)),  # share of rows profiled in 'rows' mode
+    'TOP_N': 30
+}
+
+API_CONFIG = {
+    'HOST': os.getenv('API_HOST', '127.0.0.1'),
+    'PORT': int(os.getenv('API_PORT', 8600)),
+    # Requests must send "Authorization: Bearer <token>" when this is set; required to bind
+    # to anything but a loopback address
+    'TOKEN': os.getenv('API_TOKEN', ''),
+    'MAX_WORKERS': int(os.getenv('API_MAX_WORKERS', 50)),
+    'MAX_SITES_PER_PROMPT': 8  # the largest "Sites per Prompt" option in the UI
+}
+
 # Remote configuration URL (e.g., GitHub Gist or secure API endpoint)
 AUTH_CONFIG_URL = "https://raw.githubusercontent.com/Gops-8/auth-config/main/config.json"
 
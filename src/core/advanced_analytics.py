@@ -1,29 +1,74 @@
 import requests
-import json
 import hashlib
 import random
-import time
-from urllib.parse import urlparse
-from bs4 import BeautifulSoup
+import threading
+import concurrent.futures
 import pandas as pd
+from config.config import REQUEST_TIMEOUT, GOOGLE_REQUESTS_PER_MINUTE
 from src.utils.cache import AnalysisCache
-from src.utils.rate_limiter import RateLimiter
+from src.core.html_parser import run_parser, google_serp, sitemap_urls, has_noindex
+from src.utils.rate_limiter import RateLimiter, request_with_backoff
+from src.core.data_processer import DataProcessor
+from src.core.serper_client import get_serper_client, search_payload, parse_serper_result
 import logging
-import os
-try:
-    import streamlit as st
-except ImportError:
-    st = None
 
 logging.basicConfig(
     level=logging.DEBUG,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+GOOGLE_SEARCH_URL = "https://www.google.com/search"
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 14_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0.3 Mobile/15E148 Safari/604.1"
+]
+
+# One limiter for the whole process, shared by every row thread (Serper's is in serper_client)
+GOOGLE_LIMITER = RateLimiter(requests_per_minute=GOOGLE_REQUESTS_PER_MINUTE, burst_limit=2)
+
+# GMB lookups in flight, so rows for the same business wait for one search instead of each sending their own
+_gmb_lookups = {}
+_gmb_lookups_lock = threading.Lock()
+
+
+class SerpResults(list):
+    """Organic results ([{"link", "position"}]) plus the local listings the same search returned.
+
+    gmb is {"local_pack": bool, "listings": [{"title", "website", "url"}]}, or None when unknown
+    (results cached before listings were kept).
+    """
+
+    def __init__(self, results=(), gmb=None):
+        super().__init__(results)
+        self.gmb = gmb
+
+    def to_cache(self):
+        return {"organic": list(self), "gmb": self.gmb}
+
+    @classmethod
+    def from_cache(cls, cached):
+        if isinstance(cached, dict) and "organic" in cached:
+            return cls(cached["organic"], cached.get("gmb"))
+        return cls(cached)
+
+
+def merge_gmb(blocks):
+    blocks = [block for block in blocks if block]
+    if not blocks:
+        return None
+    return {
+        "local_pack": any(block["local_pack"] for block in blocks),
+        "listings": [listing for block in blocks for listing in block["listings"]]
+    }
+
+
 class AdvancedAnalytics:
     def __init__(self):
         # Use the competitor cache folder for caching in competitive analysis.
         self.cache = AnalysisCache(cache_dir="output/cache_competitor")
+        self.data_processor = DataProcessor()
+        self.prefetched = {}  # cache key -> SerpResults from prefetch_serper
         logging.debug("Initialized AdvancedAnalytics with cache.")
 
     def hash_query(self, query):
@@ -31,150 +76,124 @@ class AdvancedAnalytics:
         logging.debug("Hashed query '%s' to '%s'", query, hash_value)
         return hash_value
 
+    def fetch_google_page(self, query, page):
+        """Parsed result page `page` (0-based) of a Google search: organic URLs and Maps place links."""
+        headers = {"User-Agent": random.choice(USER_AGENTS)}
+        params = {'q': query, 'start': page * 10}
+        response = request_with_backoff(
+            GOOGLE_LIMITER,
+            lambda: requests.get(GOOGLE_SEARCH_URL, params=params, headers=headers, timeout=REQUEST_TIMEOUT),
+            f"Google page {page + 1} for '{query}'"
+        )
+        return run_parser(google_serp, response.content)
+
+    def fetch_google_pages(self, query, pages=1):
+        """Result pages 0..pages-1 fetched concurrently; pages that failed come back as None."""
+        def fetch(page):
+            try:
+                return self.fetch_google_page(query, page)
+            except requests.exceptions.RequestException as e:
+                logging.error("Error fetching Google results page %d for '%s': %s", page + 1, query, str(e))
+                return None
+            except (ValueError, RuntimeError) as e:
+                # Empty or broken body (or a parse worker that died on it): lose this page only
+                logging.error("Error parsing Google results page %d for '%s': %s", page + 1, query, str(e))
+                return None
+
+        if pages <= 1:
+            return [fetch(0)]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=pages) as executor:
+            return list(executor.map(fetch, range(pages)))
+
     def fetch_google_results(self, product, location, pages=1):
+        """Organic results of the first `pages` result pages as [{"link", "position"}], positions counted
+        across pages, with the local listings of those pages in `.gmb`."""
         logging.debug("Fetching Google results for product: '%s' in location: '%s'", product, location)
-        base_url = "https://www.google.com/search"
         query = f"{product} in {location}"
-        all_links = []
-        rate_limiter = RateLimiter(requests_per_minute=15)
-
-        for page in range(pages):
-            rate_limiter.wait()
-            start = page * 10
-            params = {'q': '+'.join(query.split()), 'start': start}
-            USER_AGENTS = [
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36",
-                "Mozilla/5.0 (iPhone; CPU iPhone OS 14_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0.3 Mobile/15E148 Safari/604.1"
-            ]
-            headers = {"User-Agent": random.choice(USER_AGENTS)}
-
-            for attempt in range(3):
-                try:
-                    logging.debug("Attempt %d: Sending request to Google for query: '%s'", attempt+1, query)
-                    response = requests.get(base_url, params=params, headers=headers)
-                    logging.debug("Response status code: %s", response.status_code)
-                    response.raise_for_status()
-                    if response.status_code == 429:
-                        logging.warning("Google is rate-limiting us. Retrying after 60 seconds...")
-                        time.sleep(60)
-                        continue
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    for result in soup.select('a'):
-                        href = result.get('href')
-                        if href and 'http' in href:
-                            all_links.append(href)
-                    logging.debug("Fetched %d links from Google", len(all_links))
-                    return all_links
-                except requests.exceptions.RequestException as e:
-                    logging.error("Error fetching Google results on attempt %d: %s", attempt+1, str(e))
-                    time.sleep(5)  
-
-        logging.debug("Returning %d links after retries", len(all_links))
-        return all_links
-
-    def clean_and_filter_urls(self, urls, origin_url):
-        """Clean and filter URLs to extract unique competitors."""
-        logging.debug("Cleaning and filtering URLs, origin_url: %s", origin_url)
-        logging.debug("Raw URLs from search: %s", urls)
-        
-        unique_urls = set()
-        filtered_competitors = []
-        known_domains = {
-            "twitter", "paypal", "cloudflare", "google", "facebook", "pinterest",
-            "apple", "youtube", "shopify", "amazon", "tiktok", "squarespace",
-            "gmail", "blogspot.com", "adobe", "tumblr", "medium", "soundcloud",
-            "gravatar", "nytimes", "jquery", "microsoft", "stripe", "reuters",
-            "ebay", "wordpress"
-        }
-        tld_exclusions = {".gov", ".org", ".edu", ".chat", ".blog", ".kpmg"}
-        
-        # Read excluded domains from file "assets/domain_list.txt"
-        exclusions = set()
-        file_path = "assets/domain_list.txt"
-        if not os.path.exists(file_path):
-            message = f"Excluded domain file missing: {os.path.abspath(file_path)}"
-            logging.error(message)
-            if st is not None:
-                if not getattr(AdvancedAnalytics, '_exclusion_warning_shown', False):
-                    st.warning(message)
-                    AdvancedAnalytics._exclusion_warning_shown = True
-            exclusions = set()
-        else:
-            try:
-                with open(file_path, 'r') as file:
-                    for line in file:
-                        domain_line = line.strip().lower()
-                        if domain_line:
-                            exclusions.add(domain_line)
-            except Exception as e:
-                message = f"Error reading excluded domains from {os.path.abspath(file_path)}: {str(e)}"
-                logging.error(message)
-                if st is not None and not getattr(AdvancedAnalytics, '_exclusion_warning_shown', False):
-                    st.warning(message)
-                    AdvancedAnalytics._exclusion_warning_shown = True
-
-        # Normalize origin URL
-        origin_url_normalized = origin_url if origin_url.startswith("http") else "http://" + origin_url
-
-        def normalize_domain(url):
-            parsed = urlparse(url)
-            netloc = parsed.netloc.lower()
-            if netloc.startswith("www."):
-                netloc = netloc[4:]
-            return netloc
-
-        origin_norm = normalize_domain(origin_url_normalized)
-
-        for item in urls:
-            # Only process if item is a dict or a string.
-            if isinstance(item, dict):
-                url_str = item.get("link", "")
-                position = item.get("position")
-            elif isinstance(item, str):
-                url_str = item
-                position = None
-            else:
+        results = []
+        parsed_pages = self.fetch_google_pages(query, pages)
+        for page, parsed in enumerate(parsed_pages):
+            if parsed is None:
                 continue
+            results.extend(
+                {"link": link, "position": page * 10 + rank}
+                for rank, link in enumerate(parsed['organic'], start=1)
+            )
+        logging.debug("Fetched %d organic results from %d Google pages", len(results), pages)
+        return SerpResults(results, merge_gmb(parsed['gmb'] for parsed in parsed_pages if parsed))
 
-            parsed = urlparse(url_str)
-            base_url = f"{parsed.scheme}://{parsed.netloc}"
-            domain = parsed.netloc.lower()
-            if not domain:
-                continue
-            if any(domain.endswith(tld) for tld in tld_exclusions):
-                continue
-            if any(known in domain for known in known_domains):
-                continue
-            if domain in exclusions:
-                continue
+    def find_gmb_listing(self, gmb, domain):
+        """The listing in a search's local results that belongs to `domain`, matched on its website or,
+        for listings without one, on the name ('Acme Plumbing' for acmeplumbing.com)."""
+        target = self.data_processor.canonical_domain(domain)
+        if not target or not gmb:
+            return None
+        brand = target.split('.')[0].replace('-', '')
+        for listing in gmb["listings"]:
+            if listing.get("website"):
+                if self.data_processor.canonical_domain(listing["website"]) == target:
+                    return listing
+            elif brand and ''.join(ch for ch in listing.get("title", "").lower() if ch.isalnum()) == brand:
+                return listing
+        return None
 
-            competitor_norm = normalize_domain(base_url)
-            if competitor_norm == origin_norm:
-                continue
-
-            if base_url not in unique_urls:
-                unique_urls.add(base_url)
-                filtered_competitors.append({"link": base_url, "position": position})
-            if len(filtered_competitors) == 3:
-                break
+    def check_gmb_listing(self, domain, search_results=None, search_method=None, api_key=None, use_cache=True):
+        """Whether `domain` has a Google Business listing, as {"exists", "url"}.
 
-        logging.debug("Filtered competitors: %s", filtered_competitors)
-        return filtered_competitors
+        The local listings that came back with the row's own search (`search_results.gmb`) are
+        checked first. Only when the business is not among them is a search for the domain
+        itself run; that lookup is shared by concurrent rows for the same domain and, with
+        `use_cache`, answered from the cache when possible. Fresh results are always cached,
+        like search_serper's.
+        """
+        listing = self.find_gmb_listing(getattr(search_results, "gmb", None), domain)
+        if listing:
+            logging.debug("GMB listing for '%s' found in the primary search", domain)
+            return {"exists": True, "url": listing.get("url") or listing.get("website")}
 
+        target = self.data_processor.canonical_domain(domain)
+        if not target:
+            return {"exists": False, "url": None}
+        backend = "serper" if search_method == "Serper.dev API" and api_key else "google"
+        key = f"gmb|{backend}|{target}"
+        cached = self.cache.get(key) if use_cache else None
+        if cached is not None:
+            return cached
 
+        with _gmb_lookups_lock:
+            future = _gmb_lookups.get(key)
+            owner = future is None
+            if owner:
+                future = _gmb_lookups[key] = concurrent.futures.Future()
+        if not owner:
+            return future.result()
+        try:
+            result, complete = self.lookup_gmb_listing(target, backend, api_key, use_cache)
+            if complete:
+                self.cache.set(key, result)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with _gmb_lookups_lock:
+                _gmb_lookups.pop(key, None)
 
-    def check_gmb_listing(self, business_name, location):
-        logging.debug("Checking GMB listing for business: '%s', location: '%s'", business_name, location)
-        search_query = f"{business_name} {location} Google My Business"
-        search_results = self.fetch_google_results(search_query, location)
-        for item in search_results:
-            url = item if isinstance(item, str) else item.get("link", "")
-            if "google.com/maps/place/" in url:
-                logging.debug("Found GMB listing for business: '%s': %s", business_name, url)
-                return {"exists": True, "url": url}
-        logging.debug("No GMB listing found for business: '%s'", business_name)
-        return {"exists": False, "url": None}
+    def lookup_gmb_listing(self, domain, backend, api_key=None, use_cache=True):
+        """Search for the domain itself and look for its listing; returns (result, whether the search succeeded)."""
+        logging.debug("Looking up GMB listing for '%s' via %s", domain, backend)
+        if backend == "serper":
+            results = self.search_serper(domain, api_key, use_cache=use_cache)
+        else:
+            parsed = self.fetch_google_pages(domain)[0]
+            results = SerpResults(parsed["organic"], parsed["gmb"]) if parsed else None
+        if not isinstance(results, SerpResults):
+            return {"exists": False, "url": None}, False
+        listing = self.find_gmb_listing(results.gmb, domain)
+        if listing:
+            return {"exists": True, "url": listing.get("url") or listing.get("website")}, True
+        return {"exists": False, "url": None}, results.gmb is not None
 
     def analyze_non_indexed_pages(self, domain):
         logging.debug("Analyzing non-indexed pages for domain: '%s'", domain)
@@ -184,17 +203,13 @@ class AdvancedAnalytics:
             if response.status_code != 200:
                 logging.warning("Sitemap not found at %s (status code %d)", sitemap_url, response.status_code)
                 return 0
-            soup = BeautifulSoup(response.content, 'xml')
-            loc_tags = soup.find_all('loc')
-            urls = [tag.text for tag in loc_tags]
+            urls = run_parser(sitemap_urls, response.content)
             count_noindex = 0
             for url in urls[:20]:
                 try:
                     page_response = requests.get(url, timeout=5)
                     if page_response.status_code == 200:
-                        page_soup = BeautifulSoup(page_response.text, 'html.parser')
-                        meta_robots = page_soup.find('meta', attrs={'name': 'robots'})
-                        if meta_robots and 'noindex' in meta_robots.get('content', '').lower():
+                        if run_parser(has_noindex, page_response.content):
                             count_noindex += 1
                 except Exception as e:
                     logging.error("Error fetching URL %s: %s", url, e)
@@ -204,47 +219,92 @@ class AdvancedAnalytics:
             logging.error("Error fetching sitemap from %s: %s", sitemap_url, e)
             return 0
 
-    def search_serper(self, query, api_key, use_cache=True):
-          logging.debug("Performing Serper.dev API search for query: '%s'", query)
-          cache_key = self.hash_query(query)
-          if use_cache:
-              cached_result = self.cache.get(cache_key)
-              if cached_result:
-                  logging.debug("Cache hit for Serper.dev query: '%s'", query)
-                  return cached_result
-          headers = {
-              "X-API-KEY": api_key,
-              "Content-Type": "application/json"
-          }
-          payload = json.dumps({
-              "q": query,
-              "hl": "en",
-              "gl": "us",
-              "num": 10
-          })
-          url = "https://google.serper.dev/search"
-          try:
-              response = requests.post(url, headers=headers, data=payload)
-              logging.debug("Serper.dev API response status code: %s", response.status_code)
-              response.raise_for_status()
-              result = response.json()
-              results_list = [
-                  {"link": item.get("link"), "position": item.get("position")}
-                  for item in result.get("organic", [])
-                  if item.get("link")
-              ]
-              if not results_list:
-                  logging.warning("No results found for query: '%s'", query)
-                  return {"error": f"No results found for query: {query}"}
-              # Always update the cache with fresh results.
-              self.cache.set(cache_key, results_list)
-              logging.info("Retrieved %d results for query: '%s'", len(results_list), query)
-              return results_list
-          except requests.exceptions.RequestException as e:
-              error_message = f"API request failed: {str(e)}"
-              logging.error("Serper.dev API request failed for query '%s': %s", query, error_message)
-              return {"error": error_message}
-          except json.JSONDecodeError:
-              error_message = f"Failed to parse JSON response from Serper.dev for query: {query}"
-              logging.error("JSON decode error for query '%s': %s", query, error_message)
-              return {"error": error_message}
+    def serper_cache_key(self, query, pages=1, location=None, gl=None, hl=None, num=None):
+        """Cache key of a Serper search; location, language, country and depth are all part of it."""
+        params = search_payload(query, 0, location, gl, hl, num)
+        return self.hash_query(
+            f"serper|{query}|{params.get('location', '')}|{params['gl']}|{params['hl']}|{params['num']}|pages={pages}"
+        )
+
+    def serper_results(self, raw_pages, num=None):
+        page_results = [parse_serper_result(data, page, num) for page, data in enumerate(raw_pages)]
+        return SerpResults(
+            [item for results, _ in page_results for item in results],
+            merge_gmb(gmb for _, gmb in page_results)
+        )
+
+    def prefetch_serper(self, queries, api_key, use_cache=True, pages=1, **params):
+        """Run the searches for many rows up front, in as few Serper requests as possible.
+
+        Fresh results land in the cache and in memory, where search_serper picks them up.
+        Queries that fail here are simply searched again by search_serper. Returns
+        {query: SerpResults} for every query with results, cached ones included.
+        """
+        found, missing = {}, []
+        for query in dict.fromkeys(q for q in queries if q):
+            key = self.serper_cache_key(query, pages, **params)
+            cached = self.cache.get(key) if use_cache else None
+            if cached:
+                found[query] = SerpResults.from_cache(cached)
+            else:
+                missing.append((query, key))
+        if not missing:
+            return found
+        raw = get_serper_client(api_key).search_many(
+            [search_payload(query, page, **params) for query, _ in missing for page in range(pages)]
+        )
+        for i, (query, key) in enumerate(missing):
+            raw_pages = raw[i * pages:(i + 1) * pages]
+            if any(data is None for data in raw_pages):
+                continue
+            results = self.serper_results(raw_pages, params.get("num"))
+            if results:
+                self.cache.set(key, results.to_cache())
+                self.prefetched[key] = results
+                found[query] = results
+        logging.info("Prefetched %d Serper.dev searches", len(missing))
+        return found
+
+    def prefetch_gmb_lookups(self, rows, api_key, use_cache=True):
+        """Batch the GMB lookups that `rows` ([(domain, search results)]) will need, see check_gmb_listing."""
+        targets = []
+        for domain, search_results in rows:
+            target = self.data_processor.canonical_domain(domain)
+            if (target and not self.find_gmb_listing(getattr(search_results, "gmb", None), domain)
+                    and (not use_cache or self.cache.get(f"gmb|serper|{target}") is None)):
+                targets.append(target)
+        if targets:
+            self.prefetch_serper(targets, api_key, use_cache=use_cache)
+
+    def search_serper(self, query, api_key, use_cache=True, pages=1, location=None, gl=None, hl=None):
+        logging.debug("Performing Serper.dev API search for query: '%s' (%d pages)", query, pages)
+        params = {"location": location, "gl": gl, "hl": hl}
+        cache_key = self.serper_cache_key(query, pages, **params)
+        prefetched = self.prefetched.pop(cache_key, None)
+        if prefetched is not None:
+            return prefetched
+        if use_cache:
+            cached_result = self.cache.get(cache_key)
+            if cached_result:
+                logging.debug("Cache hit for Serper.dev query: '%s'", query)
+                return SerpResults.from_cache(cached_result)
+        try:
+            client = get_serper_client(api_key)
+            # All pages go out together, in one request when nothing else is queued
+            futures = [client.submit(search_payload(query, page, **params)) for page in range(pages)]
+            results_list = self.serper_results([future.result() for future in futures])
+            if not results_list:
+                logging.warning("No results found for query: '%s'", query)
+                return {"error": f"No results found for query: {query}"}
+            # Always update the cache with fresh results.
+            self.cache.set(cache_key, results_list.to_cache())
+            logging.info("Retrieved %d results for query: '%s'", len(results_list), query)
+            return results_list
+        except requests.exceptions.RequestException as e:
+            error_message = f"API request failed: {str(e)}"
+            logging.error("Serper.dev API request failed for query '%s': %s", query, error_message)
+            return {"error": error_message}
+        except ValueError:
+            error_message = f"Failed to parse JSON response from Serper.dev for query: {query}"
+            logging.error("JSON decode error for query '%s': %s", query, error_message)
+            return {"error": error_message}
@@ -0,0 +1,178 @@
+# src/core/benchmark.py
+"""Compare Ollama models on a fixed local corpus.
+
+    python -m src.core.benchmark output/scraping/scraped_data_20241224_154243.json \\
+        --models llama3.2:3b,llama3.1:8b,qwen2.5:14b --reference input/reference.json --limit 200
+
+For each model: tokens/sec, time to first token, latency percentiles, how often the response
+was valid JSON, how often the `error` fallback dict came back, and per-field agreement with a
+reference set ({url: {"keywords": ..., "business_name": ..., ...}}), e.g. a reanalyze.py
+output from the model currently trusted. Point OLLAMA_URL at src/utils/fake_ollama.py to run
+it offline.
+"""
+import os
+import re
+import json
+import time
+import argparse
+import logging
+import concurrent.futures
+from datetime import datetime
+from typing import Dict, List
+from config.settings import OLLAMA_CONFIG
+from src.core.content_analyzer import ContentAnalyzer, REQUIRED_FIELDS
+from src.core.reanalyze import iter_sources, page_text
+
+# Fields holding comma-separated lists, compared as sets; the rest are compared as a whole
+LIST_FIELDS = {'keywords', 'products_services', 'target_audience'}
+NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_item(value: str) -> str:
+    return NON_WORD.sub(' ', str(value).lower()).strip()
+
+
+def field_agreement(field: str, value, reference) -> float:
+    """1.0 for a full match with the reference value, 0.0 for none; Jaccard overlap for list fields."""
+    if isinstance(value, list):
+        value = ', '.join(str(v) for v in value)
+    if isinstance(reference, list):
+        reference = ', '.join(str(v) for v in reference)
+    if field not in LIST_FIELDS:
+        return float(normalize_item(value) == normalize_item(reference))
+    ours = {normalize_item(v) for v in str(value).split(',')} - {''}
+    theirs = {normalize_item(v) for v in str(reference).split(',')} - {''}
+    if not ours and not theirs:
+        return 1.0
+    return len(ours & theirs) / len(ours | theirs)
+
+
+def percentile(values: List[float], share: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, int(round(share * (len(values) - 1)))))
+    return values[index]
+
+
+def load_reference(path: str) -> Dict[str, Dict]:
+    """{url: analysis} from a JSON object file or a reanalyze.py JSONL output."""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            reference = {}
+            for line in f:
+                record = json.loads(line)
+                if record.get('status') == 'success':
+                    reference[record['url']] = record['analysis']
+            return reference
+        return json.load(f)
+
+
+class ModelBenchmark:
+    """Runs the same pages through ContentAnalyzer once per model and summarizes each run."""
+
+    def __init__(self, models: List[str], reference: Dict[str, Dict] = None, concurrency: int = 4):
+        self.models = models
+        self.reference = reference or {}
+        self.concurrency = concurrency
+
+    def _analyze(self, analyzer: ContentAnalyzer, model: str, url: str, content: str) -> Dict:
+        start = time.perf_counter()
+        analysis = analyzer.analyze_with_ollama(content, url, model=model)
+        stats = dict(analyzer.generate_stats())
+        stats.setdefault('latency', time.perf_counter() - start)
+        return {'url': url, 'analysis': analysis, 'stats': stats}
+
+    def run_model(self, model: str, pages: List) -> Dict:
+        analyzer = ContentAnalyzer(model=model)
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            calls = list(executor.map(lambda page: self._analyze(analyzer, model, *page), pages))
+        wall_time = time.perf_counter() - start
+
+        latencies = [c['stats']['latency'] for c in calls if c['stats'].get('completed')]
+        ttfts = [c['stats']['ttft'] for c in calls if 'ttft' in c['stats']]
+        eval_tokens = sum(c['stats'].get('eval_count', 0) for c in calls)
+        eval_seconds = sum(c['stats'].get('eval_duration', 0) for c in calls) / 1e9
+        completed = [c for c in calls if c['stats'].get('completed')]
+        fallbacks = [c for c in calls if c['analysis'].get('error')]
+        # A fallback after Ollama answered means the answer was not usable JSON
+        invalid_json = [c for c in fallbacks if c['stats'].get('completed')]
+
+        agreement = {field: [] for field in REQUIRED_FIELDS}
+        for call in calls:
+            reference = self.reference.get(call['url'])
+            if not reference or call['analysis'].get('error'):
+                continue
+            for field in REQUIRED_FIELDS:
+                if field in reference:
+                    agreement[field].append(field_agreement(field, call['analysis'].get(field, ''), reference[field]))
+
+        return {
+            'model': model,
+            'pages': len(calls),
+            'wall_seconds': round(wall_time, 2),
+            'pages_per_second': round(len(calls) / wall_time, 3) if wall_time else 0.0,
+            'tokens_per_second': round(eval_tokens / eval_seconds, 1) if eval_seconds else 0.0,
+            'ttft_p50': round(percentile(ttfts, 0.5), 3),
+            'ttft_p95': round(percentile(ttfts, 0.95), 3),
+            'latency_p50': round(percentile(latencies, 0.5), 3),
+            'latency_p90': round(percentile(latencies, 0.9), 3),
+            'latency_p99': round(percentile(latencies, 0.99), 3),
+            'json_valid_rate': round(1 - len(invalid_json) / len(completed), 3) if completed else 0.0,
+            'fallback_rate': round(len(fallbacks) / len(calls), 3) if calls else 0.0,
+            'agreement': {
+                field: round(sum(scores) / len(scores), 3) if scores else None
+                for field, scores in agreement.items()
+            },
+            'agreement_pages': max((len(scores) for scores in agreement.values()), default=0)
+        }
+
+    def run(self, sources, limit: int = None) -> List[Dict]:
+        pages = []
+        for url, page in iter_sources(sources):
+            if page and page.get('content'):
+                pages.append((url, page_text(page)))
+            if limit is not None and len(pages) >= limit:
+                break
+        logging.info("Benchmarking %d models on %d pages", len(self.models), len(pages))
+        report = []
+        for model in self.models:
+            logging.info("Running %s", model)
+            report.append(self.run_model(model, pages))
+        return report
+
+
+def format_report(report: List[Dict]) -> str:
+    columns = ['model', 'pages', 'tokens_per_second', 'ttft_p50', 'latency_p50', 'latency_p90', 'latency_p99',
+               'json_valid_rate', 'fallback_rate']
+    rows = [columns + [f"agree:{field}" for field in REQUIRED_FIELDS]]
+    for entry in report:
+        rows.append([str(entry[column]) for column in columns] +
+                    ['-' if entry['agreement'][field] is None else str(entry['agreement'][field])
+                     for field in REQUIRED_FIELDS])
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return '\n'.join('  '.join(cell.ljust(width) for cell, width in zip(row, widths)) for row in rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Ollama models on stored pages")
+    parser.add_argument("sources", nargs="+", help="scraped_data_*.json files, corpus directories and/or scraper cache directories")
+    parser.add_argument("--models", default=OLLAMA_CONFIG['MODEL'], help="comma-separated model names")
+    parser.add_argument("--reference", help="JSON {url: analysis} or reanalyze.py JSONL output")
+    parser.add_argument("--limit", type=int, default=100, help="pages to run per model")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--output", default=f"output/benchmarks/benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.INFO)
+    benchmark = ModelBenchmark(
+        [m.strip() for m in args.models.split(',') if m.strip()],
+        load_reference(args.reference) if args.reference else None,
+        args.concurrency
+    )
+    report = benchmark.run(args.sources, args.limit)
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(format_report(report))
+    print(f"Report written to {args.output}")
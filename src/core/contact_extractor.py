@@ -0,0 +1,76 @@
+# src/core/contact_extractor.py
+import re
+from typing import Dict, List
+from urllib.parse import unquote
+
+EMAIL = re.compile(r'(?<![\w.%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,24}(?![\w-])')
+# Optional +country code, optional (area) code, then groups separated by space, dot or dash
+PHONE = re.compile(
+    r'(?<![\w+])(?:\+\d{1,3}[\s.-]?)?(?:\(\d{1,4}\)[\s.-]?)?\d{2,4}(?:[\s.-]\d{2,4}){1,4}(?![\w])'
+    r'|(?<![\w+])\+?\d{10,13}(?!\w)'
+)
+NON_DIGITS = re.compile(r'\D')
+# Asset names that look like addresses: logo@2x.png
+EMAIL_FALSE_POSITIVE = re.compile(r'\.(png|jpe?g|gif|svg|webp|css|js)$', re.I)
+DATE_LIKE = re.compile(r'^(19|20)\d{2}[.-]\d{1,2}[.-]\d{1,2}$|^\d{1,2}[.-]\d{1,2}[.-](19|20)\d{2}$')
+
+
+class ContactExtractor:
+    """Emails and phone numbers from a parsed page: mailto:/tel: links first, then the page text.
+
+    Emails are lower-cased; phones are normalized to E.164 (+<digits>), with 10-digit numbers
+    taken as North American. Both lists are deduplicated after normalization, in page order.
+    """
+
+    def __init__(self, default_country_code: str = '1', max_items: int = 5):
+        self.default_country_code = default_country_code
+        self.max_items = max_items
+
+    def normalize_email(self, email: str) -> str:
+        email = unquote(email).strip().strip('.').lower()
+        if not EMAIL.fullmatch(email) or EMAIL_FALSE_POSITIVE.search(email):
+            return ''
+        return email
+
+    def normalize_phone(self, phone: str) -> str:
+        phone = unquote(phone).strip()
+        if DATE_LIKE.match(phone):
+            return ''
+        digits = NON_DIGITS.sub('', phone)
+        if phone.startswith('+') or phone.startswith('00'):
+            digits = digits[2:] if phone.startswith('00') else digits
+            return f"+{digits}" if 8 <= len(digits) <= 15 else ''
+        if len(digits) == 10 and digits[0] not in '01':
+            return f"+{self.default_country_code}{digits}"
+        if len(digits) == 11 and digits.startswith(self.default_country_code):
+            return f"+{digits}"
+        return ''
+
+    def _unique(self, values) -> List[str]:
+        return [value for value in dict.fromkeys(values) if value][:self.max_items]
+
+    def extract(self, soup, text: str = None) -> Dict:
+        """{'emails': [...], 'phones': [...]} for a BeautifulSoup page; `text` defaults to all of its text."""
+        emails, phones = [], []
+        for link in soup.find_all('a', href=True):
+            href = link['href'].strip()
+            scheme = href[:7].lower()
+            if scheme == 'mailto:':
+                emails.extend(self.normalize_email(address) for address in href[7:].split('?')[0].split(','))
+            elif href[:4].lower() == 'tel:':
+                phones.append(self.normalize_phone(href[4:]))
+        if text is None:
+            text = soup.get_text(' ')
+        return self.merge({'emails': emails, 'phones': phones}, self.scan_text(text))
+
+    def scan_text(self, text: str) -> Dict:
+        return {
+            'emails': self._unique(self.normalize_email(match) for match in EMAIL.findall(text)),
+            'phones': self._unique(self.normalize_phone(match) for match in PHONE.findall(text))
+        }
+
+    def merge(self, *found: Dict) -> Dict:
+        return {
+            'emails': self._unique(email for item in found for email in item.get('emails', [])),
+            'phones': self._unique(phone for item in found for phone in item.get('phones', []))
+        }
@@ -2,11 +2,14 @@
 import json
 import requests
 from typing import Dict, List
-import re
 import os
+import time
+import threading
 from datetime import datetime
 from config.settings import OLLAMA_CONFIG
-from config.prompts import ANALYSIS_PROMPT
+from src.utils.ollama_pool import get_host_pool, NoHealthyHostError
+from config.prompts import (BATCH_ANALYSIS_PROMPT, BATCH_SITE_TEMPLATE, FIELD_INSTRUCTIONS,
+                            PARTIAL_ANALYSIS_PROMPT, PROMPT_VERSIONS, DEFAULT_PROMPT_VERSION)
 import logging
 
 # Configure logging for this module
@@ -15,61 +18,135 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+REQUIRED_FIELDS = ['keywords', 'business_name', 'products_services', 'target_audience', 'location']
+
+
+def load_prompt(prompt_version=None) -> str:
+    """Full-analysis prompt template: a key of PROMPT_VERSIONS, or the path of a text file
+    with {url} and {content} placeholders."""
+    prompt_version = prompt_version or DEFAULT_PROMPT_VERSION
+    if prompt_version in PROMPT_VERSIONS:
+        return PROMPT_VERSIONS[prompt_version]
+    if os.path.isfile(prompt_version):
+        with open(prompt_version, 'r', encoding='utf-8') as f:
+            return f.read()
+    raise ValueError(f"Unknown prompt version: {prompt_version}")
+
 class ContentAnalyzer:
-    def __init__(self, model=None, base_url=None):
+    def __init__(self, model=None, base_url=None, base_urls=None):
         self.base_url = base_url or OLLAMA_CONFIG['BASE_URL']
         self.model = model or OLLAMA_CONFIG['MODEL']
-        logging.debug("Initialized ContentAnalyzer with base_url: %s, model: %s", self.base_url, self.model)
+        # An explicit base_url pins this analyzer to one host; otherwise a multi-host pool is used if configured
+        base_urls = base_urls or ([] if base_url else OLLAMA_CONFIG['BASE_URLS'])
+        self.host_pool = get_host_pool(base_urls) if len(base_urls) > 1 else None
+        if len(base_urls) == 1:
+            self.base_url = base_urls[0]
+        self._stats = threading.local()
+        logging.debug("Initialized ContentAnalyzer with base_url: %s, model: %s, pool: %s", self.base_url, self.model, base_urls)
     
-    def _extract_contact_info(self, content: str) -> Dict:
-        """Extract email and phone numbers using regex"""
-        logging.debug("Extracting contact info from content (length: %d)", len(content))
-        # Email pattern
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        emails = list(set(re.findall(email_pattern, content)))
-        
-        # Phone pattern (various formats)
-        phone_pattern = r'(\+\d{1,3}[-.]?)?\(?\d{3}\)?[-.]?\d{3}[-.]?\d{4}'
-        phones = list(set(re.findall(phone_pattern, content)))
-        
-        logging.debug("Extracted emails: %s, phones: %s", emails, phones)
-        return {
-            'emails': emails,
-            'phones': phones
-        }
-
-    def analyze_with_ollama(self, content: str, url: str, model=None) -> dict:
+    def _post_generate(self, base_url: str, prompt: str, model: str) -> str:
+        timeout = 300 if model in ["deepseek-r1:32b", "llama3.3:70b"] else 120
+        stats = self.generate_stats()
+        start = time.perf_counter()
+        response = requests.post(
+            f"{base_url}/api/generate",
+            json={
+                "model": model,
+                "prompt": prompt,
+                "temperature": OLLAMA_CONFIG['TEMPERATURE'],
+                "format": "json",
+                "keep_alive": OLLAMA_CONFIG['KEEP_ALIVE']
+            },
+            timeout=timeout,
+            stream=True
+        )
+        logging.debug("Ollama response status code from %s: %s", base_url, response.status_code)
+        response.raise_for_status()
+
+        full_response = ""
+        for line in response.iter_lines():
+            if line:
+                data = json.loads(line)
+                if 'response' in data:
+                    if not full_response and data['response']:
+                        stats['ttft'] = time.perf_counter() - start
+                    full_response += data['response']
+                if data.get('done'):
+                    # Ollama's own counters, in the final chunk
+                    for key in ('eval_count', 'eval_duration', 'prompt_eval_count', 'total_duration'):
+                        if key in data:
+                            stats[key] = data[key]
+        stats['latency'] = time.perf_counter() - start
+        stats['completed'] = True
+        logging.debug("Full response from Ollama: %s", full_response)
+        return full_response
+
+    def generate_stats(self) -> Dict:
+        """Timing and token counts of this thread's latest generate call (used by the benchmark runner)."""
+        if not hasattr(self._stats, 'current'):
+            self._stats.current = {}
+        return self._stats.current
+
+    def _generate(self, prompt: str, model: str) -> str:
+        """Send a prompt to Ollama and return the concatenated streamed response.
+
+        With a host pool, the request goes to the least busy host and is retried on another
+        host if it fails there.
+        """
+        self._stats.current = {}
+        if self.host_pool is None:
+            return self._post_generate(self.base_url, prompt, model)
+
+        tried = set()
+        last_error = None
+        while True:
+            try:
+                host = self.host_pool.acquire(model, exclude=tried)
+            except NoHealthyHostError as e:
+                raise Exception(f"{e}; last error: {last_error}") if last_error else e
+            tried.add(host)
+            start = time.perf_counter()
+            try:
+                full_response = self._post_generate(host, prompt, model)
+            except (requests.exceptions.RequestException, ValueError) as e:
+                self.host_pool.release(host, False, time.perf_counter() - start)
+                logging.warning("Ollama host %s failed, retrying on another host: %s", host, str(e))
+                last_error = e
+                continue
+            self.host_pool.release(host, True, time.perf_counter() - start)
+            return full_response
+
+    def host_stats(self) -> List[Dict]:
+        """Per-host request counts and throughput for the pool (a single row without one)."""
+        if self.host_pool is None:
+            return [{'host': self.base_url}]
+        return self.host_pool.stats()
+
+    @staticmethod
+    def build_prompt(content: str, url: str, fields=None, prompt_version=None) -> str:
+        """Full analysis prompt, or a shrunk one asking only for `fields`."""
+        if not fields or set(fields) == set(REQUIRED_FIELDS):
+            return load_prompt(prompt_version).format(url=url, content=content[:4000])
+        return PARTIAL_ANALYSIS_PROMPT.format(
+            instructions="\n".join(
+                f'{i}. "{field}": {FIELD_INSTRUCTIONS[field]}' for i, field in enumerate(fields, 1)
+            ),
+            structure=",\n".join(f'    "{field}": "string"' for field in fields),
+            url=url,
+            content=content[:4000]
+        )
+
+    def analyze_with_ollama(self, content: str, url: str, model=None, fields=None, prompt_version=None) -> dict:
+        """Analyze one site. `fields` restricts the prompt to a subset of REQUIRED_FIELDS;
+        `prompt_version` picks the full prompt (see load_prompt)."""
+        fields = fields or REQUIRED_FIELDS
         try:
             logging.debug("Starting Ollama analysis for URL: %s", url)
-            formatted_prompt = ANALYSIS_PROMPT.format(
-                url=url,
-                content=content[:4000]
-            )
+            formatted_prompt = self.build_prompt(content, url, fields, prompt_version)
             logging.debug("Formatted prompt: %s", formatted_prompt)
             model_to_infer = model or self.model
-            timeout = 300 if model_to_infer in ["deepseek-r1:32b", "llama3.3:70b"] else 120
-
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json={
-                    "model": model_to_infer,
-                    "prompt": formatted_prompt,
-                    "temperature": OLLAMA_CONFIG['TEMPERATURE'],
-                    "format": "json"
-                },
-                timeout=timeout
-            )
-            logging.debug("Ollama response status code: %s", response.status_code)
-            response.raise_for_status()
-
-            full_response = ""
-            for line in response.iter_lines():
-                if line:
-                    data = json.loads(line)
-                    if 'response' in data:
-                        full_response += data['response']
-            logging.debug("Full response from Ollama: %s", full_response)
-            
+            full_response = self._generate(formatted_prompt, model_to_infer)
+
             json_start = full_response.find('{')
             json_end = full_response.rfind('}') + 1
             if json_start >= 0 and json_end > json_start:
@@ -79,8 +156,7 @@ class ContentAnalyzer:
                 raise ValueError("No valid JSON found in response")
 
             # Validate required keys; if missing, assign defaults
-            required_fields = ['keywords', 'business_name', 'products_services', 'target_audience', 'location']
-            for field in required_fields:
+            for field in fields:
                 if field not in analysis:
                     logging.warning("Field '%s' not found in analysis. Setting default empty value.", field)
                     analysis[field] = ""
@@ -90,14 +166,79 @@ class ContentAnalyzer:
         except Exception as e:
             logging.error("Error in Ollama analysis for URL %s: %s", url, str(e))
             # Fallback: Return a default JSON so processing can continue
-            return {
+            fallback = {
                 "keywords": "",
                 "business_name": "",
                 "products_services": "",
                 "target_audience": "",
-                "location": "United States",
-                "error": f"Fallback triggered: {str(e)}"
+                "location": "United States"
             }
+            fallback = {field: fallback[field] for field in fields}
+            fallback["error"] = f"Fallback triggered: {str(e)}"
+            return fallback
+
+    @staticmethod
+    def _parse_batch_response(full_response: str) -> List[Dict]:
+        """Pull the list of per-site objects out of a batched response.
+
+        Accepts a bare JSON array, an object wrapping the array (e.g. {"results": [...]})
+        or an object keyed by URL. Text after the JSON (model chatter, a closing code fence) is ignored.
+        """
+        start = min([i for i in (full_response.find('['), full_response.find('{')) if i >= 0], default=-1)
+        if start < 0:
+            raise ValueError("No valid JSON found in batch response")
+        parsed, _ = json.JSONDecoder().raw_decode(full_response, start)
+        if isinstance(parsed, list):
+            return parsed
+        if isinstance(parsed, dict):
+            for value in parsed.values():
+                if isinstance(value, list):
+                    return value
+            return [dict(item, url=key) for key, item in parsed.items() if isinstance(item, dict)]
+        raise ValueError("Batch response is neither a JSON array nor an object")
+
+    @staticmethod
+    def _is_valid_batch_item(item) -> bool:
+        """A batched element is usable only if it carries every field as a string or list"""
+        if not isinstance(item, dict):
+            return False
+        return all(isinstance(item.get(field), (str, list)) for field in REQUIRED_FIELDS)
+
+    def analyze_batch_with_ollama(self, sites: List[Dict], model=None) -> Dict[str, dict]:
+        """Analyze several sites with a single Ollama request.
+
+        `sites` is a list of {'url': ..., 'content': ...}. Returns a dict mapping each url to
+        its analysis. Sites whose element is missing or invalid in the batched answer (or the
+        whole batch, if the request fails) fall back to single-site `analyze_with_ollama`.
+        """
+        model_to_infer = model or self.model
+        max_chars = OLLAMA_CONFIG['BATCH_CONTENT_CHARS']
+        results = {}
+        if len(sites) > 1:
+            try:
+                logging.debug("Starting batched Ollama analysis for %d URLs", len(sites))
+                site_blocks = "\n\n".join(
+                    BATCH_SITE_TEMPLATE.format(url=site['url'], content=site['content'][:max_chars])
+                    for site in sites
+                )
+                formatted_prompt = BATCH_ANALYSIS_PROMPT.format(count=len(sites), sites=site_blocks)
+                full_response = self._generate(formatted_prompt, model_to_infer)
+                requested = {site['url'].rstrip('/').lower(): site['url'] for site in sites}
+                for item in self._parse_batch_response(full_response):
+                    if not self._is_valid_batch_item(item):
+                        logging.warning("Dropping invalid batch element: %s", item)
+                        continue
+                    url = requested.get(str(item.get('url', '')).rstrip('/').lower())
+                    if url and url not in results:
+                        results[url] = {field: item[field] for field in REQUIRED_FIELDS}
+            except Exception as e:
+                logging.error("Batched Ollama analysis failed for %d URLs: %s", len(sites), str(e))
+
+        for site in sites:
+            if site['url'] not in results:
+                logging.debug("Falling back to single-site analysis for URL: %s", site['url'])
+                results[site['url']] = self.analyze_with_ollama(site['content'], site['url'], model=model_to_infer)
+        return results
 
     def process_scraped_data(self, input_json: str, output_file: str = None) -> Dict:
         """Process scraped data from JSON file"""
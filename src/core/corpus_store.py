@@ -0,0 +1,170 @@
+# src/core/corpus_store.py
+"""Columnar store for scraped pages: date-partitioned Arrow IPC files that readers memory-map.
+
+    output/corpus/date=2025-03-09/part-20250309_101500-1234-0.arrow
+
+Files are written uncompressed so a reader maps them instead of parsing them; selecting a
+few columns (say url and title) only touches the pages of those columns on disk.
+"""
+import os
+import glob
+import atexit
+import json
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from config.settings import CORPUS_CONFIG
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+CORPUS_COLUMNS = ['url', 'fetched_at', 'status', 'error', 'title', 'description', 'content', 'structured_data']
+
+
+def corpus_schema():
+    return pa.schema([
+        ('url', pa.string()),
+        ('fetched_at', pa.timestamp('ms')),
+        ('status', pa.dictionary(pa.int8(), pa.string())),
+        ('error', pa.string()),
+        ('title', pa.string()),
+        ('description', pa.string()),
+        ('content', pa.large_string()),
+        # JSON text; nested JSON-LD varies too much between sites for a fixed struct type
+        ('structured_data', pa.large_string())
+    ])
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("The corpus store needs pyarrow (pip install pyarrow)")
+
+
+class CorpusWriter:
+    """Buffers scraped pages and writes them out as one Arrow file per `batch_rows` pages.
+
+    Safe to share between threads; each process writes its own part files, so job workers
+    can write to the same corpus directory at the same time.
+    """
+
+    def __init__(self, root: str = None, batch_rows: int = None):
+        _require_pyarrow()
+        self.root = root or CORPUS_CONFIG['DIR']
+        self.batch_rows = batch_rows or CORPUS_CONFIG['BATCH_ROWS']
+        self.schema = corpus_schema()
+        self.rows = {column: [] for column in CORPUS_COLUMNS}
+        self.count = 0
+        self.parts = 0
+        self.lock = threading.Lock()
+
+    def add(self, url: str, scraped_data: Dict = None, error: str = None, fetched_at: datetime = None):
+        """Queue one page (or one failed fetch when `error` is given)."""
+        scraped_data = scraped_data or {}
+        metadata = scraped_data.get('metadata') or {}
+        row = {
+            'url': url,
+            'fetched_at': fetched_at or datetime.now(),
+            'status': 'error' if error else 'success',
+            'error': error or '',
+            'title': metadata.get('title', ''),
+            'description': metadata.get('meta_description', ''),
+            'content': scraped_data.get('content', '') if not error else '',
+            'structured_data': json.dumps(scraped_data.get('structured_data') or {}, default=str)
+        }
+        with self.lock:
+            for column in CORPUS_COLUMNS:
+                self.rows[column].append(row[column])
+            self.count += 1
+            if self.count >= self.batch_rows:
+                self._flush_locked()
+
+    def flush(self):
+        with self.lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self.count:
+            return
+        table = pa.Table.from_pydict(self.rows, schema=self.schema)
+        self.rows = {column: [] for column in CORPUS_COLUMNS}
+        self.count = 0
+        now = datetime.now()
+        part_dir = os.path.join(self.root, f"date={now.strftime('%Y-%m-%d')}")
+        os.makedirs(part_dir, exist_ok=True)
+        path = os.path.join(part_dir, f"part-{now.strftime('%Y%m%d_%H%M%S')}-{os.getpid()}-{self.parts}.arrow")
+        self.parts += 1
+        tmp_path = f"{path}.tmp"
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, self.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        logging.debug("Wrote %d pages to %s", table.num_rows, path)
+
+
+class CorpusReader:
+    """Memory-mapped, column-selective access to a corpus directory."""
+
+    def __init__(self, root: str = None):
+        _require_pyarrow()
+        self.root = root or CORPUS_CONFIG['DIR']
+
+    @staticmethod
+    def is_corpus(path: str) -> bool:
+        return os.path.isdir(path) and bool(glob.glob(os.path.join(path, 'date=*', '*.arrow')))
+
+    def files(self, start_date: str = None, end_date: str = None) -> List[str]:
+        """Part files, optionally only those in date partitions between start_date and end_date (YYYY-MM-DD)."""
+        paths = []
+        for part_dir in sorted(glob.glob(os.path.join(self.root, 'date=*'))):
+            date = os.path.basename(part_dir)[len('date='):]
+            if (start_date and date < start_date) or (end_date and date > end_date):
+                continue
+            paths.extend(sorted(glob.glob(os.path.join(part_dir, '*.arrow'))))
+        return paths
+
+    def iter_tables(self, columns: List[str] = None, start_date: str = None, end_date: str = None) -> Iterator:
+        """One pyarrow Table per part file, holding only `columns`; the data stays in the mapped file."""
+        for path in self.files(start_date, end_date):
+            source = pa.memory_map(path, 'r')
+            table = pa.ipc.open_file(source).read_all()
+            yield table.select(columns) if columns else table
+
+    def read(self, columns: List[str] = None, start_date: str = None, end_date: str = None):
+        """All part files as one Table (chunks are not copied)."""
+        tables = list(self.iter_tables(columns, start_date, end_date))
+        if not tables:
+            schema = corpus_schema()
+            return schema.empty_table().select(columns) if columns else schema.empty_table()
+        return pa.concat_tables(tables)
+
+    def to_frame(self, columns: List[str] = None, start_date: str = None, end_date: str = None):
+        return self.read(columns, start_date, end_date).to_pandas()
+
+    def iter_pages(self, columns: List[str] = None) -> Iterator[Dict]:
+        """Row dicts, one record batch at a time."""
+        for table in self.iter_tables(columns):
+            for batch in table.to_batches():
+                yield from batch.to_pylist()
+
+
+_writer: Optional[CorpusWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_corpus_writer() -> Optional[CorpusWriter]:
+    """Process-wide writer, or None when the corpus store is disabled or pyarrow is missing."""
+    global _writer
+    if not CORPUS_CONFIG['ENABLED']:
+        return None
+    with _writer_lock:
+        if _writer is None:
+            if pa is None:
+                logging.warning("CORPUS_STORE is on but pyarrow is not installed; scraped pages are not kept")
+                CORPUS_CONFIG['ENABLED'] = False
+                return None
+            _writer = CorpusWriter()
+            atexit.register(_writer.flush)
+        return _writer
@@ -1,12 +1,28 @@
 # src/data_processer.py
+import os
+import json
+from datetime import datetime
 import pandas as pd
 from urllib.parse import urlparse, urljoin
 import re
 from typing import List, Dict
+from config.config import PATHS
+
+# Public suffixes with more than one label that are common in our lead lists. Anything not
+# listed here is treated as a single-label suffix (com, net, io, ...).
+MULTI_PART_SUFFIXES = {
+    'co.uk', 'org.uk', 'me.uk', 'ltd.uk', 'plc.uk', 'ac.uk', 'gov.uk',
+    'com.au', 'net.au', 'org.au', 'edu.au', 'gov.au',
+    'co.nz', 'org.nz', 'net.nz', 'co.in', 'net.in', 'org.in', 'firm.in', 'gen.in', 'ind.in',
+    'co.za', 'org.za', 'com.br', 'net.br', 'com.mx', 'com.ar', 'com.co', 'com.sg', 'com.my',
+    'com.ph', 'com.tr', 'com.cn', 'com.hk', 'com.tw', 'co.jp', 'ne.jp', 'or.jp', 'co.kr',
+    'co.il', 'com.pk', 'com.ng', 'com.eg', 'com.sa', 'co.id', 'co.th', 'com.vn', 'com.ua'
+}
+IP_ADDRESS = re.compile(r'^\d{1,3}(\.\d{1,3}){3}$')
 
 class DataProcessor:
-    def __init__(self):
-        pass
+    def __init__(self, results_dir: str = None):
+        self.results_dir = results_dir or PATHS['SCRAPING_DIR']
     
     def read_excel_to_url(self, file_path: str) -> list:
         """Read Excel file"""
@@ -18,6 +34,17 @@ class DataProcessor:
         except Exception as e:
             raise Exception(f"Error reading Excel file: {str(e)}")
         
+    def read_input_frame(self, file_path: str) -> pd.DataFrame:
+        """Read an uploaded CSV/XLS/XLSX input file into a DataFrame"""
+        if file_path.endswith('.csv'):
+            try:
+                return pd.read_csv(file_path)
+            except UnicodeDecodeError:
+                return pd.read_csv(file_path, encoding='ISO-8859-1')
+        if file_path.endswith(('.xlsx', '.xls')):
+            return pd.read_excel(file_path)
+        raise Exception("Unsupported file format. Please upload a CSV or Excel file.")
+
     def clean_url(self, url: str) -> str:
         """Clean and validate URL, adding scheme if missing"""
         try:
@@ -41,37 +68,82 @@ class DataProcessor:
         except Exception as e:
             raise Exception(f"Error processing URL {url}: {str(e)}")
         
+    def canonical_host(self, url: str) -> str:
+        """Reduce a Domain cell to its lower-cased host (e.g. 'HTTP://www.Shop.Example.co.uk:8080/about' -> 'shop.example.co.uk').
+
+        Scheme, a leading 'www.', port, path and case are dropped; subdomains are kept.
+        Returns '' when no host can be found.
+        """
+        url = str(url or '').strip()
+        urls = re.findall(r'[\w\-\.]+\.[\w\-\.]+\w+', url)
+        if not urls:
+            return ''
+        if '://' in url:
+            host = urlparse(url).hostname or urls[0]
+        else:
+            host = urls[0]
+        host = host.lower().strip('.')
+        return host[4:] if host.startswith('www.') else host
+
+    def canonical_domain(self, url: str) -> str:
+        """Reduce a Domain cell to its registrable domain (e.g. 'HTTP://www.Shop.Example.co.uk/about' -> 'example.co.uk').
+
+        Used to match SERP entries to a site; use canonical_host to tell sites apart.
+        Returns '' when no host can be found.
+        """
+        host = self.canonical_host(url)
+        if not host or IP_ADDRESS.match(host):
+            return host
+        labels = host.split('.')
+        suffix_len = 2 if '.'.join(labels[-2:]) in MULTI_PART_SUFFIXES else 1
+        return '.'.join(labels[-(suffix_len + 1):])
+
+    def group_duplicates(self, domains: List[str]) -> Dict[str, List[int]]:
+        """Group row indexes by canonical host, in order of first appearance.
+
+        Only the scheme, 'www.' and port are ignored: 'shop.acme.com' and 'acme.com' are
+        different sites, as are 'foo.wixsite.com' and 'bar.wixsite.com'.
+
+        Rows without a usable domain each get their own group so they still report their own error.
+        """
+        groups = {}
+        for idx, domain in enumerate(domains):
+            key = self.canonical_host(domain) or f"__row_{idx}"
+            groups.setdefault(key, []).append(idx)
+        return groups
+
     def store_result(self, url: str, scraped_data: Dict) -> str:
-            """Store scraped data in JSON format"""
-            try:
-                # Create result object
-                result = {
-                    'url': url,
-                    'timestamp': datetime.now().isoformat(),
-                    'status': 'success' if scraped_data['content'] else 'empty',
-                    'data': {
-                        'content': scraped_data['content'],
-                        'metadata': {
-                            'title': scraped_data['metadata'].get('title', ''),
-                            'meta_description': scraped_data['metadata'].get('meta_description', ''),
-                            'keywords': scraped_data['metadata'].get('keywords', []),
-                            'headers': scraped_data['metadata'].get('headers', {}),
-                        }
+        """Store scraped data in JSON format"""
+        try:
+            # Create result object
+            result = {
+                'url': url,
+                'timestamp': datetime.now().isoformat(),
+                'status': 'success' if scraped_data['content'] else 'empty',
+                'data': {
+                    'content': scraped_data['content'],
+                    'metadata': {
+                        'title': scraped_data['metadata'].get('title', ''),
+                        'meta_description': scraped_data['metadata'].get('meta_description', ''),
+                        'keywords': scraped_data['metadata'].get('keywords', []),
+                        'headers': scraped_data['metadata'].get('headers', {}),
                     }
                 }
-                
-                # Generate filename
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                domain = urlparse(url).netloc
-                filename = f"{self.results_dir}/{domain}_{timestamp}.json"
-                
-                # Save to JSON file
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(result, f, indent=2, ensure_ascii=False)
-                    
-                return filename
-                
-            except Exception as e:
-                raise Exception(f"Error storing results for {url}: {str(e)}")
+            }
+
+            # Generate filename
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            domain = urlparse(url).netloc.replace(':', '_')
+            os.makedirs(self.results_dir, exist_ok=True)
+            filename = os.path.join(self.results_dir, f"{domain}_{timestamp}.json")
+
+            # Save to JSON file
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2, ensure_ascii=False)
+
+            return filename
+
+        except Exception as e:
+            raise Exception(f"Error storing results for {url}: {str(e)}")
 
 
@@ -0,0 +1,74 @@
+# src/core/field_normalizer.py
+"""Column-wise clean-up of the list fields Ollama returns, for a whole batch of results at once.
+
+Workers leave each analysis' raw keywords, products/services and target audiences on the
+result under RAW_FIELDS_KEY; FieldNormalizer splits, filters and spreads them over the
+Keyword 1..5, Product/Service 1..3 and Target Audience 1..3 columns with vectorized
+string operations over every result of the batch.
+"""
+import re
+from typing import Dict, List
+import pandas as pd
+
+RAW_FIELDS_KEY = "_raw_fields"
+
+US_STATES = frozenset({
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA",
+    "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD",
+    "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ",
+    "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC",
+    "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY"
+})
+# 'plumbingServices' -> 'plumbing Services'
+CAMEL_BOUNDARY = re.compile(r'(?<=[a-z])(?=[A-Z])')
+
+# (analysis field, output column prefix, number of columns, keyword clean-up)
+LIST_FIELDS = (
+    ('keywords', 'Keyword', 5, True),
+    ('products_services', 'Product/Service', 3, False),
+    ('target_audience', 'Target Audience', 3, False),
+)
+FIELD_COLUMNS = [f"{prefix} {i}" for _, prefix, width, _ in LIST_FIELDS for i in range(1, width + 1)]
+
+
+class FieldNormalizer:
+    """Builds the list-field output columns for many results in one pass."""
+
+    def items(self, values: List) -> pd.Series:
+        """One entry per list item, indexed by result position; comma strings are split."""
+        values = pd.Series(values, dtype=object)
+        is_text = values.map(type).eq(str)
+        values = values.where(~is_text, values[is_text].str.split(','))
+        items = values.explode().dropna()
+        return items.astype(str).str.strip()
+
+    def spread(self, items: pd.Series, prefix: str, width: int, length: int) -> pd.DataFrame:
+        """The first `width` items of each result as columns '<prefix> 1'..'<prefix> width', padded with ''."""
+        slot = items.groupby(level=0).cumcount()
+        items, slot = items[slot < width], slot[slot < width]
+        frame = pd.DataFrame({'row': items.index, 'slot': slot.to_numpy(), 'value': items.to_numpy()})
+        frame = frame.pivot(index='row', columns='slot', values='value')
+        frame = frame.reindex(index=range(length), columns=range(width)).fillna('')
+        frame.columns = [f"{prefix} {i}" for i in range(1, width + 1)]
+        return frame
+
+    def normalize(self, analyses: List[Dict]) -> pd.DataFrame:
+        """The FIELD_COLUMNS for each analysis dict, one row per analysis."""
+        frames = []
+        for field, prefix, width, is_keyword in LIST_FIELDS:
+            items = self.items([analysis.get(field) or [] for analysis in analyses])
+            if is_keyword:
+                items = items[~items.str.upper().isin(US_STATES)]
+                items = items.str.replace('_', ' ', regex=False).str.replace(CAMEL_BOUNDARY, ' ', regex=True).str.strip()
+            frames.append(self.spread(items, prefix, width, len(analyses)))
+        return pd.concat(frames, axis=1)
+
+    def apply(self, results: List[Dict]) -> List[Dict]:
+        """Fill in the list-field columns of every result carrying RAW_FIELDS_KEY, in place."""
+        pending = [result for result in results if result is not None and RAW_FIELDS_KEY in result]
+        if not pending:
+            return results
+        columns = self.normalize([result.pop(RAW_FIELDS_KEY) for result in pending])
+        for result, values in zip(pending, columns.to_dict('records')):
+            result.update(values)
+        return results
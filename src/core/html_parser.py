@@ -0,0 +1,169 @@
+# src/core/html_parser.py
+"""CPU-bound HTML work, run in a shared process pool so parsing is not serialized on the GIL.
+
+Fetching stays on threads. Workers receive the page source and return compact results
+(text, metadata, structured data, contacts, link lists), never soup objects.
+"""
+import re
+import logging
+import threading
+import multiprocessing
+import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlparse, parse_qs, urljoin, unquote_plus
+import lxml.html
+from bs4 import BeautifulSoup
+from config.config import PARSE_WORKERS
+from src.core.structured_data import StructuredDataExtractor
+from src.core.contact_extractor import ContactExtractor
+
+_structured_data = StructuredDataExtractor()
+_contacts = ContactExtractor()
+
+
+def parse_page(html, url=''):
+    """Text, metadata, structured data and contacts of a scraped page fetched from `url`."""
+    soup = BeautifulSoup(html, 'html.parser')
+    # Read JSON-LD before text extraction; its <script> tags are never part of the text
+    structured_data = _structured_data.extract(soup, url)
+    # Contacts come from the whole page (footers included) and its mailto:/tel: links,
+    # not from the text trimmed for the prompt
+    contacts = _contacts.extract(soup)
+
+    # Extract text content
+    text_content = ' '.join([
+        p.text for p in soup.find_all(['p', 'h1', 'h2', 'h3', 'div'])
+    ])
+    text_content = re.sub(r'\s+', ' ', text_content).strip()
+
+    description = soup.find('meta', {'name': 'description'})
+    metadata = {
+        'title': soup.title.text if soup.title else '',
+        'meta_description': description.get('content', '') if description else '',
+        # Structure hints for the page classifier
+        'page_signals': {
+            'password_fields': len(soup.find_all('input', {'type': 'password'})),
+            'forms': len(soup.find_all('form')),
+            'links': len(soup.find_all('a', href=True))
+        }
+    }
+    return {
+        'content': text_content,
+        'metadata': metadata,
+        'structured_data': structured_data,
+        'contacts': contacts
+    }
+
+
+# Organic result titles: an <h3> inside a link, outside the ad blocks
+GOOGLE_ORGANIC_XPATH = ('//a[@href][.//h3][not(ancestor::*[@id="tads" or @id="tadsb" or @id="bottomads"'
+                        ' or @data-text-ad])]')
+GOOGLE_MAPS_XPATH = '//a[contains(@href, "/maps/place/")]'
+# Local pack entries and the business knowledge panel
+GOOGLE_LOCAL_XPATH = ('//*[@data-cid or @data-local-attribute or starts-with(@data-attrid, "kc:/local")'
+                      ' or starts-with(@data-attrid, "kc:/location")]')
+
+
+def unwrap_google_link(href):
+    """Target of a Google link; the no-JavaScript page wraps them as /url?q=<target>."""
+    if href.startswith('/url?'):
+        href = parse_qs(urlparse(href).query).get('q', [''])[0]
+    return urljoin('https://www.google.com/', href)
+
+
+def google_result_url(href):
+    """Result target, or None for Google's own pages (Maps, Images, related searches)."""
+    href = unwrap_google_link(href)
+    if not href.startswith('http'):
+        return None
+    host = urlparse(href).netloc.lower()
+    if host == 'google.com' or host.endswith('.google.com') or host.startswith('google.'):
+        return None
+    return href
+
+
+def google_serp(html):
+    """Organic result URLs of a Google result page in ranking order, plus its local listings.
+
+    'gmb' lists the businesses in the local pack / knowledge panel as {"title", "website", "url"};
+    'local_pack' tells whether the page had local results at all. An empty or unparseable
+    body raises ValueError (lxml's own errors cannot be sent back from the parse pool).
+    """
+    try:
+        tree = lxml.html.fromstring(html)
+    except lxml.etree.LxmlError as e:
+        raise ValueError(f"Unparseable result page: {str(e)}")
+    organic, seen = [], set()
+    for anchor in tree.xpath(GOOGLE_ORGANIC_XPATH):
+        url = google_result_url(anchor.get('href'))
+        if url and url not in seen:
+            seen.add(url)
+            organic.append(url)
+
+    listings = []
+    for anchor in tree.xpath(GOOGLE_MAPS_XPATH):
+        url = unwrap_google_link(anchor.get('href'))
+        # /maps/place/Acme+Plumbing/@30.2,... carries the listing name
+        name = url.split('/maps/place/', 1)[1].split('/', 1)[0]
+        listings.append({'title': unquote_plus(name), 'website': '', 'url': url})
+    blocks = tree.xpath(GOOGLE_LOCAL_XPATH)
+    for block in blocks:
+        websites = [google_result_url(href) for href in block.xpath('.//a/@href')]
+        websites = [w for w in websites if w]
+        if websites:
+            title = block.get('aria-label') or ' '.join(block.xpath('string(.//*[@role="heading"] | .//h2 | .//h3)').split())
+            listings.append({'title': title, 'website': websites[0], 'url': ''})
+    return {
+        'organic': organic,
+        'gmb': {'local_pack': bool(blocks or listings), 'listings': listings}
+    }
+
+
+def sitemap_urls(xml):
+    """<loc> entries of a sitemap."""
+    return [tag.text for tag in BeautifulSoup(xml, 'xml').find_all('loc')]
+
+
+def has_noindex(html):
+    """Whether a page carries <meta name="robots" content="noindex">."""
+    meta_robots = BeautifulSoup(html, 'html.parser').find('meta', attrs={'name': 'robots'})
+    return bool(meta_robots) and 'noindex' in meta_robots.get('content', '').lower()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_pool_size = PARSE_WORKERS
+
+
+def set_parse_workers(workers):
+    """Size this process' parse pool; job worker processes share the CPUs between them."""
+    global _pool_size
+    _pool_size = workers
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=_pool_size, mp_context=multiprocessing.get_context('spawn')
+            )
+        return _pool
+
+
+def run_parser(func, *args):
+    """Run one of the parse functions above in the parse pool (in this thread if the pool size is 0)."""
+    global _pool
+    if not _pool_size:
+        return func(*args)
+    pool = _get_pool()
+    try:
+        return pool.submit(func, *args).result()
+    except BrokenProcessPool:
+        # A worker died (out of memory on a huge page, killed). Parsing the page again here
+        # would likely take this process down too: fail it and start a fresh pool next time.
+        logging.error("HTML parse pool broke while running %s, restarting it", func.__name__)
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        raise RuntimeError("HTML parser crashed on this page")
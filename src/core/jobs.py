@@ -0,0 +1,289 @@
+# src/core/jobs.py
+import os
+import json
+import uuid
+import threading
+import logging
+import multiprocessing
+import concurrent.futures
+from contextlib import closing
+from datetime import datetime
+from typing import Dict, List, Optional
+import pandas as pd
+from config.config import PARSE_WORKERS
+from config.settings import JOB_CONFIG, PROFILE_CONFIG
+from src.core.data_processer import DataProcessor
+from src.core.result_store import ResultStore
+from src.core.html_parser import set_parse_workers
+from src.utils.model_residency import get_residency_manager
+from src.utils.profiler import profiling, OFF
+from src.core.pipeline import ExtractionPipeline, CompetitorPipeline, EXTRACTION_COLUMNS, COMPETITOR_COLUMNS
+
+ACTIVE_STATES = ('queued', 'running')
+
+
+class JobStore:
+    """On-disk state of one job: job.json (spec + status), results.jsonl (finished rows) and a cancel flag.
+
+    Keeping this on disk lets worker processes report progress and lets the UI pick a job
+    back up after a rerun or from another session.
+    """
+
+    def __init__(self, job_dir: str):
+        self.job_dir = job_dir
+        self.status_file = os.path.join(job_dir, 'job.json')
+        self.results_file = os.path.join(job_dir, 'results.jsonl')
+        self.cancel_file = os.path.join(job_dir, 'cancel')
+        self.lock = threading.Lock()
+
+    def read(self) -> Dict:
+        with open(self.status_file, 'r') as f:
+            return json.load(f)
+
+    def write(self, status: Dict):
+        os.makedirs(self.job_dir, exist_ok=True)
+        # The UI process and the job's worker both write here: each writer gets its own tmp file
+        tmp_file = f"{self.status_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(status, f, default=str)
+        os.replace(tmp_file, self.status_file)
+
+    def update(self, **fields):
+        with self.lock:
+            status = self.read()
+            status.update(fields)
+            self.write(status)
+            return status
+
+    def append_results(self, indexed_results):
+        with open(self.results_file, 'a', encoding='utf-8') as f:
+            for idx, result in indexed_results:
+                f.write(json.dumps({'index': idx, 'result': result}, default=str) + '\n')
+
+    def read_results(self, offset: int = 0):
+        """Entries appended since byte `offset`, and the offset to resume from next time."""
+        if not os.path.exists(self.results_file):
+            return [], offset
+        entries = []
+        with open(self.results_file, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # The worker is halfway through writing this line; pick it up next time
+                    break
+                entries.append(json.loads(line))
+                offset += len(line)
+        return entries, offset
+
+    def request_cancel(self):
+        open(self.cancel_file, 'w').close()
+
+    def cancel_requested(self) -> bool:
+        return os.path.exists(self.cancel_file)
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Exists, owned by someone else
+        return True
+    return True
+
+
+def build_pipeline(kind: str, options: Dict):
+    if kind == 'extraction':
+        return ExtractionPipeline(
+            model=options['model'],
+            use_cache=options.get('use_cache', True),
+            max_workers=options.get('max_workers', 8),
+            sites_per_prompt=options.get('sites_per_prompt', 1),
+            retry_failed=options.get('retry_failed', False)
+        )
+    return CompetitorPipeline(
+        search_method=options['search_method'],
+        api_key=options.get('api_key'),
+        gmb_check=options.get('gmb_check', False),
+        no_of_pages=options.get('no_of_pages', 1),
+        use_cache=options.get('use_cache', True)
+    )
+
+
+def run_job(job_dir: str, kind: str, options: Dict):
+    """Entry point in the worker process: run the whole job and stream results to its JobStore."""
+    store = JobStore(job_dir)
+    if store.cancel_requested():
+        store.update(state='cancelled', finished_at=datetime.now().isoformat())
+        return
+    store.update(state='running', started_at=datetime.now().isoformat(), pid=os.getpid())
+    job_id = os.path.basename(job_dir)
+    profile_mode = options.get('profile', OFF)
+    try:
+        rows = DataProcessor().read_input_frame(options['input_path']).to_dict(orient="records")
+        pipeline = build_pipeline(kind, options)
+        done = 0
+        # closing(): a cancelled job's generator finishes (flushing what it buffered) right away
+        with profiling(profile_mode, job_id, options.get('profile_sample')), \
+                closing(pipeline.iter_batches(rows, options.get('batch_size', 8))) as batches:
+            for batch_number, batch in enumerate(batches, 1):
+                store.append_results(batch)
+                done += len(batch)
+                store.update(done=done, batches=batch_number)
+                if options.get('save_interim') and batch_number % 10 == 0:
+                    os.makedirs("output/Interim", exist_ok=True)
+                    partial = pd.DataFrame([entry['result'] for entry in store.read_results()[0]])
+                    partial.index = partial.index + 1
+                    partial.to_excel(f"output/Interim/interim_{job_id}_{batch_number}.xlsx", index=True)
+                if store.cancel_requested():
+                    break
+        if store.cancel_requested():
+            store.update(state='cancelled', finished_at=datetime.now().isoformat())
+            return
+        final = {'state': 'completed', 'finished_at': datetime.now().isoformat()}
+        if profile_mode != OFF:
+            final['profile_dir'] = os.path.join(PROFILE_CONFIG['DIR'], job_id)
+        if kind == 'extraction':
+            from src.core.content_analyzer import ContentAnalyzer
+            final['host_stats'] = ContentAnalyzer(model=options['model']).host_stats()
+        store.update(**final)
+    except Exception as e:
+        logging.error("Job %s failed: %s", job_dir, str(e))
+        store.update(state='failed', error=str(e), finished_at=datetime.now().isoformat())
+
+
+class JobManager:
+    """Runs extraction and competitor jobs in a pool of worker processes.
+
+    Jobs are submitted with `submit` and identified by a job ID; status and partial results
+    are read back from disk. Extraction jobs pass through the model residency manager first,
+    so jobs that share a model run together.
+    """
+
+    def __init__(self, workers: int = None, jobs_dir: str = None):
+        self.workers = workers or JOB_CONFIG['WORKERS']
+        self.jobs_dir = jobs_dir or JOB_CONFIG['DIR']
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        # spawn, not fork: the parent is a multi-threaded Streamlit server. Each worker gets its
+        # share of the HTML parse processes, so the pools together stay at PARSE_WORKERS.
+        parse_workers = max(1, PARSE_WORKERS // self.workers) if PARSE_WORKERS else 0
+        self.pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+            initializer=set_parse_workers, initargs=(parse_workers,)
+        )
+        self.futures = {}
+        self.lock = threading.Lock()
+        self.started_at = datetime.now().isoformat()
+
+    def store(self, job_id: str) -> JobStore:
+        return JobStore(os.path.join(self.jobs_dir, job_id))
+
+    def submit(self, kind: str, options: Dict) -> str:
+        job_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        total = len(DataProcessor().read_input_frame(options['input_path']))
+        self.store(job_id).write({
+            'job_id': job_id,
+            'kind': kind,
+            'state': 'queued',
+            'total': total,
+            'done': 0,
+            'created_at': datetime.now().isoformat(),
+            # The Serper API key stays in memory only
+            'options': {k: v for k, v in options.items() if k != 'api_key'}
+        })
+        threading.Thread(target=self._dispatch, args=(job_id, kind, options), daemon=True).start()
+        logging.info("Submitted %s job %s (%d rows)", kind, job_id, total)
+        return job_id
+
+    def _dispatch(self, job_id: str, kind: str, options: Dict):
+        store = self.store(job_id)
+        try:
+            if kind == 'extraction':
+                with get_residency_manager().job(options['model']):
+                    self._run(job_id, kind, options)
+            else:
+                self._run(job_id, kind, options)
+        except Exception as e:
+            logging.error("Job %s could not run: %s", job_id, str(e))
+            store.update(state='failed', error=str(e), finished_at=datetime.now().isoformat())
+
+    def _run(self, job_id: str, kind: str, options: Dict):
+        store = self.store(job_id)
+        if store.cancel_requested():
+            store.update(state='cancelled', finished_at=datetime.now().isoformat())
+            return
+        future = self.pool.submit(run_job, store.job_dir, kind, options)
+        with self.lock:
+            self.futures[job_id] = future
+        future.result()
+
+    def cancel(self, job_id: str):
+        store = self.store(job_id)
+        store.request_cancel()
+        with self.lock:
+            future = self.futures.get(job_id)
+        if future is not None and future.cancel():
+            store.update(state='cancelled', finished_at=datetime.now().isoformat())
+
+    def status(self, job_id: str) -> Dict:
+        return self.store(job_id).read()
+
+    def list_jobs(self) -> List[Dict]:
+        """Every job on disk, newest first. Jobs left behind by a dead worker or server process are marked failed."""
+        jobs = []
+        for job_id in sorted(os.listdir(self.jobs_dir), reverse=True):
+            try:
+                status = self.status(job_id)
+            except (OSError, ValueError):
+                continue
+            if status.get('state') == 'running' and status.get('pid') and not pid_alive(status['pid']):
+                status = self.store(job_id).update(
+                    state='failed', error="Worker process exited before the job finished",
+                    finished_at=datetime.now().isoformat()
+                )
+            elif status.get('state') == 'queued' and status.get('created_at', '') < self.started_at:
+                # Queued by an earlier server process, which took the queue with it
+                status = self.store(job_id).update(
+                    state='failed', error="Server restarted before the job started",
+                    finished_at=datetime.now().isoformat()
+                )
+            jobs.append(status)
+        return jobs
+
+    def sync_results(self, job_id: str, result_store: ResultStore = None) -> ResultStore:
+        """Load rows finished since the last call into `result_store` (created on first use), in place."""
+        status = self.status(job_id)
+        if result_store is None:
+            columns = (["Email ID", "Domain"] + EXTRACTION_COLUMNS) if status['kind'] == 'extraction' \
+                else (["Domain"] + COMPETITOR_COLUMNS)
+            result_store = ResultStore(list(dict.fromkeys(columns)), status['total'])
+        entries, result_store.source_offset = self.store(job_id).read_results(result_store.source_offset)
+        for entry in entries:
+            result_store.set(entry['index'], entry['result'])
+        return result_store
+
+    def results_frame(self, job_id: str, result_store: ResultStore = None) -> pd.DataFrame:
+        """Finished rows so far, in input order."""
+        return self.sync_results(job_id, result_store).to_frame(filled_only=True)
+
+    def final_frame(self, job_id: str, columns: List[str], result_store: ResultStore = None) -> Optional[pd.DataFrame]:
+        """Input frame with the output columns filled in, once the job has completed."""
+        status = self.status(job_id)
+        if status['state'] != 'completed':
+            return None
+        df_input = DataProcessor().read_input_frame(status['options']['input_path'])
+        return self.sync_results(job_id, result_store).to_frame(base=df_input, columns=columns)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Process-wide job manager, so jobs outlive Streamlit reruns and sessions."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager()
+        return _manager
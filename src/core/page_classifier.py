@@ -0,0 +1,152 @@
+# src/core/page_classifier.py
+import math
+import os
+import re
+import logging
+from collections import Counter
+from typing import Dict, Optional, Tuple
+from config.settings import EXTRACTION_CONFIG
+
+OK = 'ok'
+
+# Why a page was skipped, shown in the Error column
+LABEL_ERRORS = {
+    'parked': "Parked or for-sale domain page",
+    'coming_soon': "Placeholder page (coming soon / under construction)",
+    'challenge': "Bot challenge page (Cloudflare or similar), no site content",
+    'login_wall': "Login wall, no public content",
+    'server_error': "Web server default or error page"
+}
+
+# Keyword signatures, matched against title + meta description + the start of the text
+SIGNATURES = {
+    'parked': re.compile(
+        r'this domain (name )?(is|may be) for sale|buy this domain|domain (is )?for sale|'
+        r'make an offer on this domain|parked (free|domain)|domain parking|sedo\s*(domain|parking)|'
+        r'hugedomains|dan\.com|afternic|godaddy\.com/domains|the domain name .{0,40} is for sale|'
+        r'related searches|this web page is parked', re.I),
+    'coming_soon': re.compile(
+        r'coming soon|under construction|launching soon|site (is )?under maintenance|'
+        r'we\'?re (currently )?working on (it|our (new )?website)|website (is )?coming soon|'
+        r'stay tuned|opening soon', re.I),
+    'challenge': re.compile(
+        r'just a moment\.\.\.|checking (if the site connection is secure|your browser)|'
+        r'attention required! \| cloudflare|enable javascript and cookies to continue|'
+        r'ddos protection by|cf-browser-verification|verify you are human|'
+        r'error code:? 5\d\d.{0,40}cloudflare|ray id:', re.I),
+    'login_wall': re.compile(
+        r'please (log|sign) ?in to (continue|access|view)|you must be logged in|'
+        r'(log|sign) ?in to your account|members only|restricted access', re.I),
+    'server_error': re.compile(
+        r'apache2 (ubuntu|debian) default page|welcome to nginx!|it works!|'
+        r'iis windows server|index of /|default web site page|'
+        r'(403 forbidden|404 not found|500 internal server error|502 bad gateway|503 service unavailable)', re.I)
+}
+TOKEN = re.compile(r'[a-z]{2,}')
+
+# Pages shorter than this (in characters of text) are treated as placeholders once a signature matches anywhere
+SHORT_PAGE_CHARS = 600
+# On longer pages a signature must appear this early (in title/description or lead text)...
+LEAD_CHARS = 400
+# ...and the page must also look like a placeholder: little text, few links and no forms
+THIN_PAGE_CHARS = 2000
+THIN_PAGE_LINKS = 10
+# Labels whose pages normally carry a form (login, challenge), so a form is no sign of a real site
+FORM_LABELS = {'challenge', 'login_wall'}
+
+
+class FixtureModel:
+    """Multinomial naive Bayes over word counts, trained from local fixture pages.
+
+    Fixtures are plain-text or HTML files under <fixtures_dir>/<label>/, with real sites in
+    <fixtures_dir>/ok/. Only used when the fixture directory exists.
+    """
+
+    def __init__(self, fixtures_dir: str):
+        self.label_counts = Counter()
+        self.token_counts = {}
+        self.totals = Counter()
+        for label in sorted(os.listdir(fixtures_dir)):
+            label_dir = os.path.join(fixtures_dir, label)
+            if not os.path.isdir(label_dir):
+                continue
+            counts = self.token_counts.setdefault(label, Counter())
+            for name in os.listdir(label_dir):
+                with open(os.path.join(label_dir, name), 'r', encoding='utf-8', errors='replace') as f:
+                    counts.update(TOKEN.findall(f.read().lower()))
+                self.label_counts[label] += 1
+            self.totals[label] = sum(counts.values())
+        self.vocabulary = len(set().union(*self.token_counts.values())) if self.token_counts else 0
+        logging.info("Trained page classifier on %d fixture pages", sum(self.label_counts.values()))
+
+    def predict(self, text: str) -> Tuple[Optional[str], float]:
+        """(label, probability) of the most likely label, or (None, 0.0) without fixtures."""
+        if not self.label_counts:
+            return None, 0.0
+        tokens = Counter(TOKEN.findall(text.lower()))
+        pages = sum(self.label_counts.values())
+        scores = {}
+        for label, counts in self.token_counts.items():
+            score = math.log(self.label_counts[label] / pages)
+            denominator = self.totals[label] + self.vocabulary + 1
+            for token, n in tokens.items():
+                score += n * math.log((counts.get(token, 0) + 1) / denominator)
+            scores[label] = score
+        best = max(scores, key=scores.get)
+        # Softmax over log scores for a confidence
+        top = scores[best]
+        probability = 1.0 / sum(math.exp(score - top) for score in scores.values())
+        return best, probability
+
+
+class PageClassifier:
+    """Labels scraped pages that are not worth an Ollama call: parked or for-sale domains,
+    placeholders, bot challenges, login walls and default server pages.
+
+    Keyword signatures are weighed against how much text the page has and where the match is;
+    on anything but short pages they also need structural evidence from the scraper's signals
+    (few links, no forms). When a fixture
+    directory is configured, a small naive Bayes model decides the pages the rules leave open.
+    """
+
+    def __init__(self, fixtures_dir: str = None, min_confidence: float = None):
+        fixtures_dir = fixtures_dir or EXTRACTION_CONFIG['CLASSIFIER_FIXTURES']
+        self.min_confidence = min_confidence or EXTRACTION_CONFIG['CLASSIFIER_MIN_CONFIDENCE']
+        self.model = FixtureModel(fixtures_dir) if fixtures_dir and os.path.isdir(fixtures_dir) else None
+
+    def thin_page(self, content: str, signals: Dict, label: str) -> bool:
+        """Whether a page longer than SHORT_PAGE_CHARS is still bare enough to be a `label` page."""
+        if len(content) >= THIN_PAGE_CHARS:
+            return False
+        if signals.get('forms') and label not in FORM_LABELS:
+            return False
+        # Pages cached before the scraper recorded links are judged on text alone
+        return signals.get('links', 0) < THIN_PAGE_LINKS
+
+    def classify(self, scraped_data: Dict) -> Tuple[str, str]:
+        """(label, reason) for a page returned by WebScraper.scrape_website; label is OK for real sites."""
+        metadata = scraped_data.get('metadata') or {}
+        content = scraped_data.get('content') or ''
+        signals = metadata.get('page_signals') or {}
+        head = f"{metadata.get('title', '')} {metadata.get('meta_description', '')}"
+        lead = f"{head} {content[:LEAD_CHARS]}"
+        short = len(content) < SHORT_PAGE_CHARS
+
+        for label, signature in SIGNATURES.items():
+            if short:
+                match = signature.search(lead) or signature.search(content)
+            else:
+                match = self.thin_page(content, signals, label) and signature.search(lead)
+            if match:
+                if label == 'login_wall' and not signals.get('password_fields'):
+                    continue
+                return label, f"matched '{match.group(0)}'"
+
+        if signals.get('password_fields') and short and signals.get('links', 0) < 5:
+            return 'login_wall', "short page with a password field and almost no links"
+
+        if self.model is not None:
+            label, probability = self.model.predict(f"{head} {content[:4000]}")
+            if label and label != OK and label in LABEL_ERRORS and probability >= self.min_confidence:
+                return label, f"fixture model, p={probability:.2f}"
+        return OK, ""
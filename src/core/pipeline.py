@@ -0,0 +1,587 @@
+# src/core/pipeline.py
+import time
+import asyncio
+import logging
+import concurrent.futures
+from urllib.parse import urlparse
+from src.core.scraper import WebScraper
+from src.core.content_analyzer import ContentAnalyzer
+from src.core.data_processer import DataProcessor
+from src.core.advanced_analytics import AdvancedAnalytics
+from src.core.serp_postprocess import SerpPostProcessor
+from src.core.field_normalizer import FieldNormalizer, LIST_FIELDS, RAW_FIELDS_KEY, FIELD_COLUMNS
+from src.core.page_classifier import PageClassifier, LABEL_ERRORS, OK
+from src.core.contact_extractor import ContactExtractor
+from src.core.corpus_store import get_corpus_writer
+from src.utils.cache import PageCache, NegativeCache
+from src.utils.dns_cache import get_dns_cache, host_variants, NXDOMAIN
+from src.utils.profiler import profiled_row
+from config.settings import EXTRACTION_CONFIG, SERPER_CONFIG
+
+EXTRACTION_COLUMNS = ["Business Name", "Business Location",
+                      "Keyword 1", "Keyword 2", "Keyword 3", "Keyword 4", "Keyword 5",
+                      "Product/Service 1", "Product/Service 2", "Product/Service 3",
+                      "Target Audience 1", "Target Audience 2", "Target Audience 3",
+                      "Emails", "Phones",
+                      "Status", "Error"]
+
+COMPETITOR_COLUMNS = ["Keyword 1", "Product/Service 1", "Search Query",
+                      "Top Competitor 1", "Serp Rank 1",
+                      "Top Competitor 2", "Serp Rank 2",
+                      "Top Competitor 3", "Serp Rank 3",
+                      "Domain Rank",
+                      "GMB Status", "Error", "Status"]
+
+
+def extraction_error_result(domain, email_id, error, status="error"):
+    """A complete extraction row with every expected key, for rows that failed outright."""
+    result = {"Email ID": email_id, "Domain": domain}
+    result.update({col: "" for col in EXTRACTION_COLUMNS})
+    result["Status"] = status
+    result["Error"] = error
+    return result
+
+
+class ExtractionPipeline:
+    """Scrape + Ollama extraction for the AI-Powered Data Extractor, independent of the UI."""
+
+    def __init__(self, model, use_cache=True, max_workers=8, sites_per_prompt=1, row_timeout=240, retry_failed=False,
+                 scraper=None, classifier=None):
+        """`scraper` and `classifier` may be shared between pipelines (see src/web/api.py); by default
+        each pipeline builds its own."""
+        self.model = model
+        self.use_cache = use_cache
+        # When False, domains whose last scrape failed return that error until it expires
+        self.retry_failed = retry_failed
+        self.max_workers = max_workers
+        self.sites_per_prompt = sites_per_prompt
+        self.row_timeout = row_timeout
+        self.scraper = scraper or WebScraper(concurrency=max_workers)
+        self.processor = DataProcessor()
+        self.cache_extractor = PageCache(cache_dir="output/cache_extractor")
+        self.negative_cache = NegativeCache()
+        if classifier is None and EXTRACTION_CONFIG['PAGE_CLASSIFIER']:
+            classifier = PageClassifier()
+        self.classifier = classifier
+        self.contact_extractor = ContactExtractor()
+        self.corpus = get_corpus_writer()
+        self.normalizer = FieldNormalizer()
+
+    def failure_key(self, clean_url):
+        """Negative-cache key: the host that was fetched, minus 'www.', so www/http variants share
+        one entry but a failing subdomain does not block its parent or sibling hosts."""
+        return self.processor.canonical_host(clean_url) or (urlparse(clean_url).hostname or clean_url)
+
+    def scrape_url(self, url):
+        """Clean the URL and return (clean_url, scraped_data), going through the extractor cache.
+
+        Scrape failures are recorded in the negative cache; unless retry_failed is set, a host
+        with a recorded failure raises that error again without being fetched.
+        """
+        clean_url = self.processor.clean_url(url)
+        if self.use_cache:
+            cached_data = self.cache_extractor.get(clean_url)
+        else:
+            cached_data = None
+        if not cached_data:
+            failure_key = self.failure_key(clean_url)
+            if not self.retry_failed:
+                failure = self.negative_cache.get(failure_key)
+                if failure:
+                    logging.debug("Using cached %s failure for URL %s", failure['failure_class'], clean_url)
+                    raise Exception(failure['error'])
+            try:
+                scraped_data = self.scraper.scrape_website(clean_url)
+            except Exception as e:
+                self.negative_cache.set(failure_key, str(e))
+                if self.corpus is not None:
+                    self.corpus.add(clean_url, error=str(e))
+                raise
+            self.negative_cache.clear(failure_key)
+            self.cache_extractor.set(clean_url, scraped_data)
+            if self.corpus is not None:
+                self.corpus.add(clean_url, scraped_data)
+            logging.debug("Scraped data for URL %s", clean_url)
+        else:
+            scraped_data = cached_data
+            logging.debug("Using cached data for URL %s", clean_url)
+        return clean_url, scraped_data
+
+    def contacts(self, scraped_data):
+        """Emails and phones found by the scraper; pages cached before that are scanned from their text."""
+        contacts = scraped_data.get('contacts')
+        if contacts is None:
+            contacts = self.contact_extractor.scan_text(scraped_data.get('content') or '')
+        return contacts
+
+    def skipped_result(self, url, email_id, scraped_data):
+        """A 'skipped' row if the classifier says the page is not worth analyzing, else None."""
+        if self.classifier is None:
+            return None
+        label, reason = self.classifier.classify(scraped_data)
+        if label == OK:
+            return None
+        logging.debug("Skipping Ollama for URL %s: %s (%s)", url, label, reason)
+        return extraction_error_result(url, email_id, LABEL_ERRORS[label], status="skipped")
+
+    def structured_fields(self, scraped_data):
+        """Split the configured fields into those answered by the page's structured data and those left for Ollama."""
+        fields = EXTRACTION_CONFIG['FIELDS']
+        structured_data = scraped_data.get('structured_data') or {}
+        if not EXTRACTION_CONFIG['STRUCTURED_DATA_FAST_PATH']:
+            return {}, fields
+        known = {
+            field: structured_data[field] for field in ('business_name', 'location')
+            if field in fields and structured_data.get(field)
+        }
+        return known, [field for field in fields if field not in known]
+
+    def build_extraction_result(self, url, email_id, analysis, contacts=None):
+        """Turn an Ollama analysis dict into one output row.
+
+        The Keyword / Product/Service / Target Audience columns are left for FieldNormalizer,
+        which fills them for a whole batch at once (see normalize_results).
+        """
+        result = {}
+        result["Email ID"] = email_id
+        result["Domain"] = url
+        result["Business Name"] = analysis.get('business_name', '')
+        result["Business Location"] = analysis.get('location', '')
+        result.update({col: "" for col in FIELD_COLUMNS})
+        result[RAW_FIELDS_KEY] = {field: analysis.get(field) for field, _, _, _ in LIST_FIELDS}
+
+        contacts = contacts or {}
+        result["Emails"] = ", ".join(contacts.get('emails', []))
+        result["Phones"] = ", ".join(contacts.get('phones', []))
+
+        result["Status"] = "success"
+        result["Error"] = ""
+
+        return result
+
+    def normalize_results(self, results):
+        """Fill in the list-field columns of a batch of results, column-wise."""
+        try:
+            return self.normalizer.apply(results)
+        except Exception as e:
+            logging.error("Normalizing %d results failed: %s", len(results), str(e))
+            for result in results:
+                if result is not None and result.pop(RAW_FIELDS_KEY, None) is not None:
+                    result.update(Status="error", Error=f"Could not normalize extracted fields: {str(e)}")
+            return results
+
+    @profiled_row
+    def process_url(self, url, model=None, email_id=""):
+        model = model or self.model
+        logging.debug("Processing URL: %s with model: %s", url, model)
+        try:
+            clean_url, scraped_data = self.scrape_url(url)
+            skipped = self.skipped_result(url, email_id, scraped_data)
+            if skipped:
+                return skipped
+
+            known, remaining = self.structured_fields(scraped_data)
+            if remaining:
+                analyzer = ContentAnalyzer(model=model)
+                analysis = analyzer.analyze_with_ollama(scraped_data['content'], clean_url, fields=remaining)
+            else:
+                logging.debug("Structured data covers all fields for URL %s, skipping Ollama", clean_url)
+                analysis = {}
+            analysis.update(known)
+            logging.debug("Analysis result for URL %s: %s", clean_url, analysis)
+
+            return self.build_extraction_result(url, email_id, analysis, self.contacts(scraped_data))
+
+        except Exception as e:
+            return {
+                "Email ID": email_id,
+                "Domain": url,
+                "Business Name": "",
+                "Business Location": "",
+                "Status": "error",
+                "Error": str(e)
+            }
+
+    @profiled_row
+    def process_url_batch(self, rows, model=None):
+        """Multi-site prompting mode: scrape rows concurrently, then analyze `sites_per_prompt` sites per request.
+
+        Returns one result per row, in the same order as `rows`.
+        """
+        model = model or self.model
+        sites_per_prompt = self.sites_per_prompt
+        logging.debug("Processing %d URLs in batched mode (%d sites per prompt)", len(rows), sites_per_prompt)
+        results = [None] * len(rows)
+        scraped = []
+
+        def scrape(idx):
+            row = rows[idx]
+            try:
+                clean_url, scraped_data = self.scrape_url(row["Domain"])
+                return idx, clean_url, scraped_data, None
+            except Exception as e:
+                return idx, None, None, e
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for idx, clean_url, scraped_data, error in executor.map(scrape, range(len(rows))):
+                if error is not None:
+                    results[idx] = {
+                        "Email ID": rows[idx].get("Email ID", ""),
+                        "Domain": rows[idx]["Domain"],
+                        "Business Name": "",
+                        "Business Location": "",
+                        "Status": "error",
+                        "Error": str(error)
+                    }
+                else:
+                    results[idx] = self.skipped_result(rows[idx]["Domain"], rows[idx].get("Email ID", ""), scraped_data)
+                    if results[idx] is None:
+                        scraped.append((idx, clean_url, scraped_data))
+
+            analyzer = ContentAnalyzer(model=model)
+            groups = [scraped[j:j + sites_per_prompt] for j in range(0, len(scraped), sites_per_prompt)]
+
+            def analyze(group):
+                # Duplicate URLs inside one group would collide on the url key, so key by clean_url once.
+                known = {clean_url: self.structured_fields(scraped_data) for _, clean_url, scraped_data in group}
+                sites = {
+                    clean_url: scraped_data['content'] for _, clean_url, scraped_data in group
+                    if known[clean_url][1]
+                }
+                analyses = analyzer.analyze_batch_with_ollama(
+                    [{'url': url, 'content': content} for url, content in sites.items()]
+                ) if sites else {}
+                for clean_url, (fields, _) in known.items():
+                    analyses.setdefault(clean_url, {}).update(fields)
+                return analyses
+
+            for group, analyses in zip(groups, executor.map(analyze, groups)):
+                for idx, clean_url, scraped_data in group:
+                    analysis = analyses[clean_url]
+                    logging.debug("Analysis result for URL %s: %s", clean_url, analysis)
+                    results[idx] = self.build_extraction_result(
+                        rows[idx]["Domain"], rows[idx].get("Email ID", ""), analysis, self.contacts(scraped_data)
+                    )
+        return results
+
+    async def _process_batch(self, batch_rows):
+        if self.sites_per_prompt > 1:
+            return await asyncio.to_thread(self.process_url_batch, batch_rows)
+        tasks = []
+        for row in batch_rows:
+            task = asyncio.wait_for(
+                asyncio.to_thread(self.process_url, row["Domain"], self.model, row.get("Email ID", "")),
+                timeout=self.row_timeout
+            )
+            tasks.append(task)
+        batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+        for idx, result in enumerate(batch_results):
+            if isinstance(result, asyncio.TimeoutError):
+                logging.error("Timeout processing URL: %s", batch_rows[idx].get("Domain"))
+                batch_results[idx] = extraction_error_result(
+                    batch_rows[idx].get("Domain", ""), batch_rows[idx].get("Email ID", ""),
+                    f"Timeout after {self.row_timeout} seconds"
+                )
+            elif isinstance(result, Exception):
+                logging.error("Error processing URL %s: %s", batch_rows[idx].get("Domain"), str(result))
+                batch_results[idx] = extraction_error_result(
+                    batch_rows[idx].get("Domain", ""), batch_rows[idx].get("Email ID", ""), str(result)
+                )
+        return batch_results
+
+    def split_dead_domains(self, all_rows, groups):
+        """Pre-resolve every site's host and split off the groups whose domain does not exist.
+
+        Returns (live_groups, dead_results), dead_results being [(row_index, result), ...]. The
+        lookups also warm the DNS cache that the scraper connects through.
+        """
+        hosts = {}
+        for indexes in groups:
+            domain = all_rows[indexes[0]].get("Domain", "")
+            try:
+                hosts[indexes[0]] = urlparse(self.processor.clean_url(domain)).hostname or ""
+            except Exception:
+                hosts[indexes[0]] = ""
+        outcomes = get_dns_cache().resolve_all(
+            variant for host in hosts.values() if host for variant in host_variants(host)
+        )
+        live_groups, dead_results = [], []
+        for indexes in groups:
+            host = hosts[indexes[0]]
+            if host and all(outcomes.get(variant) == NXDOMAIN for variant in host_variants(host)):
+                error = "Domain does not exist (NXDOMAIN)"
+                self.negative_cache.set(self.failure_key(host), error, 'nxdomain')
+                result = extraction_error_result(all_rows[indexes[0]].get("Domain", ""), "", error)
+                dead_results.extend(self._fan_out(all_rows, indexes, result))
+            else:
+                live_groups.append(indexes)
+        return live_groups, dead_results
+
+    def _fan_out(self, all_rows, indexes, result):
+        return [
+            (idx, dict(result, **{
+                "Email ID": all_rows[idx].get("Email ID", ""),
+                "Domain": all_rows[idx].get("Domain", "")
+            }))
+            for idx in indexes
+        ]
+
+    def iter_completed(self, all_rows):
+        """Yield (row_index, result) for every row as soon as its site is done, up to max_workers sites at a time.
+
+        Sites are deduplicated as in iter_batches; with sites_per_prompt > 1 they are analyzed in groups.
+        """
+        try:
+            groups = list(self.processor.group_duplicates([row.get("Domain", "") for row in all_rows]).values())
+            groups, dead_results = self.split_dead_domains(all_rows, groups)
+            yield from dead_results
+            chunk = max(self.sites_per_prompt, 1)
+            chunks = [groups[i:i + chunk] for i in range(0, len(groups), chunk)]
+
+            def run_chunk(chunk_groups):
+                rows = [all_rows[indexes[0]] for indexes in chunk_groups]
+                if self.sites_per_prompt > 1:
+                    return self.process_url_batch(rows)
+                return [self.process_url(row["Domain"], self.model, row.get("Email ID", "")) for row in rows]
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(run_chunk, chunk_groups): chunk_groups for chunk_groups in chunks}
+                try:
+                    for future in concurrent.futures.as_completed(futures):
+                        chunk_groups = futures[future]
+                        try:
+                            results = future.result()
+                        except Exception as e:
+                            results = [
+                                extraction_error_result(all_rows[indexes[0]].get("Domain", ""), "", str(e))
+                                for indexes in chunk_groups
+                            ]
+                        for result, indexes in zip(self.normalize_results(results), chunk_groups):
+                            yield from self._fan_out(all_rows, indexes, result)
+                finally:
+                    # Closed early (client gone, job cancelled): only the sites already running finish
+                    for future in futures:
+                        future.cancel()
+        finally:
+            # Also on early close (a cancelled job), so buffered pages are not lost
+            if self.corpus is not None:
+                self.corpus.flush()
+
+    def iter_batches(self, all_rows, batch_size):
+        """Process rows batch by batch, yielding [(row_index, result), ...] after each batch.
+
+        Each unique site (see DataProcessor.group_duplicates) is processed once and its result
+        is copied to every original row, keeping that row's Domain and Email ID.
+        """
+        try:
+            groups = list(self.processor.group_duplicates([row.get("Domain", "") for row in all_rows]).values())
+            logging.info("Total Rows: %d (%d unique domains)", len(all_rows), len(groups))
+            groups, dead_results = self.split_dead_domains(all_rows, groups)
+            if dead_results:
+                # Dead domains are reported straight away and never take a scrape or Ollama slot
+                yield dead_results
+            for i in range(0, len(groups), batch_size):
+                batch_start = time.perf_counter()
+                batch_groups = groups[i:i + batch_size]
+                batch_rows = [all_rows[indexes[0]] for indexes in batch_groups]
+                batch_results = self.normalize_results(asyncio.run(self._process_batch(batch_rows)))
+                fanned_out = []
+                for result, indexes in zip(batch_results, batch_groups):
+                    fanned_out.extend(self._fan_out(all_rows, indexes, result))
+                logging.info("Batch %d processed in %.2f seconds", i // batch_size + 1, time.perf_counter() - batch_start)
+                yield fanned_out
+        finally:
+            # Also on early close (a cancelled job), so buffered pages are not lost
+            if self.corpus is not None:
+                self.corpus.flush()
+
+
+class CompetitorPipeline:
+    """SERP-based competitor analysis for the Competitive Insights tab, independent of the UI."""
+
+    def __init__(self, search_method, api_key=None, gmb_check=False, no_of_pages=1, use_cache=True):
+        self.search_method = search_method
+        self.api_key = api_key
+        self.gmb_check = gmb_check
+        self.no_of_pages = no_of_pages
+        self.use_cache = use_cache
+        # Initialize AdvancedAnalytics with competitor caching folder.
+        self.analytics = AdvancedAnalytics()
+        self.postprocessor = SerpPostProcessor()
+
+    @profiled_row
+    def search_row(self, row, search_method=None, api_key=None, gmb_check=None, no_of_pages=None, use_cache=None):
+        """The I/O part of a row: its search and GMB check.
+
+        Returns (result, search results). The result is final when the row failed (search
+        results None); otherwise postprocess() still fills in its competitor columns.
+        """
+        search_method = search_method or self.search_method
+        api_key = api_key or self.api_key
+        gmb_check = self.gmb_check if gmb_check is None else gmb_check
+        no_of_pages = no_of_pages or self.no_of_pages
+        use_cache = self.use_cache if use_cache is None else use_cache
+        logging.debug("Processing row: %s", row)
+        try:
+            domain = str(row.get("Domain", "")).strip()
+            keyword = str(row.get("Keyword 1", "")).strip()
+            product = str(row.get("Product/Service 1", "")).strip()
+            if not domain:
+                return {
+                    "Domain": domain,
+                    "Keyword 1": keyword,
+                    "Product/Service 1": product,
+                    "Search Query": "",
+                    "Top Competitor 1": "",
+                    "Serp Rank 1": "",
+                    "Top Competitor 2": "",
+                    "Serp Rank 2": "",
+                    "Top Competitor 3": "",
+                    "Serp Rank 3": "",
+                    "Domain Rank": "not ranked",
+                    "GMB Status": "",
+                    "Status": "error",
+                    "Error": "Missing Domain"
+                }, None
+            search_query = keyword if keyword else product
+            if not search_query:
+                return {
+                    "Domain": domain,
+                    "Keyword 1": keyword,
+                    "Product/Service 1": product,
+                    "Search Query": "",
+                    "Top Competitor 1": "",
+                    "Serp Rank 1": "",
+                    "Top Competitor 2": "",
+                    "Serp Rank 2": "",
+                    "Top Competitor 3": "",
+                    "Serp Rank 3": "",
+                    "Domain Rank": "not ranked",
+                    "GMB Status": "",
+                    "Status": "error",
+                    "Error": "No valid search query"
+                }, None
+            if search_method == "Serper.dev API" and api_key:
+                raw_search_result = self.analytics.search_serper(search_query, api_key, use_cache=use_cache, pages=no_of_pages)
+            else:
+                raw_search_result = self.analytics.fetch_google_results(search_query, domain, pages=no_of_pages)
+            if not raw_search_result or (isinstance(raw_search_result, dict) and "error" in raw_search_result):
+                result = {
+                    "Domain": domain,
+                    "Keyword 1": keyword,
+                    "Product/Service 1": product,
+                    "Search Query": search_query,
+                    "Top Competitor 1": "",
+                    "Serp Rank 1": "",
+                    "Top Competitor 2": "",
+                    "Serp Rank 2": "",
+                    "Top Competitor 3": "",
+                    "Serp Rank 3": "",
+                    "Domain Rank": "not ranked",
+                    "GMB Status": "",
+                    "Status": "error",
+                    "Error": raw_search_result.get("error", "No search results") if raw_search_result else "No search results"
+                }
+                return result, None
+
+            result = {
+                "Domain": domain,
+                "Keyword 1": keyword,
+                "Product/Service 1": product,
+                "Search Query": search_query,
+                "GMB Status": ""
+            }
+            if gmb_check:
+                gmb_result = self.analytics.check_gmb_listing(domain, raw_search_result, search_method, api_key, use_cache)
+                result["GMB Status"] = "Found" if gmb_result.get("exists") else "Not Found"
+            else:
+                result["GMB Status"] = "Not Checked"
+            result["Status"] = "success"
+            result["Error"] = ""
+            return result, raw_search_result
+        except Exception as e:
+            return {
+                "Domain": domain,
+                "Keyword 1": keyword,
+                "Product/Service 1": product,
+                "Search Query": "",
+                "Top Competitor 1": "",
+                "Serp Rank 1": "",
+                "Top Competitor 2": "",
+                "Serp Rank 2": "",
+                "Top Competitor 3": "",
+                "Serp Rank 3": "",
+                "Domain Rank": "not ranked",
+                "GMB Status": "",
+                "Status": "error",
+                "Error": str(e)
+            }, None
+
+    def postprocess(self, searched):
+        """Final results for [(result, search results)] from search_row, with the competitor
+        columns of all rows computed together."""
+        columns = self.postprocessor.process([
+            (i, result["Domain"], search_results)
+            for i, (result, search_results) in enumerate(searched) if search_results is not None
+        ])
+        return [
+            dict(result, **columns[i]) if search_results is not None else result
+            for i, (result, search_results) in enumerate(searched)
+        ]
+
+    def process_row(self, row, **kwargs):
+        return self.postprocess([self.search_row(row, **kwargs)])[0]
+
+    def iter_completed(self, rows, max_workers=8):
+        """Yield (row_index, result) for every row as soon as it is done, up to max_workers rows at a time.
+
+        Searches run on the worker threads; whatever has finished by the time the caller asks
+        for more is post-processed together.
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {executor.submit(self.search_row, row): idx for idx, row in enumerate(rows)}
+            try:
+                while pending:
+                    done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    done = list(done)
+                    indexes = [pending.pop(future) for future in done]
+                    yield from zip(indexes, self.postprocess([future.result() for future in done]))
+            finally:
+                # Closed early: drop the rows that have not started
+                for future in pending:
+                    future.cancel()
+
+    def prefetch(self, rows):
+        """Send the Serper searches of `rows` in batched requests before the rows are processed one by one."""
+        if self.search_method != "Serper.dev API" or not self.api_key:
+            return
+        # Searches prefetched for the previous rows have been used by now
+        self.analytics.prefetched.clear()
+        rows = [row for row in rows if str(row.get("Domain", "")).strip()]
+        queries = [str(row.get("Keyword 1", "")).strip() or str(row.get("Product/Service 1", "")).strip() for row in rows]
+        found = self.analytics.prefetch_serper(queries, self.api_key, use_cache=self.use_cache, pages=self.no_of_pages)
+        if self.gmb_check:
+            self.analytics.prefetch_gmb_lookups(
+                [(str(row.get("Domain", "")).strip(), found.get(query)) for row, query in zip(rows, queries)],
+                self.api_key,
+                use_cache=self.use_cache
+            )
+
+    def iter_batches(self, rows, batch_size):
+        """Process rows batch by batch, yielding [(row_index, result), ...] after each batch."""
+        # Prefetch whole batches at a time, about one Serper request's worth of rows
+        prefetch_rows = max(1, SERPER_CONFIG['BATCH_SIZE'] // batch_size) * batch_size
+        for i in range(0, len(rows), batch_size):
+            if i % prefetch_rows == 0:
+                self.prefetch(rows[i:i + prefetch_rows])
+            batch_start = time.perf_counter()
+            indexes = range(i, min(i + batch_size, len(rows)))
+            searched = []
+            for idx in indexes:
+                rec_start = time.perf_counter()
+                searched.append(self.search_row(rows[idx]))
+                logging.debug("Searched record for URL %s in advanced analysis in %.2f seconds",
+                              rows[idx].get("Domain", "N/A"), time.perf_counter() - rec_start)
+            batch_results = list(zip(indexes, self.postprocess(searched)))
+            logging.debug("Batch %d processed in %.2f seconds", i // batch_size + 1, time.perf_counter() - batch_start)
+            yield batch_results
@@ -0,0 +1,273 @@
+# src/core/reanalyze.py
+"""Re-run Ollama analysis over stored pages without scraping again.
+
+    python -m src.core.reanalyze output/scraping/scraped_data_20241224_154243.json output/cache_extractor \\
+        --output output/analysis/reanalysis.jsonl --model qwen2.5:14b --prompt-version v1 --concurrency 16
+
+Sources are scraped_data_*.json files (read incrementally, never loaded whole), columnar
+corpus directories (output/corpus) and scraper cache directories (PageCache or the older
+one-file-per-URL layout). Results are appended to
+a JSONL file as they finish; URLs already done there with the same model and prompt version are
+skipped, so a stopped run resumes. Failed URLs are retried and get a newer record further down.
+"""
+import os
+import json
+import time
+import argparse
+import logging
+import concurrent.futures
+from datetime import datetime
+from typing import Dict, Iterator, Tuple
+from config.settings import OLLAMA_CONFIG
+from config.prompts import DEFAULT_PROMPT_VERSION
+from src.core.content_analyzer import ContentAnalyzer, load_prompt
+from src.utils.cache import PageCache
+from src.core.corpus_store import CorpusReader
+from src.utils.profiler import profiling, profiled_row, OFF, JOB, ROWS
+
+JSON_WHITESPACE = ' \t\n\r'
+JSON_DELIMITERS = JSON_WHITESPACE + ',:]}'
+
+
+def iter_json_object(path: str, chunk_size: int = 1 << 20) -> Iterator[Tuple[str, object]]:
+    """Yield the (key, value) pairs of a top-level JSON object, reading the file in chunks."""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        position = 0
+        eof = False
+
+        def fill():
+            nonlocal buffer, position, eof
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+
+        def skip(expected=None):
+            """Skip whitespace and return the next character, consuming it if it is `expected`."""
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in JSON_WHITESPACE:
+                    position += 1
+                if position < len(buffer) or eof:
+                    break
+                fill()
+            char = buffer[position] if position < len(buffer) else ''
+            if expected and char in expected:
+                position += 1
+            return char
+
+        def value():
+            nonlocal position
+            skip()
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buffer, position)
+                    # A value cut at the end of the buffer (3. of 3.14) may continue in the next chunk
+                    if eof or (end < len(buffer) and buffer[end] in JSON_DELIMITERS):
+                        position = end
+                        return item
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                fill()
+
+        if skip('{') != '{':
+            raise ValueError(f"{path} does not hold a JSON object")
+        if skip('}') == '}':
+            return
+        while True:
+            key = value()
+            if skip(':') != ':':
+                raise ValueError(f"Malformed JSON object in {path}")
+            yield key, value()
+            separator = skip(',}')
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f"Malformed JSON object in {path}")
+
+
+def iter_scraped_file(path: str) -> Iterator[Tuple[str, Dict]]:
+    """(url, page) pairs from a scraped_data_*.json file; page is None when the scrape had failed."""
+    for url, entry in iter_json_object(path):
+        if isinstance(entry, dict) and entry.get('status') == 'success' and entry.get('data'):
+            yield url, entry['data']
+        else:
+            yield url, None
+
+
+def iter_cache_dir(path: str) -> Iterator[Tuple[str, Dict]]:
+    """(url, page) pairs from a scraper cache directory, one entry file at a time.
+
+    Unreadable entries (corrupt JSON, missing keys or blobs) are logged and skipped.
+    """
+    cache = PageCache(cache_dir=path)
+    with os.scandir(cache.url_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.json'):
+                continue
+            try:
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    record = json.load(f)
+                page = dict(record['page'], content=cache.read_blob(record['content_sha256']))
+                url = record['url']
+            except (OSError, ValueError, KeyError, TypeError, RuntimeError) as e:
+                logging.warning("Skipping unreadable cache entry %s: %s", entry.path, str(e))
+                continue
+            yield url, page
+    # Entries in the older layout (one JSON file per URL, no URL stored) keep their hash as the key
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.json') or not entry.is_file():
+                continue
+            try:
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    record = json.load(f)
+                page = record.get('analysis') or {}
+                url = (page.get('metadata') or {}).get('fetched_url') or entry.name[:-5]
+            except (OSError, ValueError, AttributeError) as e:
+                logging.warning("Skipping unreadable cache entry %s: %s", entry.path, str(e))
+                continue
+            yield url, page
+
+
+def iter_corpus(path: str) -> Iterator[Tuple[str, Dict]]:
+    """(url, page) pairs from a columnar corpus (src/core/corpus_store.py), reading only the needed columns."""
+    columns = ['url', 'status', 'title', 'description', 'content']
+    for row in CorpusReader(path).iter_pages(columns):
+        if row['status'] != 'success':
+            yield row['url'], None
+        else:
+            yield row['url'], {'title': row['title'], 'meta_description': row['description'], 'content': row['content']}
+
+
+def iter_sources(paths) -> Iterator[Tuple[str, Dict]]:
+    for path in paths:
+        if CorpusReader.is_corpus(path):
+            yield from iter_corpus(path)
+        elif os.path.isdir(path):
+            yield from iter_cache_dir(path)
+        else:
+            yield from iter_scraped_file(path)
+
+
+def page_text(page: Dict) -> str:
+    """Prompt input for a stored page, in the shape process_scraped_data used."""
+    metadata = page.get('metadata') or page
+    return (f"Title: {metadata.get('title', '')}\n"
+            f"Description: {metadata.get('meta_description', '')}\n"
+            f"Content: {page.get('content', '')}")
+
+
+class CorpusReanalyzer:
+    """Streams stored pages through Ollama with at most `concurrency` requests in flight."""
+
+    def __init__(self, model: str = None, prompt_version: str = None, concurrency: int = 8):
+        self.model = model or OLLAMA_CONFIG['MODEL']
+        self.prompt_version = prompt_version or DEFAULT_PROMPT_VERSION
+        # Fail on a bad version before any work starts
+        load_prompt(self.prompt_version)
+        self.concurrency = concurrency
+        self.analyzer = ContentAnalyzer(model=self.model)
+
+    @profiled_row
+    def analyze(self, url: str, page: Dict) -> Dict:
+        record = {
+            'url': url,
+            'model': self.model,
+            'prompt_version': self.prompt_version,
+            'timestamp': datetime.now().isoformat()
+        }
+        if not page or not page.get('content'):
+            record.update(status='skipped', error='No valid content to analyze')
+            return record
+        analysis = self.analyzer.analyze_with_ollama(page_text(page), url, prompt_version=self.prompt_version)
+        if analysis.get('error'):
+            record.update(status='error', error=analysis['error'], analysis=analysis)
+        else:
+            record.update(status='success', analysis=analysis)
+        return record
+
+    def done_urls(self, output_file: str):
+        """URLs already in `output_file` for this model and prompt version. Error records are left
+        out so failed pages are retried; records of other models or prompt versions do not count."""
+        done = set()
+        if os.path.exists(output_file):
+            with open(output_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        key = (record['url'], record.get('model'), record.get('prompt_version'))
+                    except (ValueError, KeyError, TypeError, AttributeError):
+                        continue
+                    if key[1:] == (self.model, self.prompt_version) and record.get('status') != 'error':
+                        done.add(key[0])
+        return done
+
+    @staticmethod
+    def _ends_with_newline(path: str) -> bool:
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def run(self, sources, output_file: str, limit: int = None) -> Dict:
+        """Analyze every page in `sources`, appending one JSON line per URL to `output_file`."""
+        os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+        skip = self.done_urls(output_file)
+        counts = {'success': 0, 'error': 0, 'skipped': 0, 'resumed': len(skip)}
+        start = time.perf_counter()
+        submitted = 0
+        with open(output_file, 'a', encoding='utf-8') as out, \
+                concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            if out.tell() and not self._ends_with_newline(output_file):
+                # A killed run left half a line; start ours on a fresh one
+                out.write('\n')
+            pending = set()
+
+            def drain(return_when):
+                nonlocal pending
+                done, pending = concurrent.futures.wait(pending, return_when=return_when)
+                for future in done:
+                    record = future.result()
+                    counts[record['status']] += 1
+                    out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                out.flush()
+
+            for url, page in iter_sources(sources):
+                if url in skip:
+                    continue
+                if limit is not None and submitted >= limit:
+                    break
+                skip.add(url)
+                pending.add(executor.submit(self.analyze, url, page))
+                submitted += 1
+                # Only `concurrency` pages (and their text) are held in memory at a time
+                if len(pending) >= self.concurrency:
+                    drain(concurrent.futures.FIRST_COMPLETED)
+                if submitted % 500 == 0:
+                    logging.info("Re-analysis: %d submitted, %s, %.1f pages/s", submitted, counts,
+                                 submitted / (time.perf_counter() - start))
+            drain(concurrent.futures.ALL_COMPLETED)
+        logging.info("Re-analysis finished in %.1f seconds: %s", time.perf_counter() - start, counts)
+        return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-analyze stored pages with another model or prompt")
+    parser.add_argument("sources", nargs="+", help="scraped_data_*.json files, corpus directories and/or scraper cache directories")
+    parser.add_argument("--output", default=f"output/analysis/reanalysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+    parser.add_argument("--model", default=OLLAMA_CONFIG['MODEL'])
+    parser.add_argument("--prompt-version", default=DEFAULT_PROMPT_VERSION,
+                        help="key of config.prompts.PROMPT_VERSIONS or path to a prompt template file")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many pages")
+    parser.add_argument("--profile", choices=[OFF, JOB, ROWS], default=OFF,
+                        help="sample the run (job) or a share of pages (rows) into output/profiles/")
+    parser.add_argument("--profile-sample", type=float, default=None, help="share of pages profiled with --profile rows")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.INFO)
+    run_name = f"reanalyze_{os.path.splitext(os.path.basename(args.output))[0]}"
+    with profiling(args.profile, run_name, args.profile_sample):
+        CorpusReanalyzer(args.model, args.prompt_version, args.concurrency).run(args.sources, args.output, args.limit)
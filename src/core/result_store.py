@@ -0,0 +1,76 @@
+# src/core/result_store.py
+from array import array
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+
+# Low-cardinality output columns, kept as category codes instead of one string per row
+CATEGORICAL_COLUMNS = ('Status', 'Business Location', 'Error', 'GMB Status', 'Domain Rank')
+
+
+class ResultStore:
+    """Columnar, fill-in-place store for a job's row results.
+
+    Rows are written by input index as they finish. Plain columns are preallocated lists;
+    categorical columns are stored as int32 codes plus one list of categories, so repeated
+    values ("success", "United States", the same error text) are held once. Display and
+    export frames are built from the columns directly, without an intermediate list of dicts.
+    """
+
+    def __init__(self, columns: List[str], length: int, categorical=CATEGORICAL_COLUMNS):
+        self.columns = list(columns)
+        self.length = length
+        self.categorical = {col for col in self.columns if col in categorical}
+        self.values = {col: [""] * length for col in self.columns if col not in self.categorical}
+        self.codes = {col: array('i', [-1]) * length for col in self.categorical}
+        self.categories = {col: [] for col in self.categorical}
+        self.category_index = {col: {} for col in self.categorical}
+        self.filled = bytearray(length)
+        self.count = 0
+        # Byte offset into the job's results file that has already been loaded (see JobManager.sync_results)
+        self.source_offset = 0
+
+    def _code(self, col: str, value) -> int:
+        value = "" if value is None else str(value)
+        index = self.category_index[col]
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(self.categories[col])
+            self.categories[col].append(value)
+        return code
+
+    def set(self, idx: int, result: Dict):
+        for col in self.columns:
+            value = result.get(col, "")
+            if col in self.categorical:
+                self.codes[col][idx] = self._code(col, value)
+            else:
+                self.values[col][idx] = value
+        if not self.filled[idx]:
+            self.filled[idx] = 1
+            self.count += 1
+
+    def _column(self, col: str, rows=None):
+        if col in self.categorical:
+            codes = np.frombuffer(self.codes[col], dtype=np.int32)
+            if rows is not None:
+                codes = codes[rows]
+            return pd.Categorical.from_codes(codes, categories=pd.Index(self.categories[col], dtype=object))
+        values = self.values[col]
+        return values if rows is None else [values[i] for i in rows]
+
+    def to_frame(self, base: pd.DataFrame = None, columns: List[str] = None, filled_only: bool = False) -> pd.DataFrame:
+        """Build a DataFrame of `columns` (default: all).
+
+        With `base`, the columns are set on a shallow copy of it (the input sheet), so input
+        data is not duplicated. `filled_only` keeps only rows that have finished.
+        """
+        columns = columns or self.columns
+        rows = np.flatnonzero(np.frombuffer(self.filled, dtype=np.uint8)) if filled_only else None
+        data = {col: self._column(col, rows) for col in columns}
+        if base is None:
+            return pd.DataFrame(data, index=rows)
+        frame = base.copy(deep=False)
+        for col, values in data.items():
+            frame[col] = values
+        return frame
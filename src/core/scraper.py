@@ -1,59 +1,253 @@
 import requests
-from bs4 import BeautifulSoup
 import re
-from config.config import HEADERS, REQUEST_TIMEOUT
+import os
+import codecs
+import json
+import threading
+import logging
+import concurrent.futures
+from typing import Tuple
+from config.config import (HEADERS, REQUEST_TIMEOUT, HEDGE_DELAY, VARIANT_MEMORY_FILE,
+                           SCRAPE_MAX_BYTES, SCRAPE_TEXT_TARGET)
+from src.core.html_parser import run_parser, parse_page
+from src.utils.dns_cache import CachedDnsAdapter, get_dns_cache
 from urllib.parse import urlparse
 import urllib3
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# At most this many variants of a URL are fetched per page: remembered, primary, www-toggled, http
+MAX_URL_VARIANTS = 4
+
+# Shared connection pools that connect to addresses from the DNS cache (see ExtractionPipeline.split_dead_domains)
+_session = requests.Session()
+_session.mount('http://', CachedDnsAdapter(pool_connections=64, pool_maxsize=64))
+_session.mount('https://', CachedDnsAdapter(pool_connections=64, pool_maxsize=64))
+
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+CHARSET_IN_HEADER = re.compile(r'charset=["\']?([\w.:-]+)', re.I)
+CHARSET_IN_META = re.compile(rb'<meta[^>]+charset=["\']?([\w.:-]+)', re.I)
+NON_TEXT_MARKUP = re.compile(r'<(script|style|noscript)\b.*?(</\1>|$)|<[^>]*>?', re.I | re.S)
+
+
+class FetchCancelled(Exception):
+    pass
+
+
+def sniff_encoding(content_type: str, first_chunk: bytes) -> str:
+    """Charset from the Content-Type header, else a BOM or <meta> in the first chunk, else UTF-8."""
+    candidates = []
+    match = CHARSET_IN_HEADER.search(content_type or '')
+    if match:
+        candidates.append(match.group(1))
+    for bom, name in ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16')):
+        if first_chunk.startswith(bom):
+            candidates.append(name)
+    match = CHARSET_IN_META.search(first_chunk[:4096])
+    if match:
+        candidates.append(match.group(1).decode('ascii', 'ignore'))
+    for name in candidates:
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            continue
+    return 'utf-8'
+
+
+def visible_text_length(html: str) -> Tuple[int, str]:
+    """Rough count of text characters, without tags, scripts and styles, in `html` up to a tag
+    or script left open at its end; returns the count and that open tail, to be prepended to
+    the next chunk so a running count never rescans what came before."""
+    tail = ''
+    last = None
+    for last in NON_TEXT_MARKUP.finditer(html):
+        pass
+    if last is not None and last.end() == len(html):
+        unclosed = last.group(2) == '' if last.group(1) else not last.group(0).endswith('>')
+        if unclosed:
+            html, tail = html[:last.start()], html[last.start():]
+    return len(re.sub(r'\s+', ' ', NON_TEXT_MARKUP.sub(' ', html)).strip()), tail
+
+
+class VariantMemory:
+    """Remembers which URL variant (scheme + www) answered for each host, across runs."""
+
+    def __init__(self, path=VARIANT_MEMORY_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.variants = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    self.variants = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.warning("Could not read URL variant memory %s: %s", path, str(e))
+
+    @staticmethod
+    def host_key(host: str) -> str:
+        host = host.lower()
+        return host[4:] if host.startswith('www.') else host
+
+    def get(self, host: str):
+        return self.variants.get(self.host_key(host))
+
+    def remember(self, url: str):
+        parsed = urlparse(url)
+        key = self.host_key(parsed.netloc)
+        variant = f"{parsed.scheme}://{'www.' if parsed.netloc.lower().startswith('www.') else ''}"
+        with self.lock:
+            if self.variants.get(key) == variant:
+                return
+            self.variants[key] = variant
+            # Every job process and row thread may save at once: each writes its own tmp file,
+            # and a failed save only costs the hint, never the fetch that produced it
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                with open(tmp_path, 'w') as f:
+                    json.dump(self.variants, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logging.warning("Could not save URL variant memory %s: %s", self.path, str(e))
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+
 class WebScraper:
-    def __init__(self):
+    def __init__(self, concurrency=16):
+        """`concurrency` is how many pages the caller scrapes at once (its row worker count)."""
         self.headers = HEADERS
+        self.variant_memory = VariantMemory()
+        # Hedged attempts that lose keep running until their connect/read finishes; a pool with
+        # room for every variant of every page in flight lets scrape_website return as soon as
+        # one variant wins, without hedges queueing behind other rows' attempts.
+        self.hedge_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, concurrency) * MAX_URL_VARIANTS, thread_name_prefix="hedge"
+        )
 
-    def scrape_website(self, url):
-        """Scrape website content"""
+    def url_variants(self, url):
+        """Primary URL first, then the www-toggled and plain-http variants of the same page."""
+        parsed = urlparse(url)
+        host = parsed.netloc
+        bare = host[4:] if host.lower().startswith('www.') else host
+        rest = url[len(f"{parsed.scheme}://{host}"):]
+        variants = [f"{parsed.scheme}://{host}{rest}"]
+        if not re.match(r'^[\d.:]+$', bare):  # IP addresses have no www variant
+            variants.append(f"https://{bare if bare != host else 'www.' + bare}{rest}")
+        variants.append(f"http://{host}{rest}")
+        remembered = self.variant_memory.get(host)
+        if remembered:
+            variants.insert(0, f"{remembered}{bare}{rest}")
+        # Drop duplicates while keeping order
+        return list(dict.fromkeys(variants))
+
+    def _fetch(self, url, cancel):
+        """Stream one variant and return its decoded HTML.
+
+        Non-HTML content types are rejected from the headers. The charset is picked once, from
+        the header or the first chunk, and the body is decoded incrementally. Reading stops at
+        SCRAPE_MAX_BYTES, when another variant has won, or (if SCRAPE_TEXT_TARGET is set) once
+        that many characters of text are in hand.
+        """
+        if cancel.is_set():
+            raise FetchCancelled(url)
+        response = _session.get(
+            url,
+            headers=self.headers,
+            timeout=REQUEST_TIMEOUT,
+            verify=False,
+            stream=True
+        )
         try:
-            response = requests.get(
-                url, 
-                headers=self.headers, 
-                timeout=REQUEST_TIMEOUT,
-                verify=False
-            )
             # Check for HTTP errors
             if response.status_code != 200:
                 raise Exception(f"HTTP error {response.status_code} for {url}")
-            
-            # # Check if response contains known Cloudflare error patterns
-            # if "Error code 520" in response.text or "Cloudflare" in response.text:
-            #     raise Exception(f"Cloudflare error encountered for {url}")
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract text content
-            text_content = ' '.join([
-                p.text for p in soup.find_all(['p', 'h1', 'h2', 'h3', 'div'])
-            ])
-            text_content = re.sub(r'\s+', ' ', text_content).strip()
-            
+            content_type = response.headers.get('Content-Type', '')
+            if content_type and content_type.split(';')[0].strip().lower() not in HTML_CONTENT_TYPES:
+                raise Exception(f"Unsupported content type {content_type} for {url}")
+
+            decoder = None
+            parts = []
+            received = 0
+            text_length, open_tail = 0, ''
+            for chunk in response.iter_content(chunk_size=65536):
+                if cancel.is_set():
+                    raise FetchCancelled(url)
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder(sniff_encoding(content_type, chunk))(errors='replace')
+                chunk = chunk[:SCRAPE_MAX_BYTES - received]
+                received += len(chunk)
+                parts.append(decoder.decode(chunk))
+                if received >= SCRAPE_MAX_BYTES:
+                    logging.debug("Stopped reading %s at the %d byte cap", url, SCRAPE_MAX_BYTES)
+                    break
+                if SCRAPE_TEXT_TARGET:
+                    # Running count: only the new chunk (and any tag left open before it) is scanned
+                    chunk_length, open_tail = visible_text_length(open_tail + parts[-1])
+                    text_length += chunk_length
+                    if text_length >= SCRAPE_TEXT_TARGET:
+                        logging.debug("Stopped reading %s after %d bytes, enough text", url, received)
+                        break
+            if decoder is not None:
+                parts.append(decoder.decode(b'', final=True))
+            return url, ''.join(parts)
+        finally:
+            response.close()
+
+    def fetch_hedged(self, url):
+        """Start with the primary variant and add the next one every HEDGE_DELAY seconds
+        (or right away when one fails). The first good response wins; the rest are cancelled.
+        """
+        variants = self.url_variants(url)
+        cancel = threading.Event()
+        pending = set()
+        errors = []
+        next_variant = 0
+        try:
+            while True:
+                if next_variant < len(variants):
+                    pending.add(self.hedge_executor.submit(self._fetch, variants[next_variant], cancel))
+                    next_variant += 1
+                if not pending:
+                    break
+                done, pending = concurrent.futures.wait(
+                    pending,
+                    timeout=HEDGE_DELAY if next_variant < len(variants) else None,
+                    return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    try:
+                        fetched_url, html = future.result()
+                    except Exception as e:
+                        errors.append(str(e))
+                        continue
+                    if fetched_url != variants[0]:
+                        self.variant_memory.remember(fetched_url)
+                    logging.debug("Hedged fetch for %s won by %s", url, fetched_url)
+                    return fetched_url, html
+        finally:
+            cancel.set()
+        raise Exception("; ".join(errors) or f"No response for {url}")
+
+    def scrape_website(self, url):
+        """Scrape website content"""
+        try:
+            if get_dns_cache().is_dead(urlparse(url).hostname or ''):
+                raise Exception("Domain does not exist (NXDOMAIN)")
+            fetched_url, html = self.fetch_hedged(url)
+
+            # Parsing is CPU-bound; it runs in the parse process pool, off this thread's GIL
+            page = run_parser(parse_page, html, fetched_url)
+
             # If no content is found, raise an exception.
-            if not text_content:
+            if not page['content']:
                 raise Exception(f"No readable content found for {url}")
-            
-            # Extract metadata
-            metadata = {
-                'title': soup.title.text if soup.title else '',
-                'meta_description': (
-                    soup.find('meta', {'name': 'description'})['content']
-                    if soup.find('meta', {'name': 'description'}) else ''
-                )
-            }
-            
-            return {
-                'content': text_content,
-                'metadata': metadata
-            }
-            
+            page['metadata']['fetched_url'] = fetched_url
+            return page
+
         except Exception as e:
             raise Exception(f"Error scraping {url}: {str(e)}")
         
@@ -0,0 +1,126 @@
+# src/core/serp_postprocess.py
+"""Competitor picks, SERP ranks and Domain Rank for many rows at once.
+
+All rows' search results go into one frame. Hosts are reduced to registrable domains once
+per distinct host, and the per-row answers come from masks and group-bys over that frame
+instead of a Python loop per row.
+"""
+import os
+import logging
+from typing import Dict, List, Tuple
+import pandas as pd
+from src.core.data_processer import DataProcessor
+try:
+    import streamlit as st
+except ImportError:
+    st = None
+
+MAX_COMPETITORS = 3
+EXCLUDED_DOMAINS_FILE = "assets/domain_list.txt"
+# Platforms that are never a competitor; matched against the registrable domain or its first label
+KNOWN_DOMAINS = {
+    "twitter", "paypal", "cloudflare", "google", "facebook", "pinterest",
+    "apple", "youtube", "shopify", "amazon", "tiktok", "squarespace",
+    "gmail", "blogspot.com", "adobe", "tumblr", "medium", "soundcloud",
+    "gravatar", "nytimes", "jquery", "microsoft", "stripe", "reuters",
+    "ebay", "wordpress"
+}
+TLD_EXCLUSIONS = (".gov", ".org", ".edu", ".chat", ".blog", ".kpmg")
+URL_PARTS = r'^(?P<scheme>[A-Za-z][A-Za-z0-9+.-]*)://(?P<netloc>[^/?#]*)'
+NOT_RANKED = "not ranked"
+
+
+def load_excluded_domains(file_path: str = EXCLUDED_DOMAINS_FILE) -> set:
+    """Lower-cased domains from the exclusion list; a missing or unreadable file is reported once in the UI."""
+    if not os.path.exists(file_path):
+        message = f"Excluded domain file missing: {os.path.abspath(file_path)}"
+    else:
+        try:
+            with open(file_path, 'r') as file:
+                return {line.strip().lower() for line in file if line.strip()}
+        except Exception as e:
+            message = f"Error reading excluded domains from {os.path.abspath(file_path)}: {str(e)}"
+    logging.error(message)
+    if st is not None and not getattr(load_excluded_domains, '_warning_shown', False):
+        st.warning(message)
+        load_excluded_domains._warning_shown = True
+    return set()
+
+
+class SerpPostProcessor:
+    """Turns raw SERP results of many rows into their competitor columns in one pass."""
+
+    def __init__(self, excluded_domains: set = None):
+        self.data_processor = DataProcessor()
+        self.excluded_domains = load_excluded_domains() if excluded_domains is None else excluded_domains
+        self.registrable = {}  # host -> registrable domain, kept across batches
+
+    def registrable_domains(self, hosts: pd.Series) -> pd.Series:
+        """Registrable domain of every host, computing each distinct host only once."""
+        for host in pd.unique(hosts):
+            if host not in self.registrable:
+                self.registrable[host] = self.data_processor.canonical_domain(host) if host else ''
+        return hosts.map(self.registrable)
+
+    def frame(self, searches: List[Tuple[object, str, list]]) -> pd.DataFrame:
+        """One row per SERP entry, in ranking order within each row: row key, link and position."""
+        keys, links, positions = [], [], []
+        for key, _, results in searches:
+            for item in results:
+                if isinstance(item, dict):
+                    link, position = item.get("link") or "", item.get("position")
+                elif isinstance(item, str):
+                    link, position = item, None
+                else:
+                    continue
+                keys.append(key)
+                links.append(link)
+                positions.append(NOT_RANKED if position is None else position)
+        return pd.DataFrame({
+            "row": pd.Series(keys, dtype=object),
+            "link": pd.Series(links, dtype=object),
+            "position": pd.Series(positions, dtype=object)
+        })
+
+    def process(self, searches: List[Tuple[object, str, list]]) -> Dict[object, Dict]:
+        """{row key: competitor columns} for [(row key, origin domain, SERP results)]."""
+        columns = {}
+        for key, _, _ in searches:
+            columns[key] = {"Domain Rank": NOT_RANKED}
+            for i in range(1, MAX_COMPETITORS + 1):
+                columns[key][f"Top Competitor {i}"] = ""
+                columns[key][f"Serp Rank {i}"] = NOT_RANKED
+        df = self.frame(searches)
+        if df.empty:
+            return columns
+
+        parts = df["link"].str.extract(URL_PARTS).fillna("")
+        host = parts["netloc"].str.lower().str.rsplit("@", n=1).str[-1].str.split(":", n=1).str[0]
+        df["base_url"] = parts["scheme"] + "://" + parts["netloc"]
+        df["domain"] = self.registrable_domains(host)
+        origins = {key: self.data_processor.canonical_domain(origin) for key, origin, _ in searches}
+        df["origin"] = df["row"].map(origins)
+
+        # Domain Rank: the first entry on the origin's own registrable domain
+        is_origin = df["domain"].ne("") & df["domain"].eq(df["origin"])
+        for key, position in df[is_origin].drop_duplicates("row")[["row", "position"]].itertuples(index=False):
+            columns[key]["Domain Rank"] = position
+
+        first_label = df["domain"].str.split(".", n=1).str[0]
+        excluded = (
+            df["domain"].eq("")
+            | is_origin
+            | df["domain"].str.endswith(TLD_EXCLUSIONS)
+            | df["domain"].isin(KNOWN_DOMAINS)
+            | first_label.isin(KNOWN_DOMAINS)
+            | df["domain"].isin(self.excluded_domains)
+            | host.isin(self.excluded_domains)
+            | host.str.removeprefix("www.").isin(self.excluded_domains)
+        )
+        picks = df[~excluded].drop_duplicates(["row", "base_url"])
+        picks = picks[picks.groupby("row", sort=False).cumcount() < MAX_COMPETITORS]
+        slots = picks.groupby("row", sort=False).cumcount() + 1
+        for key, slot, base_url, position in zip(picks["row"], slots, picks["base_url"], picks["position"]):
+            columns[key][f"Top Competitor {slot}"] = base_url
+            columns[key][f"Serp Rank {slot}"] = position
+        return columns
@@ -0,0 +1,174 @@
+# src/core/serper_client.py
+"""Serper.dev client: one pooled session per API key, many queries per HTTP request.
+
+Serper's /search endpoint takes a JSON array of searches and answers with an array of
+results in the same order. Callers on any thread submit single searches; a dispatcher
+thread gathers whatever arrives within BATCH_WAIT seconds (up to BATCH_SIZE searches)
+into one request, so parallel row workers share requests without coordinating.
+"""
+import json
+import time
+import logging
+import threading
+import concurrent.futures
+from typing import Dict, List, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from config.config import REQUEST_TIMEOUT, SERPER_REQUESTS_PER_MINUTE
+from config.settings import SERPER_CONFIG
+from src.utils.rate_limiter import RateLimiter, request_with_backoff
+
+# Shared by every client in the process; one token per HTTP request, however many searches it holds
+SERPER_LIMITER = RateLimiter(requests_per_minute=SERPER_REQUESTS_PER_MINUTE, burst_limit=20)
+
+
+def search_payload(query: str, page: int = 0, location: str = None, gl: str = None, hl: str = None,
+                   num: int = None) -> Dict:
+    """One Serper search (page is 0-based), with the configured defaults filled in."""
+    payload = {
+        "q": query,
+        "gl": gl or SERPER_CONFIG['GL'],
+        "hl": hl or SERPER_CONFIG['HL'],
+        "num": num or SERPER_CONFIG['NUM']
+    }
+    location = SERPER_CONFIG['LOCATION'] if location is None else location
+    if location:
+        payload["location"] = location
+    if page:
+        payload["page"] = page + 1
+    return payload
+
+
+def parse_serper_result(data: Dict, page: int = 0, num: int = None) -> Tuple[List[Dict], Dict]:
+    """Organic results ([{"link", "position"}], positions counted across pages) and the
+    places / knowledge-graph listings of one Serper search."""
+    offset = page * (num or SERPER_CONFIG['NUM'])
+    results = []
+    for rank, item in enumerate(data.get("organic", []), start=1):
+        if not item.get("link"):
+            continue
+        position = item.get("position") or rank
+        # Serper numbers each page from 1
+        if position <= offset:
+            position += offset
+        results.append({"link": item["link"], "position": position})
+    listings = [
+        {"title": place.get("title", ""), "website": place.get("website", ""),
+         "url": f"https://maps.google.com/?cid={place['cid']}" if place.get("cid") else ""}
+        for place in data.get("places", [])
+    ]
+    knowledge_graph = data.get("knowledgeGraph") or {}
+    if knowledge_graph.get("title"):
+        listings.append({"title": knowledge_graph["title"], "website": knowledge_graph.get("website", ""), "url": ""})
+    return results, {"local_pack": bool(data.get("places")), "listings": listings}
+
+
+class SerperClient:
+    """Thread-safe, batching Serper.dev client for one API key."""
+
+    def __init__(self, api_key: str, url: str = None, batch_size: int = None, batch_wait: float = None,
+                 concurrency: int = None):
+        self.api_key = api_key
+        self.url = url or SERPER_CONFIG['URL']
+        self.batch_size = batch_size or SERPER_CONFIG['BATCH_SIZE']
+        self.batch_wait = SERPER_CONFIG['BATCH_WAIT'] if batch_wait is None else batch_wait
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=SERPER_CONFIG['POOL_SIZE'])
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"X-API-KEY": api_key, "Content-Type": "application/json"})
+        self.senders = concurrent.futures.ThreadPoolExecutor(
+            max_workers=concurrency or SERPER_CONFIG['CONCURRENCY'], thread_name_prefix="serper"
+        )
+        self.pending = []  # (payload, future)
+        self.cond = threading.Condition()
+        self._dispatcher = None
+        self.requests_sent = 0
+        self.searches_sent = 0
+
+    def post_batch(self, payloads: List[Dict]) -> List[Dict]:
+        """Send searches in one request and return their results in order."""
+        body = json.dumps(payloads)
+        response = request_with_backoff(
+            SERPER_LIMITER,
+            lambda: self.session.post(self.url, data=body, timeout=REQUEST_TIMEOUT),
+            f"Serper.dev batch of {len(payloads)} searches"
+        )
+        results = response.json()
+        # A single search may come back as a bare object
+        if isinstance(results, dict):
+            results = [results]
+        if len(results) != len(payloads):
+            raise ValueError(f"Serper.dev answered {len(results)} results for {len(payloads)} searches")
+        with self.cond:
+            self.requests_sent += 1
+            self.searches_sent += len(payloads)
+        return results
+
+    def submit(self, payload: Dict) -> concurrent.futures.Future:
+        """Queue one search; the future resolves to Serper's raw result for it."""
+        future = concurrent.futures.Future()
+        with self.cond:
+            self.pending.append((payload, future))
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch, name="serper-dispatch", daemon=True)
+                self._dispatcher.start()
+            self.cond.notify()
+        return future
+
+    def search(self, query: str, page: int = 0, **params) -> Dict:
+        return self.submit(search_payload(query, page, **params)).result()
+
+    def search_many(self, payloads: List[Dict]) -> List[Optional[Dict]]:
+        """Raw results for many searches (see search_payload); failed searches come back as None."""
+        futures = [self.submit(payload) for payload in payloads]
+        results = []
+        for payload, future in zip(payloads, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logging.error("Serper.dev search failed for '%s': %s", payload.get("q"), str(e))
+                results.append(None)
+        return results
+
+    def _dispatch(self):
+        while True:
+            with self.cond:
+                if not self.pending:
+                    # Idle for a while: let the thread end, submit() starts a new one
+                    if not self.cond.wait(timeout=30) and not self.pending:
+                        self._dispatcher = None
+                        return
+                    continue
+                # Give other threads a moment to add their searches to this request
+                deadline = time.monotonic() + self.batch_wait
+                while len(self.pending) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+                batch = self.pending[:self.batch_size]
+                del self.pending[:self.batch_size]
+            self.senders.submit(self._send, batch)
+
+    def _send(self, batch):
+        try:
+            results = self.post_batch([payload for payload, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+
+_clients: Dict[str, SerperClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_serper_client(api_key: str) -> SerperClient:
+    """Process-wide client for an API key, so every worker shares its connections and batches."""
+    with _clients_lock:
+        if api_key not in _clients:
+            _clients[api_key] = SerperClient(api_key)
+        return _clients[api_key]
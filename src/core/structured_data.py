@@ -0,0 +1,151 @@
+# src/core/structured_data.py
+import json
+import re
+import logging
+from typing import Dict, List
+from urllib.parse import urlparse
+
+# schema.org types that describe the business behind the site. LocalBusiness has hundreds of
+# subtypes (Restaurant, Dentist, ...), so any typed entity carrying an address also qualifies.
+BUSINESS_TYPES = {
+    'organization', 'localbusiness', 'corporation', 'store', 'onlinestore', 'onlinebusiness',
+    'professionalservice', 'medicalorganization', 'restaurant', 'educationalorganization',
+    'homeandconstructionbusiness', 'automotivebusiness', 'legalservice', 'financialservice'
+}
+TITLE_SEPARATORS = re.compile(r'\s+[|\-–—:·•]\s+')
+# Page titles that name the page, not the business
+GENERIC_TITLES = {
+    'home', 'homepage', 'home page', 'welcome', 'index', 'main', 'default', 'untitled',
+    'coming soon', 'under construction', 'about', 'about us', 'contact', 'contact us',
+    'login', 'log in', 'sign in', 'page not found', 'not found', '404', 'error', 'website',
+    'my website', 'my site', 'new site', 'site', 'shop', 'store', 'blog', 'just a moment'
+}
+# Second-level labels of public suffixes like co.uk / com.au, never part of the brand
+SUFFIX_LABELS = {'co', 'com', 'org', 'net', 'ac', 'gov', 'edu', 'ne', 'or', 'ltd', 'plc'}
+
+
+class StructuredDataExtractor:
+    """Collects JSON-LD, microdata and Open Graph tags and derives business name and location."""
+
+    def extract(self, soup, url: str = '') -> Dict:
+        """`url` is the page's address; when given, a bare <title> only names the business if it matches the domain."""
+        json_ld = self._extract_json_ld(soup)
+        microdata = self._extract_microdata(soup)
+        opengraph = self._extract_opengraph(soup)
+        entities = json_ld + microdata
+        business = next((e for e in entities if self._is_business(e)), {})
+        return {
+            'json_ld': json_ld,
+            'microdata': microdata,
+            'opengraph': opengraph,
+            'business_name': self._business_name(business, opengraph, soup, url),
+            'location': self._location(business, entities)
+        }
+
+    def _extract_json_ld(self, soup) -> List[Dict]:
+        entities = []
+        for script in soup.find_all('script', type='application/ld+json'):
+            try:
+                data = json.loads(script.string or '')
+            except (ValueError, TypeError):
+                logging.debug("Skipping malformed JSON-LD block")
+                continue
+            stack = data if isinstance(data, list) else [data]
+            while stack:
+                item = stack.pop(0)
+                if isinstance(item, list):
+                    stack.extend(item)
+                elif isinstance(item, dict):
+                    if '@graph' in item:
+                        stack.extend(item['@graph'] if isinstance(item['@graph'], list) else [item['@graph']])
+                    if '@type' in item:
+                        entities.append(item)
+        return entities
+
+    def _extract_microdata(self, soup) -> List[Dict]:
+        def read_scope(scope) -> Dict:
+            item = {'@type': scope.get('itemtype', '').rstrip('/').rsplit('/', 1)[-1]}
+            for prop in scope.find_all(attrs={'itemprop': True}):
+                # Only properties that belong to this scope, not to a nested one
+                if prop.find_parent(attrs={'itemscope': True}) is not scope:
+                    continue
+                name = prop['itemprop']
+                if prop.has_attr('itemscope'):
+                    value = read_scope(prop)
+                else:
+                    value = prop.get('content') or prop.get('href') or prop.get_text(' ', strip=True)
+                item.setdefault(name, value)
+            return item
+
+        return [
+            read_scope(scope) for scope in soup.find_all(attrs={'itemscope': True})
+            if not scope.has_attr('itemprop')
+        ]
+
+    def _extract_opengraph(self, soup) -> Dict:
+        tags = {}
+        for meta in soup.find_all('meta', attrs={'property': re.compile(r'^og:')}):
+            if meta.get('content'):
+                tags.setdefault(meta['property'], meta['content'].strip())
+        return tags
+
+    @staticmethod
+    def _types(entity: Dict) -> List[str]:
+        types = entity.get('@type', [])
+        return [str(t).lower() for t in (types if isinstance(types, list) else [types])]
+
+    def _is_business(self, entity: Dict) -> bool:
+        types = self._types(entity)
+        return any(t in BUSINESS_TYPES for t in types) or ('address' in entity and 'name' in entity)
+
+    @staticmethod
+    def _brand_labels(url: str) -> List[str]:
+        """Host labels that can carry the brand: 'https://www.shop.acme.co.uk' -> ['shop', 'acme']."""
+        labels = (urlparse(url).hostname or '').lower().split('.')
+        if labels and labels[0] == 'www':
+            labels = labels[1:]
+        labels = labels[:-1]
+        if len(labels) > 1 and labels[-1] in SUFFIX_LABELS:
+            labels = labels[:-1]
+        return [label for label in labels if len(label) >= 3]
+
+    def _title_matches_domain(self, title: str, url: str) -> bool:
+        compact_title = re.sub(r'[^a-z0-9]', '', title.lower())
+        labels = [label.replace('-', '') for label in self._brand_labels(url)]
+        return len(compact_title) >= 3 and any(
+            label in compact_title or compact_title in label for label in labels
+        )
+
+    def _business_name(self, business: Dict, opengraph: Dict, soup, url: str = '') -> str:
+        name = business.get('name')
+        if isinstance(name, str) and name.strip():
+            return name.strip()
+        if opengraph.get('og:site_name'):
+            return opengraph['og:site_name']
+        # A clean title is short, has no "Page | Brand" style separators, is not a generic page
+        # name and, when the page's address is known, matches its domain
+        title = soup.title.get_text(strip=True) if soup.title else ''
+        if not title or len(title) > 60 or TITLE_SEPARATORS.search(title):
+            return ''
+        if title.lower().strip(' .!') in GENERIC_TITLES:
+            return ''
+        if url and not self._title_matches_domain(title, url):
+            return ''
+        return title
+
+    def _location(self, business: Dict, entities: List[Dict]) -> str:
+        candidates = [business.get('address')] + [e for e in entities if 'postaladdress' in self._types(e)]
+        for address in candidates:
+            if isinstance(address, list):
+                address = address[0] if address else None
+            if isinstance(address, str) and address.strip():
+                return address.replace(',', ' ').strip()
+            if isinstance(address, dict):
+                country = address.get('addressCountry', '')
+                if isinstance(country, dict):
+                    country = country.get('name', '')
+                parts = [address.get('addressLocality'), address.get('addressRegion'), country]
+                location = ' '.join(str(p).replace(',', ' ').strip() for p in parts if p)
+                if location:
+                    return re.sub(r'\s+', ' ', location)
+        return ''
@@ -1,8 +1,13 @@
+import gzip
 import hashlib
 import json
+import logging
 import os
+import re
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, Optional
+from config.config import CACHE_COMPRESSION, NEGATIVE_CACHE_TTLS
 
 class AnalysisCache:
     def __init__(self, cache_dir="output/cache"):
@@ -36,3 +41,215 @@ class AnalysisCache:
                 'timestamp': datetime.now().isoformat(),
                 'analysis': analysis
             }, f)
+
+
+# Checked in order against the lower-cased error message, once URLs and host names are removed
+# (a domain like mytimeout.com or sslwireless.com says nothing about why it failed)
+FAILURE_CLASSES = [
+    ('nxdomain', ('nxdomain', 'name or service not known', 'nodename nor servname', 'getaddrinfo failed')),
+    ('timeout', ('timed out', 'timeout')),
+    ('tls', ('ssl', 'certificate', 'tls')),
+    ('no_content', ('no readable content', 'unsupported content type')),
+    ('connection', ('connection', 'max retries exceeded', 'remote end closed')),
+]
+ERROR_LOCATIONS = re.compile(r"[a-z][a-z0-9+.-]*://[^\s;,'\")]*|host='[^']*'|url: [^\s;,)]*", re.I)
+HTTP_STATUS = re.compile(r'http error (\d{3})')
+RATE_LIMIT_STATUSES = {'408', '429'}
+
+try:
+    import zstandard
+except ImportError:  # gzip is always available
+    zstandard = None
+
+
+class CachedPage(dict):
+    """A scraped page read from PageCache; 'content' is decompressed on first access."""
+
+    def __init__(self, entry: Dict, load_content):
+        super().__init__(entry)
+        self._load_content = load_content
+
+    def _ensure_content(self):
+        if self._load_content is not None:
+            dict.__setitem__(self, 'content', self._load_content())
+            self._load_content = None
+
+    def __getitem__(self, key):
+        if key == 'content':
+            self._ensure_content()
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        if key == 'content':
+            self._ensure_content()
+        return dict.get(self, key, default)
+
+    def __contains__(self, key):
+        return key == 'content' or dict.__contains__(self, key)
+
+
+class PageCache(AnalysisCache):
+    """Scraper cache split into small URL entries and content-addressed, compressed blobs.
+
+    urls/<md5 of url>.json holds the timestamp, metadata and structured data plus the SHA-256
+    of the page text; blobs/<sha256>.zst (or .gz without zstandard) holds the text itself.
+    The same text served under several domains (parked pages, templates) is stored once.
+    Entries written by AnalysisCache in the same directory are still read and migrated.
+    """
+
+    def __init__(self, cache_dir="output/cache_extractor", compression: str = None):
+        super().__init__(cache_dir)
+        self.url_dir = os.path.join(cache_dir, 'urls')
+        self.blob_dir = os.path.join(cache_dir, 'blobs')
+        os.makedirs(self.url_dir, exist_ok=True)
+        os.makedirs(self.blob_dir, exist_ok=True)
+        compression = compression or CACHE_COMPRESSION
+        self.compression = 'zstd' if compression == 'zstd' and zstandard is not None else 'gzip'
+
+    def _write_atomic(self, path: str, data: bytes):
+        tmp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, path)
+
+    def _blob_path(self, digest: str, compression: str) -> str:
+        return os.path.join(self.blob_dir, f"{digest}.{'zst' if compression == 'zstd' else 'gz'}")
+
+    def put_blob(self, content: str) -> str:
+        """Store `content` once under its SHA-256 and return the digest."""
+        data = content.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        if not os.path.exists(self._blob_path(digest, self.compression)):
+            if self.compression == 'zstd':
+                compressed = zstandard.ZstdCompressor(level=10).compress(data)
+            else:
+                compressed = gzip.compress(data, compresslevel=6)
+            self._write_atomic(self._blob_path(digest, self.compression), compressed)
+        return digest
+
+    def read_blob(self, digest: str) -> str:
+        zst_path = self._blob_path(digest, 'zstd')
+        if os.path.exists(zst_path):
+            if zstandard is None:
+                raise RuntimeError(f"Cache blob {digest} is zstd-compressed but zstandard is not installed")
+            with open(zst_path, 'rb') as f:
+                return zstandard.ZstdDecompressor().decompress(f.read()).decode('utf-8')
+        with open(self._blob_path(digest, 'gzip'), 'rb') as f:
+            return gzip.decompress(f.read()).decode('utf-8')
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Cached page for a URL if valid; the text is only read from disk when used."""
+        entry_file = os.path.join(self.url_dir, f"{self._hash_url(url)}.json")
+        if not os.path.exists(entry_file):
+            return self._migrate_legacy(url)
+        try:
+            with open(entry_file, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not self._is_valid(entry['timestamp']):
+            return None
+        digest = entry['content_sha256']
+        if not os.path.exists(self._blob_path(digest, 'zstd')) and not os.path.exists(self._blob_path(digest, 'gzip')):
+            logging.debug("Cache blob missing for %s", url)
+            return None
+        return CachedPage(entry['page'], lambda: self.read_blob(digest))
+
+    def _migrate_legacy(self, url: str) -> Optional[Dict]:
+        """Move a valid AnalysisCache entry for `url` to the new layout, keeping its timestamp."""
+        legacy_file = os.path.join(self.cache_dir, f"{self._hash_url(url)}.json")
+        try:
+            with open(legacy_file, 'r') as f:
+                legacy = json.load(f)
+            if not self._is_valid(legacy['timestamp']):
+                return None
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        self.set(url, legacy['analysis'], timestamp=legacy['timestamp'])
+        # Other workers may be migrating the same entry
+        try:
+            os.remove(legacy_file)
+        except OSError:
+            pass
+        return legacy['analysis']
+
+    def set(self, url: str, scraped_data: Dict, timestamp: str = None):
+        """Save a scraped page: the text as a shared blob, the rest as the URL entry.
+
+        `timestamp` (ISO format) defaults to now; migrated entries keep their original one.
+        """
+        page = {key: value for key, value in scraped_data.items() if key != 'content'}
+        digest = self.put_blob(scraped_data.get('content') or "")
+        entry = {
+            'timestamp': timestamp or datetime.now().isoformat(),
+            'url': url,
+            'content_sha256': digest,
+            'page': page
+        }
+        entry_file = os.path.join(self.url_dir, f"{self._hash_url(url)}.json")
+        self._write_atomic(entry_file, json.dumps(entry, default=str).encode('utf-8'))
+
+
+def classify_failure(error: str) -> str:
+    """Failure class of a scrape error message, used to pick its negative-cache TTL.
+
+    An HTTP status in the message decides the class (after NXDOMAIN); the other classes come
+    from markers in the text, never from the URL or host it names.
+    """
+    text = ERROR_LOCATIONS.sub(' ', error).lower()
+    if any(marker in text for marker in FAILURE_CLASSES[0][1]):
+        return 'nxdomain'
+    status = HTTP_STATUS.search(text)
+    if status:
+        code = status.group(1)
+        if code in RATE_LIMIT_STATUSES:
+            return 'rate_limited'
+        return 'http_5xx' if code.startswith('5') else 'http_4xx'
+    for failure_class, markers in FAILURE_CLASSES:
+        if any(marker in text for marker in markers):
+            return failure_class
+    return 'other'
+
+
+class NegativeCache(AnalysisCache):
+    """Failed scrapes keyed by host (see ExtractionPipeline.failure_key), so re-runs return the error instead of retrying.
+
+    Each entry expires after the TTL of its failure class (NEGATIVE_CACHE_TTLS): minutes to
+    hours for rate limits, timeouts and server errors, days for NXDOMAIN and other 4xx.
+    """
+
+    def __init__(self, cache_dir="output/cache_negative"):
+        super().__init__(cache_dir)
+
+    def get(self, domain: str) -> Optional[Dict]:
+        """The cached failure for a host ({'error', 'failure_class', 'timestamp'}) if still valid."""
+        cache_file = os.path.join(self.cache_dir, f"{self._hash_url(domain)}.json")
+        try:
+            with open(cache_file, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        ttl = NEGATIVE_CACHE_TTLS.get(entry['failure_class'], NEGATIVE_CACHE_TTLS['other'])
+        if datetime.now() - datetime.fromisoformat(entry['timestamp']) >= timedelta(seconds=ttl):
+            return None
+        return entry
+
+    def set(self, domain: str, error: str, failure_class: str = None):
+        """Record a failure for a host."""
+        entry = {
+            'timestamp': datetime.now().isoformat(),
+            'domain': domain,
+            'failure_class': failure_class or classify_failure(error),
+            'error': error
+        }
+        cache_file = os.path.join(self.cache_dir, f"{self._hash_url(domain)}.json")
+        tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_file, cache_file)
+
+    def clear(self, domain: str):
+        try:
+            os.remove(os.path.join(self.cache_dir, f"{self._hash_url(domain)}.json"))
+        except OSError:
+            pass
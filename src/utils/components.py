@@ -23,28 +23,37 @@ class Components:
         st.success("Analysis complete!")
         col1, col2, col3 = st.columns(3)
         total = len(df)
-        successful = len(df[df['Status'] == 'success'])
+        successful = int((df['Status'] == 'success').sum())
         failed = total - successful
 
         col1.metric("Total URLs", total)
         col2.metric("Successful", successful)
         col3.metric("Failed", failed)
 
-        sanitized_df = df.copy()
-        # Convert object columns to string and fill NaN values with a blank space.
+        # Shallow copy: only the columns rewritten below get new data
+        sanitized_df = df.copy(deep=False)
         for column in sanitized_df.columns:
-            if sanitized_df[column].dtype == 'object':
-                sanitized_df[column] = sanitized_df[column].astype(str)
-        sanitized_df = sanitized_df.fillna(' ')
-        sanitized_df.replace('nan', ' ', inplace=True)
-        # Replace numeric zeros with an empty string.
-        for col in sanitized_df.select_dtypes(include=['number']).columns:
-            sanitized_df[col] = sanitized_df[col].replace(0, '')
+            series = sanitized_df[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Category columns come from the result store and hold no NaN
+                continue
+            if series.dtype == 'object':
+                # Convert object columns to string and fill NaN values with a blank space.
+                sanitized_df[column] = series.fillna(' ').astype(str).replace('nan', ' ')
+            elif pd.api.types.is_numeric_dtype(series):
+                # Replace numeric zeros with an empty string.
+                sanitized_df[column] = series.replace(0, '').fillna(' ')
+            else:
+                sanitized_df[column] = series.fillna(' ')
 
         # Remove the default index and add a serial number column starting from 1.
         sanitized_df.reset_index(drop=True, inplace=True)
         sanitized_df.index = sanitized_df.index + 1
-        # sanitized_df.insert(0, "Sl No", sanitized_df.index)
-        # sanitized_df.drop_index( inplace=True)
         st.dataframe(sanitized_df, use_container_width=True)
 
+    def display_host_stats(self, stats):
+        """Show per-host Ollama throughput when inference is spread over a host pool."""
+        if len(stats) < 2:
+            return
+        with st.expander("Ollama Hosts"):
+            st.dataframe(pd.DataFrame(stats), use_container_width=True)
@@ -0,0 +1,218 @@
+# src/utils/dns_cache.py
+import asyncio
+import socket
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from config.config import (DNS_CACHE_SIZE, DNS_DEFAULT_TTL, DNS_MAX_TTL, DNS_NEGATIVE_TTL,
+                           DNS_CONCURRENCY, DNS_TIMEOUT, DNS_CANARY_HOST)
+
+try:
+    import dns.asyncresolver
+    import dns.resolver
+except ImportError:  # fall back to getaddrinfo, which does not report TTLs
+    dns = None
+
+# Outcomes of a lookup
+RESOLVED = 'resolved'
+NXDOMAIN = 'nxdomain'
+UNKNOWN = 'unknown'  # timeouts, SERVFAIL, no A/AAAA records: let the scrape find out
+
+
+class DnsCache:
+    """Bounded in-process DNS cache shared by the pre-resolution stage and the scraper.
+
+    Positive entries live for the record TTL (capped at DNS_MAX_TTL; DNS_DEFAULT_TTL when
+    dnspython is not installed), NXDOMAIN answers for DNS_NEGATIVE_TTL. The least recently
+    used entry is dropped once DNS_CACHE_SIZE hosts are held.
+    """
+
+    def __init__(self, max_entries: int = DNS_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # host -> (outcome, addresses, expires_at)
+        self.lock = threading.Lock()
+
+    def _get(self, host: str):
+        host = host.lower().rstrip('.')
+        with self.lock:
+            entry = self.entries.get(host)
+            if entry is None:
+                return None
+            if entry[2] <= time.monotonic():
+                del self.entries[host]
+                return None
+            self.entries.move_to_end(host)
+            return entry
+
+    def _put(self, host: str, outcome: str, addresses: List[str], ttl: float):
+        host = host.lower().rstrip('.')
+        with self.lock:
+            self.entries[host] = (outcome, addresses, time.monotonic() + ttl)
+            self.entries.move_to_end(host)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def addresses(self, host: str) -> Optional[List[str]]:
+        """Cached addresses for a host, or None if it is not (or no longer) cached."""
+        entry = self._get(host)
+        return entry[1] if entry and entry[0] == RESOLVED else None
+
+    def is_nxdomain(self, host: str) -> bool:
+        entry = self._get(host)
+        return bool(entry) and entry[0] == NXDOMAIN
+
+    def is_dead(self, host: str) -> bool:
+        return all(self.is_nxdomain(variant) for variant in host_variants(host))
+
+    def evict(self, host: str):
+        with self.lock:
+            self.entries.pop(host.lower().rstrip('.'), None)
+
+    async def _lookup(self, host: str):
+        """(outcome, addresses, ttl) for one host."""
+        if dns is not None:
+            resolver = dns.asyncresolver.Resolver()
+            resolver.lifetime = DNS_TIMEOUT
+            for record_type in ('A', 'AAAA'):
+                try:
+                    answer = await resolver.resolve(host, record_type)
+                    return RESOLVED, [r.to_text() for r in answer], min(answer.rrset.ttl, DNS_MAX_TTL)
+                except dns.resolver.NXDOMAIN:
+                    return NXDOMAIN, [], DNS_NEGATIVE_TTL
+                except dns.resolver.NoAnswer:
+                    continue
+                except Exception as e:
+                    logging.debug("DNS lookup for %s failed: %s", host, str(e))
+                    return UNKNOWN, [], 0
+            return UNKNOWN, [], 0
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await asyncio.wait_for(
+                loop.getaddrinfo(host, None, type=socket.SOCK_STREAM), timeout=DNS_TIMEOUT
+            )
+        except socket.gaierror as e:
+            if e.errno == socket.EAI_NONAME:
+                return NXDOMAIN, [], DNS_NEGATIVE_TTL
+            logging.debug("DNS lookup for %s failed: %s", host, str(e))
+            return UNKNOWN, [], 0
+        except (asyncio.TimeoutError, OSError) as e:
+            logging.debug("DNS lookup for %s failed: %s", host, str(e))
+            return UNKNOWN, [], 0
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        return RESOLVED, addresses, DNS_DEFAULT_TTL
+
+    async def resolve_async(self, host: str) -> str:
+        """Resolve through the cache and return the outcome."""
+        entry = self._get(host)
+        if entry is not None:
+            return entry[0]
+        outcome, addresses, ttl = await self._lookup(host)
+        if ttl:
+            self._put(host, outcome, addresses, ttl)
+        return outcome
+
+    async def _resolve_all(self, hosts: List[str], concurrency: int) -> Dict[str, str]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def resolve(host):
+            async with semaphore:
+                return host, await self.resolve_async(host)
+
+        return dict(await asyncio.gather(*(resolve(host) for host in hosts)))
+
+    def resolve_all(self, hosts: Iterable[str], concurrency: int = DNS_CONCURRENCY) -> Dict[str, str]:
+        """Resolve many hosts concurrently; returns host -> RESOLVED / NXDOMAIN / UNKNOWN."""
+        hosts = list(dict.fromkeys(h.lower().rstrip('.') for h in hosts if h))
+        if not hosts:
+            return {}
+        start = time.perf_counter()
+        outcomes = asyncio.run(self._resolve_all(list(dict.fromkeys(hosts + [DNS_CANARY_HOST])), concurrency))
+        canary = outcomes[DNS_CANARY_HOST] if DNS_CANARY_HOST in hosts else outcomes.pop(DNS_CANARY_HOST)
+        if canary == NXDOMAIN:
+            # A resolver that denies a name known to exist (no network, broken resolv.conf)
+            # would otherwise fail every row; treat its NXDOMAIN answers as unknown
+            logging.warning("DNS resolver reports %s as NXDOMAIN; not trusting NXDOMAIN answers", DNS_CANARY_HOST)
+            for host, outcome in outcomes.items():
+                if outcome == NXDOMAIN:
+                    self.evict(host)
+                    outcomes[host] = UNKNOWN
+            self.evict(DNS_CANARY_HOST)
+        logging.info("Resolved %d hosts in %.2f seconds (%d NXDOMAIN)", len(hosts), time.perf_counter() - start,
+                     sum(1 for outcome in outcomes.values() if outcome == NXDOMAIN))
+        return outcomes
+
+
+def host_variants(host: str) -> List[str]:
+    """The bare and www. forms of a host; a domain only counts as dead when both are NXDOMAIN."""
+    host = host.lower().rstrip('.')
+    bare = host[4:] if host.startswith('www.') else host
+    return [bare, f"www.{bare}"]
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_dns_cache() -> DnsCache:
+    """Process-wide DNS cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = DnsCache()
+        return _cache
+
+
+class CachedAddressMixin:
+    """Connect to an address from the DNS cache when there is one, instead of resolving again.
+
+    Only the socket target changes; the Host header, SNI and certificate checks still use the
+    hostname. If the cached address refuses, the entry is dropped and the hostname is used.
+    """
+
+    def _new_conn(self):
+        addresses = get_dns_cache().addresses(self._dns_host)
+        if not addresses:
+            return super()._new_conn()
+        hostname = self._dns_host
+        self._dns_host = addresses[0]
+        try:
+            return super()._new_conn()
+        except Exception as e:
+            logging.debug("Cached address %s for %s failed (%s), resolving again", addresses[0], hostname, str(e))
+            get_dns_cache().evict(hostname)
+            self._dns_host = hostname
+            return super()._new_conn()
+        finally:
+            self._dns_host = hostname
+
+
+class CachedHTTPConnection(CachedAddressMixin, HTTPConnection):
+    pass
+
+
+class CachedHTTPSConnection(CachedAddressMixin, HTTPSConnection):
+    pass
+
+
+class CachedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = CachedHTTPConnection
+
+
+class CachedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = CachedHTTPSConnection
+
+
+class CachedDnsAdapter(HTTPAdapter):
+    """requests adapter whose connection pools connect through the DNS cache."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CachedHTTPConnectionPool,
+            'https': CachedHTTPSConnectionPool
+        }
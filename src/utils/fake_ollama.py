@@ -0,0 +1,111 @@
+# src/utils/fake_ollama.py
+"""Minimal stand-in for an Ollama server, for exercising the host pool and benchmarks offline.
+
+Run several on different ports:
+    python -m src.utils.fake_ollama --port 11501 --latency 0.5
+    python -m src.utils.fake_ollama --port 11502 --latency 1.0 --fail-rate 0.2
+then point the app at them with OLLAMA_URLS=http://localhost:11501,http://localhost:11502
+"""
+import argparse
+import json
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def canned_analysis(url: str) -> dict:
+    name = re.sub(r'^https?://(www\.)?', '', url).split('/')[0].split('.')[0]
+    return {
+        "keywords": f"{name} services online, best {name} near me, affordable {name} products, {name} reviews, buy {name}",
+        "business_name": name.title(),
+        "products_services": f"{name} products, {name} consulting, {name} support",
+        "target_audience": "Small business owners, Local homeowners",
+        "location": "United States"
+    }
+
+
+def build_response(prompt: str) -> str:
+    urls = re.findall(r'Website URL: (\S+)', prompt)
+    if len(urls) > 1:
+        return json.dumps({"results": [dict(canned_analysis(url), url=url) for url in urls]})
+    return json.dumps(canned_analysis(urls[0] if urls else "unknown"))
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload: dict, status: int = 200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send_json({"models": [{"name": m} for m in self.server.models]})
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if self.path != "/api/generate":
+            self._send_json({"error": "not found"}, 404)
+            return
+        if request.get("model") not in self.server.models:
+            self._send_json({"error": f"model '{request.get('model')}' not found"}, 404)
+            return
+        if random.random() < self.server.fail_rate:
+            self._send_json({"error": "simulated failure"}, 500)
+            return
+
+        start = time.perf_counter()
+        time.sleep(self.server.latency)
+        text = build_response(request.get("prompt", ""))
+        if request.get("stream", True) is False:
+            self._send_json({"model": request["model"], "response": text, "done": True})
+            return
+
+        # Stream NDJSON the way Ollama does, a few characters at a time
+        chunks = [text[i:i + 16] for i in range(0, len(text), 16)] or [""]
+        lines = [{"model": request["model"], "response": chunk, "done": False} for chunk in chunks]
+        elapsed_ns = int((time.perf_counter() - start) * 1e9)
+        lines.append({
+            "model": request["model"], "response": "", "done": True,
+            "prompt_eval_count": len(request.get("prompt", "")) // 4,
+            "eval_count": len(chunks),
+            "eval_duration": max(elapsed_ns, 1),
+            "total_duration": max(elapsed_ns, 1)
+        })
+        body = b"".join(json.dumps(line).encode('utf-8') + b"\n" for line in lines)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_server(port: int, models, latency: float = 0.0, fail_rate: float = 0.0, host: str = "127.0.0.1"):
+    server = ThreadingHTTPServer((host, port), FakeOllamaHandler)
+    server.models = set(models)
+    server.latency = latency
+    server.fail_rate = fail_rate
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Ollama server")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--models", default="llama3.2:3b,llama3.1:8b")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per generate call")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="share of generate calls answered with HTTP 500")
+    args = parser.parse_args()
+    server = make_server(args.port, args.models.split(','), args.latency, args.fail_rate)
+    print(f"Fake Ollama listening on http://127.0.0.1:{args.port} with models {sorted(server.models)}")
+    server.serve_forever()
@@ -0,0 +1,93 @@
+# src/utils/fake_serper.py
+"""Minimal stand-in for the Serper.dev search API, for exercising competitor jobs offline.
+
+    python -m src.utils.fake_serper --port 11800 --latency 0.3
+then point the app at it with SERPER_URL=http://localhost:11800/search (any API key works).
+
+Accepts one search object or an array of them, like the real API, and answers with
+deterministic organic results, plus places for queries mentioning "near" or "in".
+"""
+import argparse
+import json
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def canned_result(search: dict) -> dict:
+    query = str(search.get("q", ""))
+    slug = re.sub(r'[^a-z0-9]+', '-', query.lower()).strip('-') or 'result'
+    page = int(search.get("page", 1))
+    num = int(search.get("num", 10))
+    organic = [
+        {
+            "title": f"{query} #{rank}",
+            "link": f"https://www.{slug}-{(page - 1) * num + rank}.com/",
+            "position": rank
+        }
+        for rank in range(1, num + 1)
+    ]
+    result = {"searchParameters": dict(search, type="search"), "organic": organic}
+    if page == 1 and re.search(r'\b(near|in)\b', query.lower()):
+        result["places"] = [
+            {"title": f"{slug.replace('-', ' ').title()} {i}", "website": f"https://{slug}-place-{i}.com", "cid": str(1000 + i)}
+            for i in range(1, 4)
+        ]
+    return result
+
+
+class FakeSerperHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload, status: int = 200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not self.headers.get("X-API-KEY"):
+            self._send_json({"message": "Unauthorized."}, 403)
+            return
+        searches = request if isinstance(request, list) else [request]
+        if len(searches) > self.server.max_batch:
+            self._send_json({"message": f"At most {self.server.max_batch} searches per request."}, 400)
+            return
+        self.server.requests += 1
+        self.server.searches += len(searches)
+        time.sleep(self.server.latency)
+        results = [canned_result(search) for search in searches]
+        self._send_json(results if isinstance(request, list) else results[0])
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send_json({"requests": self.server.requests, "searches": self.server.searches})
+        else:
+            self._send_json({"message": "not found"}, 404)
+
+
+def make_server(port: int, latency: float = 0.0, max_batch: int = 100, host: str = "127.0.0.1"):
+    server = ThreadingHTTPServer((host, port), FakeSerperHandler)
+    server.latency = latency
+    server.max_batch = max_batch
+    server.requests = 0
+    server.searches = 0
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Serper.dev server")
+    parser.add_argument("--port", type=int, default=11800)
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per request, whatever its size")
+    parser.add_argument("--max-batch", type=int, default=100, help="searches accepted per request")
+    args = parser.parse_args()
+    server = make_server(args.port, args.latency, args.max_batch)
+    print(f"Fake Serper.dev listening on http://127.0.0.1:{args.port}/search")
+    server.serve_forever()
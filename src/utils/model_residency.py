@@ -0,0 +1,108 @@
+# src/utils/model_residency.py
+import threading
+import logging
+from contextlib import contextmanager
+from collections import deque
+import requests
+from config.settings import OLLAMA_CONFIG
+
+
+class ModelResidencyManager:
+    """Keeps the model of running jobs loaded in Ollama and groups jobs by model.
+
+    Jobs call `job(model)`. Jobs on the model that is currently resident start right away;
+    jobs on another model wait until every running job has finished, and then all waiting
+    jobs for the next model are admitted together. This avoids Ollama swapping weights
+    back and forth when two users pick different models at the same time.
+    """
+
+    def __init__(self, base_urls=None):
+        self.base_urls = base_urls or OLLAMA_CONFIG['BASE_URLS'] or [OLLAMA_CONFIG['BASE_URL']]
+        self.condition = threading.Condition()
+        self.active_model = None
+        self.active_jobs = 0
+        self.waiting = deque()  # (ticket, model) of queued jobs, oldest first
+        self.admitted = set()  # tickets let in together when the resident model switched
+        self.loaded = threading.Event()
+
+    def _can_start(self, ticket, model: str) -> bool:
+        if ticket in self.admitted:
+            return True
+        if self.active_jobs == 0:
+            # Nothing running: the oldest waiter's model goes next, together with every queued job sharing it
+            if self.waiting and self.waiting[0][0] is not ticket:
+                return False
+            self.admitted = {t for t, m in self.waiting if m == model}
+            return True
+        # Join the resident model unless a job for another model is already queued
+        return model == self.active_model and all(m == model for _, m in self.waiting)
+
+    def _send_keep_alive(self, model: str, keep_alive, timeout: int):
+        """An empty prompt makes Ollama load (or just re-arm) the model with the given keep_alive."""
+        for base_url in self.base_urls:
+            try:
+                response = requests.post(
+                    f"{base_url}/api/generate",
+                    json={"model": model, "prompt": "", "keep_alive": keep_alive, "stream": False},
+                    timeout=timeout
+                )
+                response.raise_for_status()
+                logging.debug("Set keep_alive=%s for model %s on %s", keep_alive, model, base_url)
+            except Exception as e:
+                logging.warning("Could not set keep_alive for model %s on %s: %s", model, base_url, str(e))
+
+    def preload(self, model: str):
+        """Load the model before the first row so no row pays the cold start against its own timeout."""
+        logging.info("Preloading Ollama model %s", model)
+        self._send_keep_alive(model, OLLAMA_CONFIG['KEEP_ALIVE'], OLLAMA_CONFIG['PRELOAD_TIMEOUT'])
+
+    def unpin(self, model: str, unload: bool = False):
+        """Hand the model back to Ollama's normal idle expiry, or unload it if another model is queued."""
+        self._send_keep_alive(model, 0 if unload else OLLAMA_CONFIG['IDLE_KEEP_ALIVE'], 30)
+
+    @contextmanager
+    def job(self, model: str):
+        with self.condition:
+            ticket = object()
+            self.waiting.append((ticket, model))
+            self.condition.wait_for(lambda: self._can_start(ticket, model))
+            self.waiting.remove((ticket, model))
+            self.admitted.discard(ticket)
+            first = self.active_jobs == 0
+            if first:
+                self.loaded = threading.Event()
+            loaded = self.loaded
+            self.active_model = model
+            self.active_jobs += 1
+            # Other queued jobs for this model can now join
+            self.condition.notify_all()
+        try:
+            if first:
+                try:
+                    self.preload(model)
+                finally:
+                    loaded.set()
+            else:
+                loaded.wait()
+            yield
+        finally:
+            with self.condition:
+                self.active_jobs -= 1
+                last = self.active_jobs == 0
+                switching = last and any(m != model for _, m in self.waiting)
+                self.condition.notify_all()
+            if last:
+                self.unpin(model, unload=switching)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_residency_manager() -> ModelResidencyManager:
+    """Process-wide manager, shared by every Streamlit session."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ModelResidencyManager()
+        return _manager
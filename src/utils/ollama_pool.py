@@ -0,0 +1,141 @@
+# src/utils/ollama_pool.py
+import threading
+import time
+import logging
+from typing import Dict, List, Optional
+import requests
+from config.settings import OLLAMA_CONFIG
+
+
+class NoHealthyHostError(Exception):
+    pass
+
+
+class OllamaHostPool:
+    """Least-outstanding-requests balancer over several Ollama base URLs.
+
+    Hosts are health checked through /api/tags, which also tells us which models each host
+    has pulled. A host that fails MAX_HOST_FAILURES requests in a row is ejected until its
+    next successful health check.
+    """
+
+    def __init__(self, base_urls: List[str], health_interval: int = None, max_failures: int = None):
+        self.health_interval = health_interval or OLLAMA_CONFIG['HEALTH_CHECK_INTERVAL']
+        self.max_failures = max_failures or OLLAMA_CONFIG['MAX_HOST_FAILURES']
+        self.lock = threading.Lock()
+        self.hosts = {}
+        for url in base_urls:
+            self.hosts[url.rstrip('/')] = {
+                'outstanding': 0,
+                'healthy': True,
+                'models': None,  # unknown until the first health check
+                'consecutive_failures': 0,
+                'requests': 0,
+                'failures': 0,
+                'busy_seconds': 0.0,
+                'last_check': 0.0
+            }
+        self.started = time.monotonic()
+        self._stop = threading.Event()
+        self._checker = threading.Thread(target=self._health_loop, name="ollama-health", daemon=True)
+        self._checker.start()
+
+    def check_host(self, url: str) -> bool:
+        """Probe one host and refresh its health and model list."""
+        try:
+            response = requests.get(f"{url}/api/tags", timeout=5)
+            response.raise_for_status()
+            models = {m.get('name') for m in response.json().get('models', []) if m.get('name')}
+            healthy = True
+        except Exception as e:
+            logging.warning("Ollama host %s failed health check: %s", url, str(e))
+            models = None
+            healthy = False
+        with self.lock:
+            host = self.hosts[url]
+            if healthy and not host['healthy']:
+                logging.info("Ollama host %s is back in the pool", url)
+            host['healthy'] = healthy
+            host['last_check'] = time.monotonic()
+            if healthy:
+                host['models'] = models
+                host['consecutive_failures'] = 0
+        return healthy
+
+    def check_all(self):
+        for url in list(self.hosts):
+            self.check_host(url)
+
+    def _health_loop(self):
+        while not self._stop.is_set():
+            self.check_all()
+            self._stop.wait(self.health_interval)
+
+    def close(self):
+        self._stop.set()
+
+    @staticmethod
+    def _has_model(host: Dict, model: str) -> bool:
+        if host['models'] is None:
+            return True
+        # Ollama lists "llama3.2:3b"; bare names imply the ":latest" tag.
+        return model in host['models'] or f"{model}:latest" in host['models']
+
+    def acquire(self, model: str, exclude=()) -> str:
+        """Reserve the healthy host with the fewest outstanding requests that serves `model`."""
+        with self.lock:
+            candidates = [
+                (host['outstanding'], url) for url, host in self.hosts.items()
+                if host['healthy'] and url not in exclude and self._has_model(host, model)
+            ]
+            if not candidates:
+                raise NoHealthyHostError(f"No healthy Ollama host available for model {model}")
+            _, url = min(candidates)
+            self.hosts[url]['outstanding'] += 1
+            return url
+
+    def release(self, url: str, success: bool, elapsed: float):
+        with self.lock:
+            host = self.hosts[url]
+            host['outstanding'] -= 1
+            host['requests'] += 1
+            host['busy_seconds'] += elapsed
+            if success:
+                host['consecutive_failures'] = 0
+            else:
+                host['failures'] += 1
+                host['consecutive_failures'] += 1
+                if host['healthy'] and host['consecutive_failures'] >= self.max_failures:
+                    logging.error("Ejecting Ollama host %s after %d consecutive failures", url, host['consecutive_failures'])
+                    host['healthy'] = False
+
+    def stats(self) -> List[Dict]:
+        """Per-host counters, including completed requests per minute since the pool started."""
+        with self.lock:
+            uptime = max(time.monotonic() - self.started, 1e-9)
+            rows = []
+            for url, host in self.hosts.items():
+                completed = host['requests'] - host['failures']
+                rows.append({
+                    'host': url,
+                    'healthy': host['healthy'],
+                    'outstanding': host['outstanding'],
+                    'requests': host['requests'],
+                    'failures': host['failures'],
+                    'avg_latency_s': round(host['busy_seconds'] / host['requests'], 2) if host['requests'] else 0.0,
+                    'requests_per_min': round(completed * 60 / uptime, 2)
+                })
+            return rows
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_host_pool(base_urls: List[str]) -> Optional[OllamaHostPool]:
+    """Return the process-wide pool for these URLs so outstanding counts are shared by all analyzers."""
+    key = tuple(url.rstrip('/') for url in base_urls)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = OllamaHostPool(list(key))
+        return _pools[key]
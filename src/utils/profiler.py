@@ -0,0 +1,190 @@
+# src/utils/profiler.py
+import os
+import sys
+import json
+import time
+import random
+import threading
+import logging
+import functools
+import concurrent.futures.thread
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Optional
+from config.settings import PROFILE_CONFIG
+
+# Profiling modes
+OFF = 'off'
+JOB = 'job'    # every thread, for the whole run
+ROWS = 'rows'  # only threads while they work on a sampled row
+
+
+def frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+# Thread-pool workers waiting for work; sampling them would bury the real hotspots
+IDLE_FRAMES = {frame_label(concurrent.futures.thread._worker.__code__)}
+
+
+class SamplingProfiler:
+    """Statistical profiler over all threads of this process.
+
+    A daemon thread reads every other thread's stack through sys._current_frames() every
+    `interval` seconds and counts identical stacks. Nothing is hooked into the profiled code,
+    so the cost is one stack walk per thread per tick. In ROWS mode only threads registered
+    through track() (see profile_row) are sampled.
+    """
+
+    def __init__(self, mode: str = JOB, interval: float = None, row_sample: float = None):
+        self.mode = mode
+        self.interval = interval or PROFILE_CONFIG['INTERVAL']
+        self.row_sample = PROFILE_CONFIG['ROW_SAMPLE'] if row_sample is None else row_sample
+        self.stacks = Counter()
+        self.samples = 0
+        self.tracked = {}  # thread id -> nesting depth
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.started = None
+        self.elapsed = 0.0
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self.lock:
+                thread_ids = list(self.tracked) if self.mode == ROWS else [t for t in frames if t != own_id]
+            for thread_id in thread_ids:
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(frame_label(code))
+                    frame = frame.f_back
+                if stack[0] in IDLE_FRAMES:
+                    continue
+                self.stacks[tuple(reversed(stack))] += 1
+                self.samples += 1
+
+    @contextmanager
+    def track(self):
+        """Sample the current thread while inside this block (ROWS mode)."""
+        thread_id = threading.get_ident()
+        with self.lock:
+            self.tracked[thread_id] = self.tracked.get(thread_id, 0) + 1
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.tracked[thread_id] -= 1
+                if not self.tracked[thread_id]:
+                    del self.tracked[thread_id]
+
+    def hotspots(self, top_n: int = None) -> str:
+        """Top functions by self samples (innermost frame) and by total samples (anywhere on the stack)."""
+        top_n = top_n or PROFILE_CONFIG['TOP_N']
+        own, total = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for name in set(stack):
+                total[name] += count
+        samples = max(self.samples, 1)
+        lines = [f"{self.samples} samples over {self.elapsed:.1f}s every {self.interval * 1000:.0f}ms (mode: {self.mode})", ""]
+        for title, counter in (("Self time", own), ("Total time (inclusive)", total)):
+            lines.append(f"{title}:")
+            for name, count in counter.most_common(top_n):
+                lines.append(f"  {100.0 * count / samples:6.2f}%  {count:8d}  {name}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def speedscope(self, name: str) -> Dict:
+        """The profile in speedscope's sampled format (https://www.speedscope.app)."""
+        frames, index = [], {}
+        samples, weights = [], []
+        for stack, count in self.stacks.items():
+            ids = []
+            for frame_name in stack:
+                if frame_name not in index:
+                    index[frame_name] = len(frames)
+                    frames.append({'name': frame_name})
+                ids.append(index[frame_name])
+            samples.append(ids)
+            weights.append(count * self.interval)
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled', 'name': name, 'unit': 'seconds',
+                'startValue': 0, 'endValue': sum(weights),
+                'samples': samples, 'weights': weights
+            }],
+            'name': name
+        }
+
+    def save(self, output_dir: str, name: str) -> str:
+        """Write stacks.folded (flamegraph.pl / speedscope input), profile.speedscope.json and hotspots.txt."""
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, 'stacks.folded'), 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
+        with open(os.path.join(output_dir, 'profile.speedscope.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.speedscope(name), f)
+        with open(os.path.join(output_dir, 'hotspots.txt'), 'w', encoding='utf-8') as f:
+            f.write(self.hotspots())
+        logging.info("Profile for %s written to %s (%d samples)", name, output_dir, self.samples)
+        return output_dir
+
+
+_active: Optional[SamplingProfiler] = None
+
+
+@contextmanager
+def profiling(mode: str, name: str, row_sample: float = None, output_dir: str = None):
+    """Profile the enclosed run in `mode` and save it to output/profiles/<name>; a no-op when mode is OFF."""
+    global _active
+    if not mode or mode == OFF:
+        yield None
+        return
+    profiler = SamplingProfiler(mode, row_sample=row_sample).start()
+    _active = profiler
+    try:
+        yield profiler
+    finally:
+        _active = None
+        profiler.stop()
+        profiler.save(output_dir or os.path.join(PROFILE_CONFIG['DIR'], name), name)
+
+
+@contextmanager
+def profile_row():
+    """Mark the current thread as working on one row; in ROWS mode a sampled share of rows is profiled."""
+    profiler = _active
+    if profiler is None or profiler.mode != ROWS or random.random() >= profiler.row_sample:
+        yield
+        return
+    with profiler.track():
+        yield
+
+
+def profiled_row(func):
+    """Decorator form of profile_row for per-row pipeline methods."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with profile_row():
+            return func(*args, **kwargs)
+    return wrapper
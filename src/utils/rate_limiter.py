@@ -1,21 +1,85 @@
 import time
-from collections import deque
-from datetime import datetime, timedelta
+import random
+import logging
+import threading
+import requests
+from config.config import SERP_MAX_RETRIES, SERP_BACKOFF_BASE, SERP_BACKOFF_MAX
+
+
+def backoff_delay(attempt, base=2.0, cap=60.0):
+    """Full-jitter exponential backoff: a random delay in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
 
 class RateLimiter:
+    """Token bucket shared by every thread calling the same backend.
+
+    Refills at requests_per_minute and holds at most burst_limit tokens. pause() makes every
+    caller hold off, e.g. after the backend answered 429.
+    """
+
     def __init__(self, requests_per_minute=30, burst_limit=10):
         self.rate_limit = requests_per_minute
         self.burst_limit = burst_limit
-        self.requests = deque()
+        self.tokens = float(burst_limit)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.burst_limit, self.tokens + (now - self.updated) * self.rate_limit / 60.0)
+            self.updated = now
 
     def wait(self):
-        now = datetime.now()
-        while self.requests and now - self.requests[0] > timedelta(minutes=1):
-            self.requests.popleft()
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        with self.lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                time.sleep(self.paused_until - now)
+                now = time.monotonic()
+            self._refill(now)
+            if self.tokens < 1:
+                time.sleep((1 - self.tokens) * 60.0 / self.rate_limit)
+                self._refill(time.monotonic())
+            self.tokens -= 1
+
+    def pause(self, seconds):
+        """Hold every caller off for `seconds` and drop the saved-up burst."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+        self.updated = self.paused_until
+
 
-        if len(self.requests) >= self.burst_limit:
-            sleep_time = (self.requests[0] + timedelta(seconds=60 / self.burst_limit) - now).total_seconds()
-            if sleep_time > 0:
-                time.sleep(sleep_time)
+def request_with_backoff(limiter, send, description):
+    """Call `send()` after taking a token from `limiter`, retrying 429s, 5xx and network errors.
 
-        self.requests.append(now)
+    Retries wait a jittered exponential delay (or the server's Retry-After). A 429 also
+    pauses `limiter`, so every thread sharing the backend backs off, not just this one.
+    """
+    last_error = None
+    for attempt in range(SERP_MAX_RETRIES):
+        limiter.wait()
+        try:
+            logging.debug("Attempt %d: %s", attempt + 1, description)
+            response = send()
+            logging.debug("Response status code: %s", response.status_code)
+            if response.status_code == 429 or response.status_code >= 500:
+                retry_after = response.headers.get("Retry-After", "")
+                delay = float(retry_after) if retry_after.isdigit() else backoff_delay(attempt, SERP_BACKOFF_BASE, SERP_BACKOFF_MAX)
+                if response.status_code == 429:
+                    logging.warning("Rate-limited on %s, pausing requests for %.1f seconds", description, delay)
+                    limiter.pause(delay)
+                else:
+                    time.sleep(delay)
+                last_error = requests.exceptions.HTTPError(f"{response.status_code} for {description}", response=response)
+                continue
+            response.raise_for_status()
+            return response
+        except requests.exceptions.HTTPError:
+            raise
+        except requests.exceptions.RequestException as e:
+            logging.error("Error on attempt %d for %s: %s", attempt + 1, description, str(e))
+            last_error = e
+            time.sleep(backoff_delay(attempt, SERP_BACKOFF_BASE, SERP_BACKOFF_MAX))
+    raise last_error
@@ -0,0 +1,209 @@
+# src/web/api.py
+"""HTTP API for driving the extractor and competitor analysis from other systems.
+
+    python -m src.web.api --port 8600
+
+POST /extract      {"domains": ["example.com", ...]}  or  {"rows": [{"Domain": ..., "Email ID": ...}]}
+                   optional: "model", "max_workers", "sites_per_prompt", "use_cache", "retry_failed"
+POST /competitors  {"rows": [{"Domain": ..., "Keyword 1": ..., "Product/Service 1": ...}]}
+                   optional: "search_method", "api_key", "gmb_check", "pages", "max_workers", "use_cache"
+GET  /health
+
+Results are streamed back as NDJSON, one {"index": <row>, ...output columns} record per row
+in completion order, while the rest of the request is still running.
+"""
+import os
+import sys
+import json
+import hmac
+import logging
+import argparse
+import ipaddress
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from config.settings import API_CONFIG, OLLAMA_CONFIG, EXTRACTION_CONFIG
+from src.core.pipeline import ExtractionPipeline, CompetitorPipeline
+from src.core.scraper import WebScraper
+from src.core.page_classifier import PageClassifier
+from src.utils.model_residency import get_residency_manager
+
+
+class BadRequest(Exception):
+    pass
+
+
+def int_param(source, key, default) -> int:
+    """An integer field of the request body or headers; anything else is a BadRequest."""
+    value = source.get(key, default)
+    try:
+        if isinstance(value, bool):
+            raise ValueError
+        return int(value)
+    except (TypeError, ValueError):
+        raise BadRequest(f'"{key}" must be an integer')
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def shared_extraction_parts():
+    """(scraper, classifier) built once and reused by every /extract request: the scraper's
+    hedge pool is sized for the API's worst case, and the classifier trains only once."""
+    with _shared_lock:
+        if not _shared:
+            _shared['scraper'] = WebScraper(concurrency=API_CONFIG['MAX_WORKERS'])
+            _shared['classifier'] = PageClassifier() if EXTRACTION_CONFIG['PAGE_CLASSIFIER'] else None
+        return _shared['scraper'], _shared['classifier']
+
+
+def is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logging.info("API %s - %s", self.address_string(), format % args)
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self) -> bool:
+        token = API_CONFIG['TOKEN']
+        if not token:
+            return True
+        return hmac.compare_digest(self.headers.get("Authorization", ""), f"Bearer {token}")
+
+    def _read_body(self) -> dict:
+        length = int_param(self.headers, "Content-Length", 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            raise BadRequest("Request body must be JSON")
+        if not isinstance(body, dict):
+            raise BadRequest("Request body must be a JSON object")
+        return body
+
+    @staticmethod
+    def _max_workers(body) -> int:
+        return max(1, min(int_param(body, "max_workers", 8), API_CONFIG['MAX_WORKERS']))
+
+    def _stream(self, records):
+        """Send (index, result) pairs as chunked NDJSON, flushing each record as it arrives.
+
+        `records` is closed before returning, so a client that goes away stops the rows not yet started.
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            try:
+                for idx, result in records:
+                    self._write_chunk(dict(result, index=idx))
+            except (BrokenPipeError, ConnectionResetError):
+                raise
+            except Exception as e:
+                # Headers are gone already: end the stream with an error record the client can see
+                logging.exception("API request failed mid-stream")
+                self._write_chunk({"error": str(e)})
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            logging.warning("API client disconnected before the response was complete")
+        finally:
+            records.close()
+
+    def _write_chunk(self, record):
+        line = json.dumps(record, default=str).encode('utf-8') + b"\n"
+        self.wfile.write(f"{len(line):X}\r\n".encode('ascii') + line + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json({"status": "ok"})
+        else:
+            self._send_json({"error": "Not found"}, 404)
+
+    def do_POST(self):
+        if not self._authorized():
+            self._send_json({"error": "Unauthorized"}, 401)
+            return
+        try:
+            body = self._read_body()
+            if self.path == "/extract":
+                self._extract(body)
+            elif self.path == "/competitors":
+                self._competitors(body)
+            else:
+                self._send_json({"error": "Not found"}, 404)
+        except BadRequest as e:
+            self._send_json({"error": str(e)}, 400)
+
+    def _extract(self, body):
+        rows = body.get("rows") or [{"Domain": domain} for domain in body.get("domains", [])]
+        if not rows or not all(isinstance(row, dict) and row.get("Domain") for row in rows):
+            raise BadRequest('Send "domains" or "rows" with a "Domain" in every row')
+        model = body.get("model") or OLLAMA_CONFIG['MODEL']
+        scraper, classifier = shared_extraction_parts()
+        pipeline = ExtractionPipeline(
+            model=model,
+            use_cache=body.get("use_cache", True),
+            max_workers=self._max_workers(body),
+            sites_per_prompt=max(1, min(int_param(body, "sites_per_prompt", 1), API_CONFIG['MAX_SITES_PER_PROMPT'])),
+            retry_failed=bool(body.get("retry_failed", False)),
+            scraper=scraper,
+            classifier=classifier
+        )
+        with get_residency_manager().job(model):
+            self._stream(pipeline.iter_completed(rows))
+
+    def _competitors(self, body):
+        rows = body.get("rows")
+        if not rows or not all(isinstance(row, dict) for row in rows):
+            raise BadRequest('Send "rows" with "Domain", "Keyword 1" and "Product/Service 1"')
+        search_method = body.get("search_method") or ("Serper.dev API" if body.get("api_key") else "Basic Google Search")
+        pipeline = CompetitorPipeline(
+            search_method=search_method,
+            api_key=body.get("api_key"),
+            gmb_check=bool(body.get("gmb_check", False)),
+            no_of_pages=int_param(body, "pages", 1),
+            use_cache=body.get("use_cache", True)
+        )
+        self._stream(pipeline.iter_completed(rows, max_workers=self._max_workers(body)))
+
+
+def make_server(host: str = None, port: int = None) -> ThreadingHTTPServer:
+    """The API server; refuses to listen beyond loopback unless API_TOKEN is set."""
+    host = host or API_CONFIG['HOST']
+    if not API_CONFIG['TOKEN'] and not is_loopback(host):
+        raise ValueError(f"Refusing to listen on {host} without API_TOKEN; set a token or bind to 127.0.0.1")
+    return ThreadingHTTPServer((host, port or API_CONFIG['PORT']), ApiHandler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Corporate Ranking AI HTTP API")
+    parser.add_argument("--host", default=API_CONFIG['HOST'])
+    parser.add_argument("--port", type=int, default=API_CONFIG['PORT'])
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.INFO)
+    try:
+        server = make_server(args.host, args.port)
+    except ValueError as e:
+        parser.error(str(e))
+    logging.info("API listening on http://%s:%d", args.host, args.port)
+    server.serve_forever()
@@ -3,7 +3,6 @@ import pandas as pd
 from datetime import datetime
 import os
 import sys
-import concurrent.futures
 import requests
 import json
 import hashlib
@@ -11,8 +10,6 @@ import time
 import io
 from urllib.parse import urlparse
 import logging
-import re
-import asyncio
 
 def timer(func):
     """Decorator to measure the runtime of functions."""
@@ -56,32 +53,24 @@ logging.basicConfig(
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 
-from src.core.scraper import WebScraper
-from src.core.content_analyzer import ContentAnalyzer
 from src.core.data_processer import DataProcessor
 from src.utils.components import Components
 from src.utils.auth import AuthManager
-from src.core.advanced_analytics import AdvancedAnalytics
-from src.utils.cache import AnalysisCache
+from src.core.jobs import get_job_manager, ACTIVE_STATES
+from src.core.pipeline import EXTRACTION_COLUMNS, COMPETITOR_COLUMNS
+from config.settings import JOB_CONFIG
+from src.utils.profiler import OFF, JOB, ROWS
 
-def fix_keyword_spacing(keyword: str) -> str:
-    keyword = keyword.replace('_', ' ')
-    keyword = re.sub(r'(?<=[a-z])(?=[A-Z])', ' ', keyword)
-    return keyword.strip()
+# Profiling choices in the job forms -> profiler mode
+PROFILE_OPTIONS = {"Off": OFF, "Whole job": JOB, "Sampled rows": ROWS}
 
 # --------------------- WebApp Class (UI) ---------------------
 class WebApp:
     def __init__(self):
         self.init_session()
         self.components = Components()
-        self.scraper = WebScraper()
         self.processor = DataProcessor()
         self.auth_manager = AuthManager()
-        # Initialize AdvancedAnalytics with competitor caching folder.
-        self.analytics = AdvancedAnalytics()
-        # Create separate cache instances:
-        self.cache_extractor = AnalysisCache(cache_dir="output/cache_extractor")
-        self.cache_competitor = AnalysisCache(cache_dir="output/cache_competitor")
 
     def init_session(self):
         if 'authenticated' not in st.session_state:
@@ -92,6 +81,17 @@ class WebApp:
             st.session_state.results = None
         if 'selected_model' not in st.session_state:
             st.session_state.selected_model = "llama3.1:8b"
+        if 'jobs' not in st.session_state:
+            # Pick up background jobs still running from before a reload or from a closed tab
+            st.session_state.jobs = [
+                status['job_id'] for status in reversed(get_job_manager().list_jobs())
+                if status.get('state') in ACTIVE_STATES
+            ]
+        if 'result_stores' not in st.session_state:
+            # job_id -> ResultStore filled in place while the job runs
+            st.session_state.result_stores = {}
+        if 'final_results' not in st.session_state:
+            st.session_state.final_results = {}
         logging.debug("Session initialized: %s", st.session_state)
 
     def run(self):
@@ -140,6 +140,7 @@ class WebApp:
             self.ai_based_extractor()
         with tabs[1]:
             self.competitive_insights()
+        self.show_jobs()
 
     def ai_based_extractor(self):
         st.markdown(
@@ -176,9 +177,21 @@ class WebApp:
                 selected_batch_size = st.selectbox("Select Batch Size", options=base_batch_sizes)
                 file_store_option = st.radio("Save intermediate Files", options=["Save", "Do Not Save"], index=1, key="file_save_ref")
             # Cache Reference Option for AI extractor
+            sites_per_prompt = st.selectbox(
+                "Sites per Prompt",
+                options=[1, 2, 4, 6, 8],
+                help="Pack several sites into one Ollama request. Useful for small models like llama3.2:3b."
+            )
+            st.checkbox(
+                "Retry previously failed domains",
+                key="retry_failed_extractor",
+                help="Domains whose last scrape failed are skipped with the same error until it expires. Tick to fetch them again."
+            )
+            st.selectbox("Profiling", options=list(PROFILE_OPTIONS), key="profile_extractor",
+                         help="Sample where the job spends its time; results go to output/profiles/<job>.")
         st.markdown('<div class="small-button">', unsafe_allow_html=True)
         if uploaded_file and st.button("Start Data Extraction", key="start_data_ext"):
-            self.process_basic_analysis(uploaded_file, selected_batch_size, selected_max_workers)
+            self.process_basic_analysis(uploaded_file, selected_batch_size, selected_max_workers, sites_per_prompt)
         st.markdown('</div>', unsafe_allow_html=True)
 
     def competitive_insights(self):
@@ -233,6 +246,8 @@ class WebApp:
                 cache_option_comp = st.radio("Reference from Cache", options=["Include", "Exclude"], index=0, key="cache_ref_comp")
             with row20[1]:
                 no_of_pages = st.radio("Number of SERP Pages", options=[1, 2])
+            st.selectbox("Profiling", options=list(PROFILE_OPTIONS), key="profile_comp",
+                         help="Sample where the job spends its time; results go to output/profiles/<job>.")
 
 
         st.markdown('<div class="small-button">', unsafe_allow_html=True)
@@ -248,141 +263,45 @@ class WebApp:
             )
         st.markdown('</div>', unsafe_allow_html=True)
 
-    @timer
-    def process_basic_analysis(self, uploaded_file, batch_size, max_workers):
-
+    def save_upload(self, uploaded_file):
+        """Store the uploaded file under input/ and return its path and a timestamp."""
         os.makedirs('input', exist_ok=True)
         os.makedirs('output/analysis', exist_ok=True)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        input_path = f"input/temp_{timestamp}.xlsx"
+        ext = uploaded_file.name.split('.')[-1]
+        input_path = f"input/temp_{timestamp}.{ext}"
         with open(input_path, 'wb') as f:
             f.write(uploaded_file.getbuffer())
+        return input_path, timestamp
+
+    def process_basic_analysis(self, uploaded_file, batch_size, max_workers, sites_per_prompt=1):
+        input_path, timestamp = self.save_upload(uploaded_file)
         try:
-            df_input = pd.read_excel(input_path)
+            df_input = self.processor.read_input_frame(input_path)
         except Exception as e:
             st.error("Error reading the Excel file.")
             return
         if "Domain" not in df_input.columns:
             st.error("Input file must have a column named 'Domain'.")
             return
-        with st.spinner("Processing AI Based Data Extraction"):
-            rows = df_input.to_dict(orient="records")
-            progress_bar = st.progress(0.0)
-            status_text = st.empty()
-            timer_text = st.empty()
-            total_batches = len(rows) // batch_size + (1 if len(rows) % batch_size > 0 else 0)
-            status_text.text(f"Total Rows: {len(rows)} | Processing in {total_batches} batches")
-            selected_model = st.session_state.selected_model
-
-            async def process_batches():
-                results = []
-                TIMEOUT_SECONDS = 240
-                for i in range(0, len(rows), batch_size):
-                    current_batch = i // batch_size + 1
-                    # Show batch status immediately before processing starts
-                    status_text.text(f"Processing Batch {current_batch} of {total_batches} from {len(rows)} datas ")
-
-                    batch_start = time.perf_counter()
-                    batch_rows = rows[i:i+batch_size]
-                    tasks = []
-                    for row in batch_rows:
-                        task = asyncio.wait_for(
-                            asyncio.to_thread(self.process_url, row["Domain"], selected_model, row.get("Email ID", "")),
-                            timeout=TIMEOUT_SECONDS
-                        )
-                        tasks.append(task)
-                    batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-                    for idx, result in enumerate(batch_results):
-                        if isinstance(result, asyncio.TimeoutError):
-                            logging.error("Timeout processing URL: %s", batch_rows[idx].get("Domain"))
-                            # Return a complete dict with all expected keys
-                            result = {
-                                "Email ID": batch_rows[idx].get("Email ID", ""),
-                                "Domain": batch_rows[idx].get("Domain", ""),
-                                "Business Name": "",
-                                "Business Location": "",
-                                "Keyword 1": "",
-                                "Keyword 2": "",
-                                "Keyword 3": "",
-                                "Keyword 4": "",
-                                "Keyword 5": "",
-                                "Product/Service 1": "",
-                                "Product/Service 2": "",
-                                "Product/Service 3": "",
-                                "Target Audience 1": "",
-                                "Target Audience 2": "",
-                                "Target Audience 3": "",
-                                "Status": "error",
-                                "Error": f"Timeout after {TIMEOUT_SECONDS} seconds"
-                            }
-                        elif isinstance(result, Exception):
-                            logging.error("Error processing URL %s: %s", batch_rows[idx].get("Domain"), str(result))
-                            result = {
-                                "Email ID": batch_rows[idx].get("Email ID", ""),
-                                "Domain": batch_rows[idx].get("Domain", ""),
-                                "Business Name": "",
-                                "Business Location": "",
-                                "Keyword 1": "",
-                                "Keyword 2": "",
-                                "Keyword 3": "",
-                                "Keyword 4": "",
-                                "Keyword 5": "",
-                                "Product/Service 1": "",
-                                "Product/Service 2": "",
-                                "Product/Service 3": "",
-                                "Target Audience 1": "",
-                                "Target Audience 2": "",
-                                "Target Audience 3": "",
-                                "Status": "error",
-                                "Error": str(result)
-                            }
-                        results.append(result)
-                    progress_bar.progress(min((i + batch_size) / len(rows), 1.0))
-                    interim_df = pd.DataFrame(results)
-                    timer_text.text(f"Batch {current_batch} processed in {time.perf_counter() - batch_start:.2f} seconds")
-                    if not interim_df.empty:
-                        self.components.display_results(interim_df)
-                        save_file = st.session_state.get("file_save_ref", "Save") == "Save"
-                        if save_file:
-                            if (current_batch%10==0) and (current_batch>0):
-                                interim_df.index = interim_df.index + 1
-                                interim_df.to_excel(f"output/Interim/interim_{timestamp}_{current_batch}.xlsx",index=True)
-                return results
-
-            results = asyncio.run(process_batches())
-            st.session_state.results = df_input.assign(**{
-                col: [result.get(col, "") for result in results]
-                for col in ["Business Name", "Business Location",
-                            "Keyword 1", "Keyword 2", "Keyword 3", "Keyword 4", "Keyword 5",
-                            "Product/Service 1", "Product/Service 2", "Product/Service 3",
-                            "Target Audience 1", "Target Audience 2", "Target Audience 3",
-                            "Status", "Error"]
-            })
-            if "Email ID" in df_input.columns:
-                st.session_state.results["Email ID"] = df_input["Email ID"]
-            self.components.display_results(st.session_state.results)
-            WebApp.download_results_excel_static(st.session_state.results, timestamp)
+        job_id = get_job_manager().submit('extraction', {
+            'input_path': input_path,
+            'model': st.session_state.selected_model,
+            'batch_size': batch_size,
+            'max_workers': max_workers,
+            'sites_per_prompt': sites_per_prompt,
+            'use_cache': st.session_state.get("cache_ref_extractor", "Include") == "Include",
+            'retry_failed': st.session_state.get("retry_failed_extractor", False),
+            'profile': PROFILE_OPTIONS[st.session_state.get("profile_extractor", "Off")],
+            'save_interim': st.session_state.get("file_save_ref", "Save") == "Save"
+        })
+        st.session_state.jobs.append(job_id)
+        st.success(f"Data extraction job {job_id} submitted ({len(df_input)} rows).")
 
-    @timer
     def process_advanced_analysis(self, uploaded_file, gmb_check, no_of_pages, search_method, api_key, batch_size, max_workers):
-        os.makedirs('input', exist_ok=True)
-        os.makedirs('output/analysis', exist_ok=True)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        ext = uploaded_file.name.split('.')[-1]
-        input_path = f"input/temp_{timestamp}.{ext}"
-        with open(input_path, 'wb') as f:
-            f.write(uploaded_file.getbuffer())
+        input_path, timestamp = self.save_upload(uploaded_file)
         try:
-            if uploaded_file.name.endswith('.csv'):
-                try:
-                    df = pd.read_csv(input_path)
-                except UnicodeDecodeError:
-                    df = pd.read_csv(input_path, encoding='ISO-8859-1')
-            elif uploaded_file.name.endswith('.xlsx'):
-                df = pd.read_excel(input_path)
-            else:
-                st.error("Unsupported file format. Please upload a CSV or Excel file.")
-                return
+            df = self.processor.read_input_frame(input_path)
         except Exception as e:
             st.error(f"Error reading file: {e}")
             return
@@ -390,262 +309,60 @@ class WebApp:
         if not required_columns.issubset(set(df.columns)):
             st.error("Input file must have columns: Domain, Keyword 1, Product/Service 1")
             return
-        results = []
-
-        # progress_bar = st.progress(0.0)
-        # status_text = st.empty()
-        # timer_text = st.empty()
-        # total_batches = len(df) // batch_size + (1 if len(df) % batch_size > 0 else 0)
-        # status_text.text(f"Total Rows: {len(df)} | Processing in {total_batches} batches")
-
-        with st.spinner("Processing Competitor  Analysis..."):
-            progress_bar = st.progress(0.0)
-            status_text = st.empty()
-            timer_text = st.empty()
-            total_batches = len(df) // batch_size + (1 if len(df) % batch_size > 0 else 0)
-            status_text.text(f"Total Rows: {len(df)} | Processing in {total_batches} batches")
-            for i in range(0, len(df), batch_size):
-                batch_start = time.perf_counter()
-                batch_rows = df.iloc[i:i+batch_size].to_dict(orient="records")
-                batch_results = []
-                status_text.text(f"Processing Batch {i // batch_size + 1} of {total_batches}")
-                for row in batch_rows:
-                    rec_start = time.perf_counter()
-                    res = self.process_row(row, search_method, api_key, gmb_check, no_of_pages)
-                    rec_elapsed = time.perf_counter() - rec_start
-                    logging.debug("Processed record for URL %s in advanced analysis in %.2f seconds", row.get("Domain", "N/A"), rec_elapsed)
-                    batch_results.append(res)
-                results.extend(batch_results)
-                progress_bar.progress(min((i + batch_size) / len(df), 1.0))
-
-                batch_end = time.perf_counter()
-                elapsed = batch_end - batch_start
-
-                logging.debug("Batch %d processed in %.2f seconds", i // batch_size + 1, elapsed)
-                interim_df = pd.DataFrame(results)
-                if not interim_df.empty:
-                    self.components.display_results(interim_df)
-
-        logging.debug("Advanced analysis completed.")
-        st.session_state.results = df.assign(**{
-            col: [result.get(col, "") for result in results]
-            for col in ["Keyword 1", "Product/Service 1", "Search Query",
-                        "Top Competitor 1", "Serp Rank 1",
-                        "Top Competitor 2", "Serp Rank 2",
-                        "Top Competitor 3", "Serp Rank 3",
-                        "Domain Rank",
-                        "GMB Status", "Error", "Status"]
+        job_id = get_job_manager().submit('competitor', {
+            'input_path': input_path,
+            'search_method': search_method,
+            'api_key': api_key,
+            'gmb_check': gmb_check,
+            'no_of_pages': no_of_pages,
+            'batch_size': batch_size,
+            'max_workers': max_workers,
+            'use_cache': st.session_state.get("cache_ref_comp", "Include") == "Include",
+            'profile': PROFILE_OPTIONS[st.session_state.get("profile_comp", "Off")]
         })
-        self.components.display_results(st.session_state.results)
-        WebApp.download_results_excel_static(st.session_state.results, timestamp)
-
-    def process_row(self, row, search_method, api_key, gmb_check, no_of_pages):
-        logging.debug("Processing row: %s", row)
-        try:
-            domain = str(row.get("Domain", "")).strip()
-            keyword = str(row.get("Keyword 1", "")).strip()
-            product = str(row.get("Product/Service 1", "")).strip()
-            if not domain:
-                return {
-                    "Domain": domain,
-                    "Keyword 1": keyword,
-                    "Product/Service 1": product,
-                    "Search Query": "",
-                    "Top Competitor 1": "",
-                    "Serp Rank 1": "",
-                    "Top Competitor 2": "",
-                    "Serp Rank 2": "",
-                    "Top Competitor 3": "",
-                    "Serp Rank 3": "",
-                    "Domain Rank": "not ranked",
-                    "GMB Status": "",
-                    "Status": "error",
-                    "Error": "Missing Domain"
-                }
-            search_query = keyword if keyword else product
-            if not search_query:
-                return {
-                    "Domain": domain,
-                    "Keyword 1": keyword,
-                    "Product/Service 1": product,
-                    "Search Query": "",
-                    "Top Competitor 1": "",
-                    "Serp Rank 1": "",
-                    "Top Competitor 2": "",
-                    "Serp Rank 2": "",
-                    "Top Competitor 3": "",
-                    "Serp Rank 3": "",
-                    "Domain Rank": "not ranked",
-                    "GMB Status": "",
-                    "Status": "error",
-                    "Error": "No valid search query"
-                }
-            # Decide whether to use cache based on the radio button.
-            use_cache = st.session_state.get("cache_ref_comp", "Include") == "Include"
-            if search_method == "Serper.dev API" and api_key:
-                raw_search_result = self.analytics.search_serper(search_query, api_key, use_cache=use_cache)
-            else:
-                raw_search_result = self.analytics.fetch_google_results(search_query, domain, pages=no_of_pages)
-            if not raw_search_result or (isinstance(raw_search_result, dict) and "error" in raw_search_result):
-                result = {
-                    "Domain": domain,
-                    "Keyword 1": keyword,
-                    "Product/Service 1": product,
-                    "Search Query": search_query,
-                    "Top Competitor 1": "",
-                    "Serp Rank 1": "",
-                    "Top Competitor 2": "",
-                    "Serp Rank 2": "",
-                    "Top Competitor 3": "",
-                    "Serp Rank 3": "",
-                    "Domain Rank": "not ranked",
-                    "GMB Status": "",
-                    "Status": "error",
-                    "Error": raw_search_result.get("error", "No search results")
-                }
-                return result
+        st.session_state.jobs.append(job_id)
+        st.success(f"Competitor analysis job {job_id} submitted ({len(df)} rows).")
 
-            # Process raw search result (which is now cached only for the raw query) to compute competitor analysis.
-            competitors = self.analytics.clean_and_filter_urls(raw_search_result, domain)
-
-            # Compute Domain Rank by checking raw search result for the origin domain.
-            domain_rank = "not ranked"
-            from urllib.parse import urlparse
-            parsed_origin = urlparse(domain)
-            origin_netloc = parsed_origin.netloc.lower() if parsed_origin.netloc else domain.lower()
-            if isinstance(raw_search_result, list):
-                for entry in raw_search_result:
-                    if isinstance(entry, dict):
-                        competitor_link = entry.get("link", "")
-                        competitor_position = entry.get("position", "not ranked")
-                    elif isinstance(entry, str):
-                        competitor_link = entry
-                        competitor_position = "not ranked"
-                    else:
-                        continue
-                    parsed_comp = urlparse(competitor_link)
-                    competitor_netloc = parsed_comp.netloc.lower() if parsed_comp.netloc else competitor_link.lower()
-                    if origin_netloc in competitor_netloc or competitor_netloc in origin_netloc:
-                        domain_rank = competitor_position
-                        break
-
-            result = {
-                "Domain": domain,
-                "Keyword 1": keyword,
-                "Product/Service 1": product,
-                "Search Query": search_query,
-                "GMB Status": ""
-            }
-            for i in range(3):
-                if i < len(competitors):
-                    result[f"Top Competitor {i+1}"] = competitors[i].get("link", "")
-                    position = competitors[i].get("position")
-                    result[f"Serp Rank {i+1}"] = position if position is not None else "not ranked"
-                else:
-                    result[f"Top Competitor {i+1}"] = ""
-                    result[f"Serp Rank {i+1}"] = "not ranked"
-            result["Domain Rank"] = domain_rank
-            if gmb_check:
-                gmb_result = self.analytics.check_gmb_listing(keyword, domain)
-                result["GMB Status"] = "Found" if gmb_result.get("exists") else "Not Found"
-            else:
-                result["GMB Status"] = "Not Checked"
-            result["Status"] = "success"
-            result["Error"] = ""
-            return result
-        except Exception as e:
-            return {
-                "Domain": domain,
-                "Keyword 1": keyword,
-                "Product/Service 1": product,
-                "Search Query": "",
-                "Top Competitor 1": "",
-                "Serp Rank 1": "",
-                "Top Competitor 2": "",
-                "Serp Rank 2": "",
-                "Top Competitor 3": "",
-                "Serp Rank 3": "",
-                "Domain Rank": "not ranked",
-                "GMB Status": "",
-                "Status": "error",
-                "Error": str(e)
-            }
-
-    def process_url(self, url, model, email_id=""):
-        logging.debug("Processing URL: %s with model: %s", url, model)
-        try:
-            clean_url = self.processor.clean_url(url)
-            # Check extractor cache option
-            use_cache = st.session_state.get("cache_ref_extractor", "Include") == "Include"
-            if use_cache:
-                cached_data = self.cache_extractor.get(clean_url)
-            else:
-                cached_data = None
-            if not cached_data:
-                scraped_data = self.scraper.scrape_website(clean_url)
-                self.cache_extractor.set(clean_url, scraped_data)
-                logging.debug("Scraped data for URL %s", clean_url)
-            else:
-                scraped_data = cached_data
-                logging.debug("Using cached data for URL %s", clean_url)
-
-            analyzer = ContentAnalyzer(model=model)
-            analysis = analyzer.analyze_with_ollama(scraped_data['content'], clean_url)
-            logging.debug("Analysis result for URL %s: %s", clean_url, analysis)
-
-            business_name = analysis.get('business_name', '')
-            location = analysis.get('location', '')
-
-            keywords = analysis.get('keywords', [])
-            if isinstance(keywords, str):
-                keywords = [kw.strip() for kw in keywords.split(',')]
-            US_STATES = {"AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA",
-                         "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD",
-                         "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ",
-                         "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC",
-                         "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY"}
-            keywords = [fix_keyword_spacing(kw) for kw in keywords if kw.upper() not in US_STATES]
-            keywords = (keywords + [""] * 5)[:5]
-
-            product_services = analysis.get('products_services', [])
-            if isinstance(product_services, str):
-                product_services = [ps.strip() for ps in product_services.split(',')]
-            product_services = (product_services + [""] * 3)[:3]
-
-            target_audiences = analysis.get('target_audience', [])
-            if isinstance(target_audiences, str):
-                target_audiences = [ta.strip() for ta in target_audiences.split(',')]
-            target_audiences = (target_audiences + [""] * 3)[:3]
-
-            result = {}
-            result["Email ID"] = email_id
-            result["Domain"] = url
-            result["Business Name"] = business_name
-            result["Business Location"] = location
-
-            for i, kw in enumerate(keywords, start=1):
-                result[f"Keyword {i}"] = kw
-
-            for i, ps in enumerate(product_services, start=1):
-                result[f"Product/Service {i}"] = ps
-
-            for i, ta in enumerate(target_audiences, start=1):
-                result[f"Target Audience {i}"] = ta
-
-            result["Status"] = "success"
-            result["Error"] = ""
-
-            return result
-
-        except Exception as e:
-            return {
-                "Email ID": email_id,
-                "Domain": url,
-                "Business Name": "",
-                "Business Location": "",
-                "Status": "error",
-                "Error": str(e)
-            }
+    def show_jobs(self):
+        """Status, partial results and downloads of this session's background jobs, plus any still running from before a reload."""
+        if not st.session_state.jobs:
+            return
+        manager = get_job_manager()
+        active = any(manager.status(job_id)['state'] in ACTIVE_STATES for job_id in st.session_state.jobs)
+        # Poll while something is still running; the jobs themselves run in worker processes
+        st.fragment(run_every=JOB_CONFIG['POLL_SECONDS'] if active else None)(self._render_jobs)()
+
+    def _render_jobs(self):
+        manager = get_job_manager()
+        st.subheader("Jobs")
+        for job_id in reversed(st.session_state.jobs):
+            status = manager.status(job_id)
+            title = "Data Extraction" if status['kind'] == 'extraction' else "Competitor Analysis"
+            with st.expander(f"{title} | {job_id} | {status['state']}", expanded=status['state'] in ACTIVE_STATES):
+                total = max(status.get('total', 0), 1)
+                st.progress(min(status.get('done', 0) / total, 1.0))
+                st.text(f"{status.get('done', 0)} of {status.get('total', 0)} rows processed")
+                if status.get('error'):
+                    st.error(status['error'])
+                if status['state'] in ACTIVE_STATES:
+                    if st.button("Cancel Job", key=f"cancel_{job_id}"):
+                        manager.cancel(job_id)
+                    result_store = manager.sync_results(job_id, st.session_state.result_stores.get(job_id))
+                    st.session_state.result_stores[job_id] = result_store
+                    if result_store.count:
+                        self.components.display_results(result_store.to_frame(filled_only=True))
+                elif status['state'] == 'completed':
+                    if job_id not in st.session_state.final_results:
+                        columns = EXTRACTION_COLUMNS if status['kind'] == 'extraction' else COMPETITOR_COLUMNS
+                        st.session_state.final_results[job_id] = manager.final_frame(
+                            job_id, columns, st.session_state.result_stores.pop(job_id, None)
+                        )
+                    st.session_state.results = st.session_state.final_results[job_id]
+                    self.components.display_results(st.session_state.results)
+                    self.components.display_host_stats(status.get('host_stats', []))
+                    if status.get('profile_dir'):
+                        st.caption(f"Profile saved to {status['profile_dir']} (hotspots.txt, profile.speedscope.json)")
+                    WebApp.download_results_excel_static(st.session_state.results, job_id)
 
     @staticmethod
     @st.fragment
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from src.core.content_analyzer import ContentAnalyzer, REQUIRED_FIELDS
+
+
+def analysis(url, name):
+    return {"url": url, "keywords": [f"{name} keyword"], "business_name": name,
+            "products_services": "repairs", "target_audience": "homeowners", "location": "Austin, TX"}
+
+
+SITES = [{"url": "https://a.com", "content": "Page A"}, {"url": "https://b.com/", "content": "Page B"}]
+ITEMS = [analysis("https://a.com", "A"), analysis("https://b.com/", "B")]
+
+
+@pytest.mark.parametrize("response", [
+    json.dumps(ITEMS),
+    json.dumps({"results": ITEMS}),
+    "Here are the results:\n```json\n" + json.dumps(ITEMS) + "\n```\nLet me know if you need more.",
+    json.dumps({"results": ITEMS}) + "\n\nNote: {both sites} were analyzed.",
+])
+def test_parse_batch_response_finds_the_array(response):
+    assert ContentAnalyzer._parse_batch_response(response) == ITEMS
+
+
+def test_parse_batch_response_object_keyed_by_url():
+    response = json.dumps({item["url"]: {k: v for k, v in item.items() if k != "url"} for item in ITEMS})
+    assert ContentAnalyzer._parse_batch_response(response) == ITEMS
+
+
+def test_parse_batch_response_without_json():
+    with pytest.raises(ValueError):
+        ContentAnalyzer._parse_batch_response("Sorry, I cannot help with that.")
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    analyzer = ContentAnalyzer(model="test-model", base_url="http://ollama.test")
+    analyzer.single_calls = []
+
+    def analyze_with_ollama(content, url, model=None, fields=None, prompt_version=None):
+        analyzer.single_calls.append(url)
+        return {field: f"single {url}" for field in REQUIRED_FIELDS}
+
+    monkeypatch.setattr(analyzer, "analyze_with_ollama", analyze_with_ollama)
+    return analyzer
+
+
+def test_batch_splits_answer_per_site(analyzer, monkeypatch):
+    # The model echoes urls with different case and trailing slashes, and in another order
+    answer = [analysis("HTTPS://B.COM", "B"), analysis("https://a.com/", "A")]
+    monkeypatch.setattr(analyzer, "_generate", lambda prompt, model: json.dumps(answer))
+
+    results = analyzer.analyze_batch_with_ollama(SITES)
+
+    assert analyzer.single_calls == []
+    assert set(results) == {"https://a.com", "https://b.com/"}
+    assert results["https://a.com"]["business_name"] == "A"
+    assert results["https://b.com/"]["business_name"] == "B"
+    assert set(results["https://a.com"]) == set(REQUIRED_FIELDS)
+
+
+def test_batch_falls_back_for_missing_and_invalid_elements(analyzer, monkeypatch):
+    invalid = dict(analysis("https://b.com", "B"), business_name=None)
+    answer = [analysis("https://a.com", "A"), invalid, analysis("https://unrequested.com", "C")]
+    monkeypatch.setattr(analyzer, "_generate", lambda prompt, model: json.dumps(answer))
+
+    results = analyzer.analyze_batch_with_ollama(SITES)
+
+    assert analyzer.single_calls == ["https://b.com/"]
+    assert results["https://a.com"]["business_name"] == "A"
+    assert results["https://b.com/"]["business_name"] == "single https://b.com/"
+    assert "https://unrequested.com" not in results
+
+
+def test_batch_falls_back_to_single_site_when_request_fails(analyzer, monkeypatch):
+    def fail(prompt, model):
+        raise Exception("connection refused")
+
+    monkeypatch.setattr(analyzer, "_generate", fail)
+
+    results = analyzer.analyze_batch_with_ollama(SITES)
+
+    assert analyzer.single_calls == ["https://a.com", "https://b.com/"]
+    assert results["https://a.com"]["business_name"] == "single https://a.com"
+
+
+def test_single_site_skips_the_batch_prompt(analyzer, monkeypatch):
+    def no_batch(prompt, model):
+        raise AssertionError("a single site must not use the batch prompt")
+
+    monkeypatch.setattr(analyzer, "_generate", no_batch)
+
+    results = analyzer.analyze_batch_with_ollama(SITES[:1])
+
+    assert analyzer.single_calls == ["https://a.com"]
+    assert list(results) == ["https://a.com"]
@@ -0,0 +1,74 @@
+import re
+
+import pytest
+
+from src.core.field_normalizer import FIELD_COLUMNS, RAW_FIELDS_KEY, US_STATES, FieldNormalizer
+
+
+def fix_keyword_spacing(keyword):
+    keyword = keyword.replace('_', ' ')
+    keyword = re.sub(r'(?<=[a-z])(?=[A-Z])', ' ', keyword)
+    return keyword.strip()
+
+
+def per_row_columns(analysis):
+    """The list-field columns as the pipeline built them one result at a time, before FieldNormalizer."""
+    keywords = analysis.get('keywords', [])
+    if isinstance(keywords, str):
+        keywords = [kw.strip() for kw in keywords.split(',')]
+    keywords = [fix_keyword_spacing(kw) for kw in keywords if kw.upper() not in US_STATES]
+    keywords = (keywords + [""] * 5)[:5]
+
+    product_services = analysis.get('products_services', [])
+    if isinstance(product_services, str):
+        product_services = [ps.strip() for ps in product_services.split(',')]
+    product_services = (product_services + [""] * 3)[:3]
+
+    target_audiences = analysis.get('target_audience', [])
+    if isinstance(target_audiences, str):
+        target_audiences = [ta.strip() for ta in target_audiences.split(',')]
+    target_audiences = (target_audiences + [""] * 3)[:3]
+
+    columns = {}
+    for i, kw in enumerate(keywords, start=1):
+        columns[f"Keyword {i}"] = kw
+    for i, ps in enumerate(product_services, start=1):
+        columns[f"Product/Service {i}"] = ps
+    for i, ta in enumerate(target_audiences, start=1):
+        columns[f"Target Audience {i}"] = ta
+    return columns
+
+
+ANALYSES = [
+    {"keywords": "plumbingServices, TX, water_heater repair, drain cleaning, Austin, leak detection, extra",
+     "products_services": "repairs, installs", "target_audience": "homeowners"},
+    {"keywords": ["roofing", "CA", "ca", "gutterRepair", "storm_damage"],
+     "products_services": ["shingles", "metal roofs", "skylights", "gutters"],
+     "target_audience": ["homeowners", "builders"]},
+    {"keywords": "", "products_services": "", "target_audience": ""},
+    {},
+    {"keywords": "TX, NY", "products_services": "one", "target_audience": "a, b, c, d"},
+    {"keywords": "single", "products_services": ["only"], "target_audience": []},
+]
+
+
+def test_columns_match_per_row_code():
+    frame = FieldNormalizer().normalize(ANALYSES)
+    assert list(frame.columns) == FIELD_COLUMNS
+    assert frame.to_dict('records') == [per_row_columns(analysis) for analysis in ANALYSES]
+
+
+@pytest.mark.parametrize("analysis", ANALYSES)
+def test_each_row_alone_matches_per_row_code(analysis):
+    assert FieldNormalizer().normalize([analysis]).to_dict('records') == [per_row_columns(analysis)]
+
+
+def test_apply_fills_only_pending_results():
+    pending = {"Domain": "a.com", RAW_FIELDS_KEY: ANALYSES[0]}
+    done = {"Domain": "b.com", "Keyword 1": "kept"}
+    results = FieldNormalizer().apply([pending, None, done])
+
+    assert results[1] is None
+    assert done == {"Domain": "b.com", "Keyword 1": "kept"}
+    assert RAW_FIELDS_KEY not in pending
+    assert pending == dict({"Domain": "a.com"}, **per_row_columns(ANALYSES[0]))
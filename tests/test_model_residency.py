@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+
+from src.utils.model_residency import ModelResidencyManager
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = ModelResidencyManager(base_urls=["http://ollama.test"])
+    manager.keep_alive_calls = []
+    monkeypatch.setattr(manager, "_send_keep_alive",
+                        lambda model, keep_alive, timeout: manager.keep_alive_calls.append((model, keep_alive)))
+    return manager
+
+
+def start_job(manager, model, events, release):
+    """Run `manager.job(model)` in a thread that records when it enters and waits for `release`."""
+    entered = threading.Event()
+
+    def run():
+        with manager.job(model):
+            events.append(model)
+            entered.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread, entered
+
+
+def test_jobs_on_resident_model_share_it(manager):
+    events, release = [], threading.Event()
+    first, first_in = start_job(manager, "llama3.1:8b", events, release)
+    assert first_in.wait(5)
+    second, second_in = start_job(manager, "llama3.1:8b", events, release)
+    assert second_in.wait(5)
+
+    release.set()
+    first.join(5)
+    second.join(5)
+    # Preloaded once and unpinned once, by the first and last job
+    assert [model for model, _ in manager.keep_alive_calls] == ["llama3.1:8b", "llama3.1:8b"]
+    assert manager.active_jobs == 0
+
+
+def test_other_model_waits_and_unloads_previous(manager):
+    events, release_first, release_second = [], threading.Event(), threading.Event()
+    first, first_in = start_job(manager, "llama3.1:8b", events, release_first)
+    assert first_in.wait(5)
+    other, other_in = start_job(manager, "qwen2.5:14b", events, release_second)
+    assert not other_in.wait(0.2)
+    # A later job on the resident model queues behind the other model instead of jumping ahead
+    late, late_in = start_job(manager, "llama3.1:8b", events, release_second)
+    assert not late_in.wait(0.2)
+
+    release_first.set()
+    assert other_in.wait(5)
+    assert ("llama3.1:8b", 0) in manager.keep_alive_calls
+    release_second.set()
+    for thread in (first, other, late):
+        thread.join(5)
+    assert events == ["llama3.1:8b", "qwen2.5:14b", "llama3.1:8b"]
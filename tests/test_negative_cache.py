@@ -0,0 +1,138 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from config.config import NEGATIVE_CACHE_TTLS
+from src.core.pipeline import ExtractionPipeline
+from src.utils.cache import NegativeCache, classify_failure
+
+
+class FailingScraper:
+    """Scraper stand-in that fails for the given hosts, with WebScraper's error messages, and records every fetch."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.fetched = []
+
+    def scrape_website(self, url):
+        self.fetched.append(url)
+        for host, error in self.failures.items():
+            if f"://{host}" in url:
+                raise Exception(f"Error scraping {url}: {error}")
+        return {"content": "Some page", "metadata": {}}
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pipeline = ExtractionPipeline("test-model", use_cache=False)
+    pipeline.negative_cache = NegativeCache(str(tmp_path / "negative"))
+    pipeline.corpus = None
+    return pipeline
+
+
+def age_entry(cache, host, seconds):
+    """Move a cached failure's timestamp `seconds` into the past."""
+    cache_file = os.path.join(cache.cache_dir, f"{cache._hash_url(host)}.json")
+    with open(cache_file) as f:
+        entry = json.load(f)
+    entry["timestamp"] = (datetime.now() - timedelta(seconds=seconds)).isoformat()
+    with open(cache_file, "w") as f:
+        json.dump(entry, f)
+
+
+@pytest.mark.parametrize("url, key", [
+    ("https://www.Acme.com/about", "acme.com"),
+    ("http://acme.com:8080", "acme.com"),
+    ("https://shop.acme.com", "shop.acme.com"),
+    ("https://foo.wixsite.com", "foo.wixsite.com"),
+])
+def test_failure_key_is_the_fetched_host(pipeline, url, key):
+    assert pipeline.failure_key(url) == key
+
+
+def test_failing_subdomain_does_not_block_parent_or_siblings(pipeline):
+    pipeline.scraper = FailingScraper({"shop.acme.com": "HTTP error 404 for https://shop.acme.com"})
+    with pytest.raises(Exception):
+        pipeline.scrape_url("https://shop.acme.com")
+
+    pipeline.scrape_url("https://acme.com")
+    pipeline.scrape_url("https://blog.acme.com")
+    assert pipeline.scraper.fetched == ["https://shop.acme.com", "https://acme.com", "https://blog.acme.com"]
+
+    # The failing host itself is served from the negative cache, www variant included
+    with pytest.raises(Exception, match="404"):
+        pipeline.scrape_url("https://www.shop.acme.com")
+    assert len(pipeline.scraper.fetched) == 3
+
+
+def test_recorded_class_comes_from_the_status_not_the_host(pipeline):
+    pipeline.scraper = FailingScraper({
+        "parkedcarsales.com": "HTTP error 503 for https://parkedcarsales.com",
+        "busy.com": "HTTP error 429 for https://busy.com",
+    })
+    for url in ("https://parkedcarsales.com", "https://busy.com"):
+        with pytest.raises(Exception):
+            pipeline.scrape_url(url)
+    assert pipeline.negative_cache.get("parkedcarsales.com")["failure_class"] == "http_5xx"
+    assert pipeline.negative_cache.get("busy.com")["failure_class"] == "rate_limited"
+
+
+def test_retry_failed_refetches(pipeline):
+    pipeline.scraper = FailingScraper({"acme.com": "HTTP error 503 for https://acme.com"})
+    with pytest.raises(Exception):
+        pipeline.scrape_url("https://acme.com")
+    pipeline.retry_failed = True
+    pipeline.scraper.failures = {}
+    pipeline.scrape_url("https://acme.com")
+    assert len(pipeline.scraper.fetched) == 2
+    assert pipeline.negative_cache.get("acme.com") is None
+
+
+@pytest.mark.parametrize("error, failure_class", [
+    ("Error scraping https://acme.com: HTTPSConnectionPool(host='acme.com', port=443): "
+     "Read timed out. (read timeout=10)", "timeout"),
+    ("Error scraping https://parkedcarsales.com: HTTP error 503 for https://parkedcarsales.com", "http_5xx"),
+    ("Error scraping https://sslwireless.com: HTTP error 404 for https://sslwireless.com", "http_4xx"),
+    ("Error scraping https://mytimeout.com: HTTP error 404 for https://mytimeout.com/", "http_4xx"),
+    ("Error scraping https://acme.com: HTTP error 429 for https://acme.com", "rate_limited"),
+    ("Error scraping https://acme.com: HTTP error 408 for https://www.acme.com", "rate_limited"),
+    ("Error scraping https://acme.com: Domain does not exist (NXDOMAIN)", "nxdomain"),
+    ("Error scraping https://timeout.example: No readable content found for https://timeout.example", "no_content"),
+    ("Error scraping https://acme.com: HTTPSConnectionPool(host='ssl-timeout.com', port=443): "
+     "Max retries exceeded with url: /tls (Caused by NewConnectionError('Failed to establish a new "
+     "connection: [Errno 111] Connection refused'))", "connection"),
+    ("Error scraping https://acme.com: HTTP error 404 for https://acme.com; HTTP error 404 for http://acme.com", "http_4xx"),
+    ("Error scraping https://parked.com: Something unexpected", "other"),
+])
+def test_failure_class_ignores_urls_and_hosts(error, failure_class):
+    assert classify_failure(error) == failure_class
+
+
+@pytest.mark.parametrize("error, failure_class", [
+    ("Error scraping https://acme.com: HTTPSConnectionPool(host='acme.com', port=443): Read timed out.", "timeout"),
+    ("Error scraping https://acme.com: HTTP error 503 for https://acme.com", "http_5xx"),
+    ("Error scraping https://acme.com: HTTP error 404 for https://acme.com", "http_4xx"),
+    ("Error scraping https://acme.com: HTTP error 429 for https://acme.com", "rate_limited"),
+    ("Domain does not exist (NXDOMAIN)", "nxdomain"),
+    ("Error scraping https://acme.com: Something unexpected", "other"),
+])
+def test_entry_expires_after_its_class_ttl(tmp_path, error, failure_class):
+    cache = NegativeCache(str(tmp_path))
+    cache.set("acme.com", error)
+    ttl = NEGATIVE_CACHE_TTLS[failure_class]
+
+    assert cache.get("acme.com")["failure_class"] == failure_class
+    age_entry(cache, "acme.com", ttl - 60)
+    assert cache.get("acme.com") is not None
+    age_entry(cache, "acme.com", ttl + 1)
+    assert cache.get("acme.com") is None
+
+
+def test_explicit_failure_class_overrides_classification(tmp_path):
+    cache = NegativeCache(str(tmp_path))
+    cache.set("acme.com", "Domain does not exist", "nxdomain")
+    age_entry(cache, "acme.com", NEGATIVE_CACHE_TTLS["other"] + 1)
+    assert cache.get("acme.com")["failure_class"] == "nxdomain"
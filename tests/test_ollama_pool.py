@@ -0,0 +1,85 @@
+import pytest
+import requests
+
+from src.core.content_analyzer import ContentAnalyzer
+from src.utils.ollama_pool import NoHealthyHostError, OllamaHostPool
+
+HOSTS = ["http://gpu1:11434", "http://gpu2:11434/", "http://gpu3:11434"]
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    # No background health checks: every host starts healthy with unknown models
+    monkeypatch.setattr(OllamaHostPool, "_health_loop", lambda self: None)
+    return OllamaHostPool(HOSTS, health_interval=60, max_failures=2)
+
+
+def test_acquire_picks_least_outstanding_host(pool):
+    first = pool.acquire("llama3.1:8b")
+    second = pool.acquire("llama3.1:8b")
+    third = pool.acquire("llama3.1:8b")
+    assert {first, second, third} == {"http://gpu1:11434", "http://gpu2:11434", "http://gpu3:11434"}
+
+    pool.release(second, True, 0.5)
+    assert pool.acquire("llama3.1:8b") == second
+    assert [row["outstanding"] for row in pool.stats()] == [1, 1, 1]
+
+
+def test_acquire_skips_hosts_without_the_model(pool):
+    pool.hosts["http://gpu1:11434"]["models"] = {"qwen2.5:14b"}
+    pool.hosts["http://gpu2:11434"]["models"] = {"llama3.1:latest"}
+    pool.hosts["http://gpu3:11434"]["healthy"] = False
+    assert pool.acquire("llama3.1") == "http://gpu2:11434"
+    assert pool.acquire("llama3.1") == "http://gpu2:11434"
+    with pytest.raises(NoHealthyHostError):
+        pool.acquire("mistral")
+
+
+def test_consecutive_failures_eject_host(pool):
+    host = pool.acquire("llama3.1:8b", exclude={"http://gpu2:11434", "http://gpu3:11434"})
+    pool.release(host, False, 1.0)
+    assert pool.hosts[host]["healthy"]
+    pool.acquire("llama3.1:8b", exclude={"http://gpu2:11434", "http://gpu3:11434"})
+    pool.release(host, False, 1.0)
+    assert not pool.hosts[host]["healthy"]
+    assert host not in {pool.acquire("llama3.1:8b") for _ in range(4)}
+
+
+@pytest.fixture
+def analyzer(pool):
+    analyzer = ContentAnalyzer(model="llama3.1:8b", base_url="http://unused:11434")
+    analyzer.host_pool = pool
+    return analyzer
+
+
+def test_generate_retries_on_another_host(analyzer, pool, monkeypatch):
+    calls = []
+
+    def post_generate(base_url, prompt, model):
+        calls.append(base_url)
+        if base_url == "http://gpu1:11434":
+            raise requests.exceptions.ConnectionError("connection refused")
+        return '{"ok": true}'
+
+    monkeypatch.setattr(analyzer, "_post_generate", post_generate)
+
+    assert analyzer._generate("prompt", "llama3.1:8b") == '{"ok": true}'
+    assert calls[0] == "http://gpu1:11434" and len(calls) == 2
+    stats = {row["host"]: row for row in pool.stats()}
+    assert stats["http://gpu1:11434"]["failures"] == 1
+    assert stats[calls[1]]["requests"] == 1 and stats[calls[1]]["failures"] == 0
+    assert all(row["outstanding"] == 0 for row in stats.values())
+
+
+def test_generate_gives_up_when_every_host_failed(analyzer, monkeypatch):
+    calls = []
+
+    def post_generate(base_url, prompt, model):
+        calls.append(base_url)
+        raise requests.exceptions.Timeout(f"{base_url} timed out")
+
+    monkeypatch.setattr(analyzer, "_post_generate", post_generate)
+
+    with pytest.raises(Exception, match="timed out"):
+        analyzer._generate("prompt", "llama3.1:8b")
+    assert sorted(calls) == ["http://gpu1:11434", "http://gpu2:11434", "http://gpu3:11434"]
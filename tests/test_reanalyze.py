@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from src.core.reanalyze import CorpusReanalyzer, iter_json_object
+
+
+@pytest.fixture
+def output_file(tmp_path):
+    records = [
+        {"url": "https://done.com", "model": "llama3.1:8b", "prompt_version": "v1", "status": "success"},
+        {"url": "https://empty.com", "model": "llama3.1:8b", "prompt_version": "v1", "status": "skipped"},
+        {"url": "https://failed.com", "model": "llama3.1:8b", "prompt_version": "v1", "status": "error"},
+        {"url": "https://other-model.com", "model": "qwen2.5:14b", "prompt_version": "v1", "status": "success"},
+        {"url": "https://other-prompt.com", "model": "llama3.1:8b", "prompt_version": "v0", "status": "success"},
+        {"url": "https://old-record.com", "status": "success"},
+    ]
+    path = tmp_path / "reanalysis.jsonl"
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n{truncated line")
+    return str(path)
+
+
+def test_done_urls_match_model_and_prompt_version(output_file):
+    reanalyzer = CorpusReanalyzer(model="llama3.1:8b", prompt_version="v1")
+    assert reanalyzer.done_urls(output_file) == {"https://done.com", "https://empty.com"}
+
+
+def test_new_model_resumes_nothing(output_file):
+    reanalyzer = CorpusReanalyzer(model="qwen2.5:14b", prompt_version="v1")
+    assert reanalyzer.done_urls(output_file) == {"https://other-model.com"}
+
+
+def test_failed_url_is_retried(output_file, monkeypatch):
+    reanalyzer = CorpusReanalyzer(model="llama3.1:8b", prompt_version="v1")
+    monkeypatch.setattr(reanalyzer.analyzer, "analyze_with_ollama", lambda text, url, prompt_version=None: {"keywords": []})
+    sources = [("https://done.com", {"content": "x"}), ("https://failed.com", {"content": "x"})]
+    monkeypatch.setattr("src.core.reanalyze.iter_sources", lambda paths: iter(sources))
+
+    counts = reanalyzer.run(["unused"], output_file)
+
+    assert counts["success"] == 1
+    with open(output_file) as f:
+        last = json.loads(f.read().splitlines()[-1])
+    assert (last["url"], last["status"]) == ("https://failed.com", "success")
+
+
+SCRAPED = {
+    "https://a.com": {"status": "success", "data": {"title": "Caf\u00e9 \"Bar\"", "content": "x" * 50, "score": 3.14159}},
+    "https://b.com": {"status": "error", "error": "timeout", "retries": [1, 20, 300]},
+    "https://c.com": {"status": "success", "data": {"flags": [True, False, None], "rank": -12e3}},
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_json_object_across_chunk_boundaries(tmp_path, chunk_size, indent):
+    # Small chunks cut keys, strings, escapes, numbers and literals at every possible position
+    path = tmp_path / "scraped.json"
+    path.write_text(json.dumps(SCRAPED, indent=indent, ensure_ascii=indent is None), encoding="utf-8")
+    assert list(iter_json_object(str(path), chunk_size=chunk_size)) == list(SCRAPED.items())
+
+
+@pytest.mark.parametrize("text", ["{}", "  { }  ", '{"n": 10}'])
+def test_iter_json_object_small_objects(tmp_path, text):
+    path = tmp_path / "scraped.json"
+    path.write_text(text)
+    assert dict(iter_json_object(str(path), chunk_size=1)) == json.loads(text)
+
+
+@pytest.mark.parametrize("text", ["[1, 2]", '{"a": 1 "b": 2}', '{"a" 1}'])
+def test_iter_json_object_rejects_malformed_input(tmp_path, text):
+    path = tmp_path / "scraped.json"
+    path.write_text(text)
+    with pytest.raises(ValueError):
+        list(iter_json_object(str(path), chunk_size=2))
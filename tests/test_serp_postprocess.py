@@ -0,0 +1,44 @@
+from src.core.serp_postprocess import NOT_RANKED, SerpPostProcessor
+
+
+def test_competitors_ranks_and_domain_rank():
+    processor = SerpPostProcessor(excluded_domains={"yelp.com"})
+    results = [
+        {"link": "https://www.facebook.com/acme", "position": 1},
+        {"link": "https://shop.acme.co.uk/about", "position": 2},
+        {"link": "https://rival.com/services", "position": 3},
+        {"link": "https://rival.com/contact", "position": 4},
+        {"link": "https://www.yelp.com/biz/acme", "position": 5},
+        {"link": "https://city.gov/permits", "position": 6},
+        {"link": "https://Other.CO.UK:8443/", "position": 7},
+        "https://third.net/page",
+        {"link": "https://fourth.com/", "position": 9},
+    ]
+    columns = processor.process([("row-1", "http://www.acme.co.uk", results)])
+
+    assert columns["row-1"] == {
+        "Domain Rank": 2,
+        "Top Competitor 1": "https://rival.com", "Serp Rank 1": 3,
+        "Top Competitor 2": "https://Other.CO.UK:8443", "Serp Rank 2": 7,
+        "Top Competitor 3": "https://third.net", "Serp Rank 3": NOT_RANKED,
+    }
+
+
+def test_rows_are_independent_and_empty_rows_default():
+    processor = SerpPostProcessor(excluded_domains=set())
+    columns = processor.process([
+        ("a", "a.com", [{"link": "https://b.com", "position": 1}]),
+        ("b", "b.com", [{"link": "https://b.com/x", "position": 4}]),
+        ("c", "c.com", []),
+    ])
+
+    assert columns["a"]["Top Competitor 1"] == "https://b.com"
+    assert columns["a"]["Domain Rank"] == NOT_RANKED
+    assert columns["b"]["Domain Rank"] == 4
+    assert columns["b"]["Top Competitor 1"] == ""
+    assert columns["c"] == {
+        "Domain Rank": NOT_RANKED,
+        "Top Competitor 1": "", "Serp Rank 1": NOT_RANKED,
+        "Top Competitor 2": "", "Serp Rank 2": NOT_RANKED,
+        "Top Competitor 3": "", "Serp Rank 3": NOT_RANKED,
+    }